@@ -0,0 +1,47 @@
+from fastapi import APIRouter, HTTPException
+from typing import Dict, List
+from pydantic import BaseModel
+import time
+
+from workers.autofill.ats_detector import classify_many
+from ..event_log import log_event
+
+router = APIRouter(prefix="/ats", tags=["ats"])
+
+# Keep a single request well under a second of classification
+MAX_DETECT_URLS = 100_000
+
+# Pydantic models
+class DetectRequest(BaseModel):
+    urls: List[str]
+
+class DetectResult(BaseModel):
+    url: str
+    ats_type: str
+
+class DetectResponse(BaseModel):
+    results: List[DetectResult]
+    counts: Dict[str, int]
+    elapsed_ms: float
+
+
+@router.post("/detect", response_model=DetectResponse)
+async def detect_ats(req: DetectRequest):
+    """Classify a batch of URLs by ATS in one call"""
+    if len(req.urls) > MAX_DETECT_URLS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_DETECT_URLS} URLs per request")
+
+    started = time.perf_counter()
+    types = classify_many(req.urls)
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    counts: Dict[str, int] = {}
+    for ats_type in types:
+        counts[ats_type.value] = counts.get(ats_type.value, 0) + 1
+
+    log_event({"type": "ats_detect_batch", "urls": len(req.urls), "counts": counts, "elapsed_ms": elapsed_ms})
+    return DetectResponse(
+        results=[DetectResult(url=url, ats_type=ats_type.value) for url, ats_type in zip(req.urls, types)],
+        counts=counts,
+        elapsed_ms=elapsed_ms,
+    )
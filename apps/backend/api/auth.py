@@ -7,9 +7,8 @@ from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 import jwt
-import json
-import pathlib
 from ..config.settings import settings
+from ..event_log import log_event as _log_event
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 security = HTTPBearer()
@@ -229,12 +228,4 @@ async def get_chrome_profile_info():
         raise HTTPException(status_code=500, detail=f"Chrome profile error: {str(e)}")
 
 def log_event(event: dict):
-    """Log event to JSONL file"""
-    log_path = pathlib.Path("apps/backend/logs")
-    log_path.mkdir(parents=True, exist_ok=True)
-    
-    event["timestamp"] = datetime.utcnow().isoformat()
-    event["service"] = "auth"
-    
-    with open(log_path / "app.log", "a") as f:
-        f.write(json.dumps(event) + "\n")
+    _log_event(event, service="auth")
@@ -0,0 +1,95 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel
+
+from ..config.settings import settings
+from ..event_log import log_event
+from workers.autofill.task_queue import TaskQueue
+
+router = APIRouter(prefix="/autofill", tags=["autofill"])
+
+# Pydantic models
+class AutofillRequest(BaseModel):
+    job_id: Optional[str] = None
+    url: str
+    track: Optional[str] = None
+    form_data: Dict[str, Any] = {}
+    max_attempts: Optional[int] = None
+
+class AutofillTask(BaseModel):
+    id: str
+    job_id: Optional[str] = None
+    url: str
+    status: str
+    attempts: int
+    max_attempts: int
+    last_error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    created_at: float
+    updated_at: float
+
+# Durable queue shared with workers/autofill/main.py
+task_queue = TaskQueue(settings.autofill_queue_path)
+
+
+def _default_resume_path(track: str) -> Optional[str]:
+    from .resumes import resumes_db
+    for resume in resumes_db.values():
+        if resume.track == track and resume.is_default and resume.file_path:
+            return resume.file_path
+    return None
+
+@router.post("/run", response_model=AutofillTask)
+async def run_autofill(req: AutofillRequest):
+    """Queue an autofill run; poll /autofill/tasks/{id} for the outcome"""
+    from .jobs import jobs_db
+
+    job = jobs_db.get(req.job_id) if req.job_id else None
+    if job is not None:
+        if job.get("status") == "closed":
+            raise HTTPException(status_code=400, detail="Job posting is closed")
+        if job.get("duplicate_of"):
+            raise HTTPException(status_code=409, detail=f"Job duplicates {job['duplicate_of']}")
+
+    form_data = dict(req.form_data)
+    if req.track and "resume" not in form_data:
+        resume_path = _default_resume_path(req.track)
+        if resume_path:
+            form_data["resume"] = resume_path
+
+    task_id = task_queue.enqueue(
+        req.url,
+        form_data,
+        job_id=req.job_id,
+        max_attempts=req.max_attempts or settings.autofill_max_attempts,
+    )
+    log_event({"type": "autofill_queued", "task_id": task_id, "job_id": req.job_id, "url": req.url})
+    return AutofillTask(**task_queue.get(task_id))
+
+@router.get("/tasks", response_model=List[AutofillTask])
+async def list_autofill_tasks(
+    status: Optional[str] = Query(None, description="Filter by task status"),
+    job_id: Optional[str] = Query(None, description="Filter by job"),
+    limit: int = Query(100, description="Max tasks to return")
+):
+    """List queued, running and finished autofill tasks, newest first"""
+    return [AutofillTask(**task) for task in task_queue.list(status=status, job_id=job_id, limit=limit)]
+
+@router.get("/tasks/{task_id}", response_model=AutofillTask)
+async def get_autofill_task(task_id: str):
+    """Current status of one autofill task"""
+    task = task_queue.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return AutofillTask(**task)
+
+@router.get("/stats")
+async def autofill_stats():
+    """Task counts by status"""
+    return task_queue.counts()
+
+@router.get("/schema-cache")
+async def schema_cache_stats():
+    """Learned form schema hit rates, as persisted by the worker"""
+    from ..services.form_schema_cache import FormSchemaCache
+    return FormSchemaCache().stats()
@@ -3,8 +3,6 @@ from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime, timedelta
 import os
-import json
-import pathlib
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
@@ -16,6 +14,7 @@ class JobCreate(BaseModel):
     jd_url: str
     track: str
     notes: Optional[str] = None
+    jd_text: Optional[str] = None
 
 class JobUpdate(BaseModel):
     company: Optional[str] = None
@@ -23,6 +22,7 @@ class JobUpdate(BaseModel):
     jd_url: Optional[str] = None
     track: Optional[str] = None
     notes: Optional[str] = None
+    jd_text: Optional[str] = None
 
 class Job(BaseModel):
     job_id: str
@@ -35,16 +35,56 @@ class Job(BaseModel):
     created_at: datetime
     updated_at: datetime
     notes: Optional[str] = None
+    jd_text: Optional[str] = None
+    duplicate_of: Optional[str] = None
+    skills: List[str] = []  # taxonomy skills named in jd_text
+
+class BulkImportResult(BaseModel):
+    added: List[str]
+    duplicates: dict  # job_id -> job_id already holding the same posting
+    existing_ids: List[str]
 
 # File-based storage for demo (replace with database)
 from ..storage import load_jobs, save_jobs
+from ..services.job_index import JobIndex
+from ..services.near_duplicates import NearDuplicateIndex
+from ..services.jd_vectors import jd_vector_index
+from ..services.skill_extractor import skill_extractor
+from ..event_log import log_event
 
 jobs_db = load_jobs()
 
-def log_event(event: dict):
-    log_path = pathlib.Path("apps/backend/logs")
-    log_path.mkdir(parents=True, exist_ok=True)
-    (log_path / "app.log").open("a").write(json.dumps(event) + "\n")
+# Canonical jd_url -> job_id, consulted on every add and bulk import
+job_index = JobIndex.from_jobs(jobs_db)
+# MinHash/LSH over JD text catches reposts under different URLs
+jd_index = NearDuplicateIndex.from_jobs(jobs_db)
+# JD term vectors for /match/batch; also feeds the matcher's document frequencies
+jd_vector_index.sync(jobs_db)
+
+def find_duplicate(jd_url: str, jd_text: Optional[str] = None) -> Optional[str]:
+    """Job already tracking this posting, by canonical URL or near-identical JD"""
+    owner = job_index.lookup(jd_url)
+    if owner is None and jd_text:
+        matches = jd_index.query(jd_text)
+        owner = matches[0][0] if matches else None
+    return _cluster_root(owner)
+
+def register_job(job_id: str, jd_url: str, jd_text: Optional[str] = None) -> Optional[str]:
+    """Add a posting to the dedupe indexes; returns the job it duplicates, if any"""
+    owner = job_index.add(job_id, jd_url)
+    if jd_text:
+        jd_vector_index.add(job_id, jd_text)
+    if owner is None and jd_text:
+        match = jd_index.add(job_id, jd_text)
+        owner = match[0] if match else None
+    return _cluster_root(owner)
+
+def _cluster_root(job_id: Optional[str]) -> Optional[str]:
+    """Follow duplicate_of links so every repost points at the first job in its cluster"""
+    if job_id is None:
+        return None
+    return jobs_db.get(job_id, {}).get("duplicate_of") or job_id
+
 
 @router.get("/list", response_model=List[Job])
 async def list_jobs():
@@ -59,10 +99,53 @@ async def add_job(job: JobCreate):
     if job.job_id in jobs_db:
         raise HTTPException(status_code=400, detail="Job ID already exists")
     
+    new_job = _new_job(job)
+    jobs_db[job.job_id] = new_job.dict()
+    save_jobs(jobs_db)  # Persist to file
+    log_event({
+        "type": "job_added", 
+        "job_id": job.job_id, 
+        "company": job.company, 
+        "role": job.role,
+        "duplicate_of": new_job.duplicate_of
+    })
+    
+    return new_job
+
+@router.post("/bulk", response_model=BulkImportResult)
+async def bulk_import_jobs(jobs: List[JobCreate]):
+    """Import many jobs, skipping ones whose posting is already tracked"""
+    added, duplicates, existing_ids = [], {}, []
+    
+    for job in jobs:
+        if job.job_id in jobs_db:
+            existing_ids.append(job.job_id)
+            continue
+        owner = find_duplicate(job.jd_url, job.jd_text)
+        if owner:
+            duplicates[job.job_id] = owner
+            continue
+        
+        jobs_db[job.job_id] = _new_job(job).dict()
+        added.append(job.job_id)
+    
+    if added:
+        save_jobs(jobs_db)  # Persist to file
+    log_event({
+        "type": "jobs_bulk_imported", 
+        "added": len(added), 
+        "duplicates": len(duplicates), 
+        "existing_ids": len(existing_ids)
+    })
+    
+    return BulkImportResult(added=added, duplicates=duplicates, existing_ids=existing_ids)
+
+def _new_job(job: JobCreate) -> Job:
+    """Build a new job record and claim its canonical URL in the index"""
     now = datetime.utcnow()
     apply_by = now + timedelta(days=1)  # SLA: apply within 24h
     
-    new_job = Job(
+    return Job(
         job_id=job.job_id,
         company=job.company,
         role=job.role,
@@ -72,14 +155,22 @@ async def add_job(job: JobCreate):
         apply_by=apply_by,
         created_at=now,
         updated_at=now,
-        notes=job.notes
+        notes=job.notes,
+        jd_text=job.jd_text,
+        duplicate_of=register_job(job.job_id, job.jd_url, job.jd_text),
+        skills=skill_extractor.extract(job.jd_text)
     )
+
+@router.post("/recrawl")
+async def recrawl_jobs(limit: Optional[int] = Query(None, description="Max postings to check")):
+    """Revalidate due postings and mark closed or changed ones"""
+    from ..services.posting_recrawler import posting_recrawler
     
-    jobs_db[job.job_id] = new_job.dict()
-    save_jobs(jobs_db)  # Persist to file
-    log_event({"type": "job_added", "job_id": job.job_id, "company": job.company, "role": job.role})
+    summary = await posting_recrawler.run(jobs_db, limit=limit)
+    if summary["closed"] or summary["changed"]:
+        save_jobs(jobs_db)  # Persist to file
     
-    return new_job
+    return {"ok": True, **summary}
 
 @router.put("/{job_id}", response_model=Job)
 async def update_job(job_id: str, job_update: JobUpdate):
@@ -90,15 +181,26 @@ async def update_job(job_id: str, job_update: JobUpdate):
     job = jobs_db[job_id]
     update_data = job_update.dict(exclude_unset=True)
     
-    for field, value in update_data.items():
-        setattr(job, field, value)
+    reindex = "jd_url" in update_data or "jd_text" in update_data
+    if reindex:
+        # A JD-only edit keeps the job's place in line for its URL
+        if update_data.get("jd_url", job["jd_url"]) != job["jd_url"]:
+            job_index.remove(job_id, job["jd_url"])
+        jd_index.remove(job_id)
+        jd_vector_index.remove(job_id)
     
-    job.updated_at = datetime.utcnow()
-    jobs_db[job_id] = job.dict()
+    job.update(update_data)
+    job["updated_at"] = datetime.utcnow()
+    
+    if reindex:
+        job["duplicate_of"] = register_job(job_id, job["jd_url"], job.get("jd_text"))
+        job["skills"] = skill_extractor.extract(job.get("jd_text"))
+    
+    jobs_db[job_id] = job
     save_jobs(jobs_db)  # Persist to file
     
     log_event({"type": "job_updated", "job_id": job_id, "updates": update_data})
-    return job
+    return Job(**job)
 
 @router.delete("/{job_id}")
 async def delete_job(job_id: str):
@@ -106,7 +208,14 @@ async def delete_job(job_id: str):
     if job_id not in jobs_db:
         raise HTTPException(status_code=404, detail="Job not found")
     
+    job_index.remove(job_id, jobs_db[job_id]["jd_url"])
+    jd_index.remove(job_id)
+    jd_vector_index.remove(job_id)
     del jobs_db[job_id]
+    # Reposts of a deleted job re-root on the oldest survivor
+    survivors = [other_id for other_id, other in jobs_db.items() if other.get("duplicate_of") == job_id]
+    for other_id in survivors:
+        jobs_db[other_id]["duplicate_of"] = survivors[0] if other_id != survivors[0] else None
     save_jobs(jobs_db)  # Persist to file
     log_event({"type": "job_deleted", "job_id": job_id})
     
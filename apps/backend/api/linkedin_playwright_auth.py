@@ -34,7 +34,8 @@ async def linkedin_status():
         return {
             "authenticated": True,
             "message": "LinkedIn credentials configured",
-            "email": linkedin_playwright.email
+            "email": linkedin_playwright.email,
+            "session_saved": linkedin_playwright.has_session()
         }
         
     except Exception as e:
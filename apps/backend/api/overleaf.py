@@ -2,10 +2,9 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Dict, Any
 import os
-import json
-import pathlib
 import webbrowser
 from tools.overleaf import OverleafClient
+from ..event_log import log_event
 
 router = APIRouter(prefix="/overleaf", tags=["overleaf"])
 
@@ -16,10 +15,6 @@ class OverleafBuildRequest(BaseModel):
 class OverleafOpenRequest(BaseModel):
     url: str
 
-def log_event(event: dict):
-    log_path = pathlib.Path("apps/backend/logs")
-    log_path.mkdir(parents=True, exist_ok=True)
-    (log_path / "app.log").open("a").write(json.dumps(event) + "\n")
 
 @router.post("/build")
 async def build_pdf(request: OverleafBuildRequest):
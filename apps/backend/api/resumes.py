@@ -3,8 +3,9 @@ from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 import os
-import json
 import pathlib
+from ..services.jd_vectors import jd_vector_index
+from ..event_log import log_event
 
 router = APIRouter(prefix="/resume", tags=["resumes"])
 
@@ -34,10 +35,13 @@ class Resume(BaseModel):
 # In-memory storage for demo (replace with database)
 resumes_db = {}
 
-def log_event(event: dict):
-    log_path = pathlib.Path("apps/backend/logs")
-    log_path.mkdir(parents=True, exist_ok=True)
-    (log_path / "app.log").open("a").write(json.dumps(event) + "\n")
+
+def default_resume(track: str) -> Optional[Resume]:
+    """The track's default resume, if one is set"""
+    for resume in resumes_db.values():
+        if resume.track == track and resume.is_default:
+            return resume
+    return None
 
 @router.get("/list", response_model=List[Resume])
 async def list_resumes(track: Optional[str] = Query(None, description="Filter by track")):
@@ -91,6 +95,7 @@ async def upload_resume(
         for existing_resume in resumes_db.values():
             if existing_resume.track == track and existing_resume.id != resume_id:
                 existing_resume.is_default = False
+        jd_vector_index.invalidate_track(track)
     
     resumes_db[resume_id] = new_resume
     
@@ -121,6 +126,7 @@ async def set_default_resume(resume_id: str = Query(..., description="Resume ID"
     resume.is_default = True
     resume.updated_at = datetime.utcnow()
     resumes_db[resume_id] = resume
+    jd_vector_index.invalidate_track(resume.track)
     
     log_event({"type": "resume_set_default", "resume_id": resume_id, "track": resume.track})
     
@@ -3,9 +3,14 @@ from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
 from enum import Enum
+import asyncio
 import os
-import json
-import pathlib
+from workers.crawler.main import Crawler, load_frontier, save_frontier
+from ..models.job import JobTrack
+from ..services.ats_board_service import ats_board_service
+from ..storage import save_jobs
+from .jobs import jobs_db, find_duplicate, register_job
+from ..event_log import log_event
 
 router = APIRouter(prefix="/sites", tags=["job-sources"])
 
@@ -41,10 +46,10 @@ class Site(BaseModel):
 # In-memory storage for demo (replace with database)
 sites_db = {}
 
-def log_event(event: dict):
-    log_path = pathlib.Path("apps/backend/logs")
-    log_path.mkdir(parents=True, exist_ok=True)
-    (log_path / "app.log").open("a").write(json.dumps(event) + "\n")
+# The crawl frontier is the worker's persisted one, reloaded per request; the lock keeps
+# this process's own requests from overwriting each other's saves
+crawl_lock = asyncio.Lock()
+
 
 @router.get("/", response_model=List[Site])
 async def list_sites():
@@ -71,6 +76,10 @@ async def add_site(site: SiteCreate):
     )
     
     sites_db[site_id] = new_site
+    async with crawl_lock:
+        frontier = load_frontier()
+        if frontier.seed_sites([new_site]):
+            save_frontier(frontier)
     log_event({
         "type": "site_added", 
         "site_id": site_id, 
@@ -81,6 +90,29 @@ async def add_site(site: SiteCreate):
     
     return new_site
 
+@router.get("/crawl/stats")
+async def crawl_stats():
+    """Get crawl frontier statistics"""
+    return load_frontier().stats()
+
+@router.post("/crawl/run")
+async def crawl_run(workers: int = 8):
+    """Fetch one batch of due career pages, at most one request per domain"""
+    async with crawl_lock:
+        frontier = load_frontier()
+        frontier.seed_sites(list(sites_db.values()))
+        results = await Crawler(frontier, workers=workers).crawl_batch()
+        save_frontier(frontier)
+
+    log_event({
+        "type": "crawl_batch",
+        "fetched": len(results),
+        "changed": sum(1 for r in results if r.get("changed")),
+        "failed": sum(1 for r in results if not r["ok"])
+    })
+    
+    return {"ok": True, "results": results, "stats": frontier.stats()}
+
 @router.put("/{site_id}", response_model=Site)
 async def update_site(site_id: str, site_update: SiteUpdate):
     """Update an existing job source"""
@@ -110,6 +142,60 @@ async def delete_site(site_id: str):
     
     return {"ok": True, "message": "Site deleted successfully"}
 
+@router.post("/{site_id}/sync")
+async def sync_site(site_id: str, track: JobTrack = JobTrack.PM):
+    """Import postings from a Greenhouse, Lever or Ashby board via its public JSON API"""
+    if site_id not in sites_db:
+        raise HTTPException(status_code=404, detail="Site not found")
+    
+    site = sites_db[site_id]
+    board = ats_board_service.board_from_url(site.url)
+    if not board:
+        raise HTTPException(status_code=400, detail="Site is not a supported ATS job board")
+    
+    ats_type, board_token = board
+    try:
+        result = await ats_board_service.sync_board(ats_type, board_token, company=site.name, track=track)
+    except Exception as e:
+        log_event({"type": "site_sync_failed", "site_id": site_id, "url": site.url, "error": str(e)})
+        raise HTTPException(status_code=502, detail=f"Board sync failed: {str(e)}")
+    
+    imported = duplicates = 0
+    for job in result["new"] + result["updated"]:
+        existing = jobs_db.get(job.job_id)
+        if existing:
+            # Keep pipeline state; refresh only the posting fields
+            existing.update({"role": job.role, "notes": job.notes})
+        elif find_duplicate(job.jd_url, job.jd_text):
+            # Same posting (or a near-identical repost) already tracked from another source
+            duplicates += 1
+        else:
+            register_job(job.job_id, job.jd_url, job.jd_text)
+            jobs_db[job.job_id] = job.model_dump()
+            imported += 1
+    if imported or result["updated"]:
+        save_jobs(jobs_db)
+    
+    log_event({
+        "type": "site_synced",
+        "site_id": site_id,
+        "board": result["board"],
+        "imported": imported,
+        "duplicates": duplicates,
+        "updated": len(result["updated"]),
+        "removed": len(result["removed"])
+    })
+    
+    return {
+        "ok": True,
+        "board": result["board"],
+        "not_modified": result["not_modified"],
+        "imported": imported,
+        "duplicates": duplicates,
+        "updated": len(result["updated"]),
+        "removed": result["removed"]
+    }
+
 @router.post("/{site_id}/test")
 async def test_site(site_id: str):
     """Test a job source URL"""
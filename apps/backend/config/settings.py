@@ -48,6 +48,10 @@ class Settings(BaseSettings):
     linkedin_email: Optional[str] = Field(default=None, env="LINKEDIN_EMAIL")
     linkedin_password: Optional[str] = Field(default=None, env="LINKEDIN_PASSWORD")
     linkedin_session_cookie: Optional[str] = Field(default=None, env="LINKEDIN_SESSION_COOKIE")
+    linkedin_storage_state_path: str = Field(
+        default="./data/linkedin_storage_state.json",
+        env="LINKEDIN_STORAGE_STATE_PATH"
+    )
     
     # Indeed
     indeed_email: Optional[str] = Field(default=None, env="INDEED_EMAIL")
@@ -69,6 +73,26 @@ class Settings(BaseSettings):
     ats_headless_mode: bool = Field(default=False, env="ATS_HEADLESS_MODE")
     ats_timeout: int = Field(default=30000, env="ATS_TIMEOUT")
     ats_wait_for_navigation: bool = Field(default=True, env="ATS_WAIT_FOR_NAVIGATION")
+    ats_pool_size: int = Field(default=2, env="ATS_POOL_SIZE")
+    ats_context_max_uses: int = Field(default=20, env="ATS_CONTEXT_MAX_USES")
+    ats_context_max_heap_mb: float = Field(default=512, env="ATS_CONTEXT_MAX_HEAP_MB")
+    ats_trace_slow_runs: bool = Field(default=False, env="ATS_TRACE_SLOW_RUNS")
+    ats_trace_threshold_ms: float = Field(default=20000, env="ATS_TRACE_THRESHOLD_MS")
+    ats_trace_dir: str = Field(default="./data/traces", env="ATS_TRACE_DIR")
+    ats_direct_submit: bool = Field(default=False, env="ATS_DIRECT_SUBMIT")
+    automation_block_resources: str = Field(default="image,media,font", env="AUTOMATION_BLOCK_RESOURCES")
+    automation_block_trackers: bool = Field(default=True, env="AUTOMATION_BLOCK_TRACKERS")
+    autofill_queue_path: str = Field(default="./data/autofill_queue.db", env="AUTOFILL_QUEUE_PATH")
+    autofill_concurrency: int = Field(default=2, env="AUTOFILL_CONCURRENCY")
+    autofill_visibility_timeout: float = Field(default=300, env="AUTOFILL_VISIBILITY_TIMEOUT")
+    autofill_max_attempts: int = Field(default=3, env="AUTOFILL_MAX_ATTEMPTS")
+    form_schema_cache_path: str = Field(default="./data/form_schemas.db", env="FORM_SCHEMA_CACHE_PATH")
+    jd_vectors_path: str = Field(default="./data/jd_vectors.db", env="JD_VECTORS_PATH")
+    result_cache_path: str = Field(default="./data/result_cache.db", env="RESULT_CACHE_PATH")
+    result_cache_ttl_seconds: float = Field(default=7 * 24 * 3600, env="RESULT_CACHE_TTL_SECONDS")
+    result_cache_memory_size: int = Field(default=1024, env="RESULT_CACHE_MEMORY_SIZE")
+    llm_requests_per_minute: int = Field(default=500, env="LLM_REQUESTS_PER_MINUTE")
+    llm_tokens_per_minute: int = Field(default=200_000, env="LLM_TOKENS_PER_MINUTE")
     
     # Email Configuration
     smtp_host: str = Field(default="smtp.gmail.com", env="SMTP_HOST")
@@ -0,0 +1,20 @@
+"""
+JSONL event log shared by the API routes and services
+"""
+import json
+import pathlib
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+LOG_DIR = pathlib.Path("apps/backend/logs")
+
+
+def log_event(event: Dict[str, Any], service: Optional[str] = None) -> None:
+    """Append an event to apps/backend/logs/app.log; service events are stamped with
+    the service name and time"""
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    if service is not None:
+        event["timestamp"] = datetime.utcnow().isoformat()
+        event["service"] = service
+    with open(LOG_DIR / "app.log", "a") as f:
+        f.write(json.dumps(event) + "\n")
@@ -1,9 +1,10 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Literal, Optional
+from typing import Any, Dict, Iterator, List, Literal, Optional, Tuple
 from datetime import datetime, timedelta
-import os, json, pathlib
+import os, json, pathlib, re, time, zipfile
 from dotenv import load_dotenv
 
 # Import new API routes
@@ -15,6 +16,17 @@ from .api.dashboard import router as dashboard_router
 from .api.auth import router as auth_router
 from .api.linkedin_auth import router as linkedin_auth_router
 from .api.linkedin_playwright_auth import router as linkedin_playwright_auth_router
+from .api.autofill import router as autofill_router
+from .api.ats import router as ats_router
+
+from .api.jobs import jobs_db
+from .api.resumes import default_resume
+from .services.jd_matcher import SCORER_VERSION, SparseVector, jd_matcher
+from .services.jd_vectors import jd_vector_index
+from .services.result_cache import result_cache
+from .services.resume_text import extract_text
+from .services.skill_extractor import skill_extractor
+from .event_log import log_event
 
 load_dotenv()
 
@@ -42,12 +54,14 @@ app.include_router(dashboard_router)
 app.include_router(auth_router)
 app.include_router(linkedin_auth_router)
 app.include_router(linkedin_playwright_auth_router)
+app.include_router(autofill_router)
+app.include_router(ats_router)
 
-LOG_PATH = pathlib.Path("apps/backend/logs")
-LOG_PATH.mkdir(parents=True, exist_ok=True)
-
-def log_event(event: dict):
-    (LOG_PATH / "app.log").open("a").write(json.dumps(event) + "\n")
+@app.on_event("shutdown")
+async def shutdown_browser_pool():
+    """Close the shared Playwright browser and driver with the app"""
+    from .services.ats_service import ats_service
+    await ats_service.pool.stop()
 
 class BulletRewrite(BaseModel):
     original: str
@@ -66,6 +80,47 @@ class JDMatchResponse(BaseModel):
     rewritten_bullets: List[BulletRewrite]
     cover_letter: str
     risks: List[str]
+    raw_score: Optional[float] = None
+    term_contributions: List[dict] = []  # {term, jd_weight, resume_weight, contribution}
+    latency_ms: Optional[float] = None
+    cached: bool = False  # served from the result cache; latency_ms is then the lookup time
+
+class JDBatchMatchRequest(BaseModel):
+    resume_text: Optional[str] = None
+    track: Optional[str] = None  # use the track's default resume instead of resume_text
+    job_ids: List[str] = []
+    jd_texts: List[str] = []  # with neither, every open, non-duplicate job with a JD is ranked
+    top_k: int = 20
+
+class JDBatchMatch(BaseModel):
+    job_id: Optional[str] = None
+    index: Optional[int] = None  # position in jd_texts
+    match_score: float
+    raw_score: float
+
+class JDBatchMatchResponse(BaseModel):
+    results: List[JDBatchMatch]
+    scored: int
+    skipped: List[str]  # job_ids that are unknown or have no JD text
+    latency_ms: float
+
+# resume_match.system.md caps missing_skills at 7
+MAX_MISSING_SKILLS = 7
+
+# Upper bound on JDs scored per /match/batch call
+MAX_BATCH_JDS = 50_000
+
+# Memoized /match responses are keyed on this; bump the suffix when the response template changes
+MATCH_VERSION = f"{SCORER_VERSION}/taxonomy-{skill_extractor.version}/match-1"
+result_cache.purge("match", keep_version=MATCH_VERSION)
+
+# JDMatchResponse fields known before any text is generated; the first streamed event
+SCORE_FIELDS = {"match_score", "raw_score", "missing_skills", "risks", "term_contributions", "latency_ms", "cached"}
+
+# Word-sized cover letter deltas that join back to the exact text
+COVER_TOKEN = re.compile(r"\s*\S+\s*")
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
 
 class ApplyPackRequest(BaseModel):
     job_id: str
@@ -95,19 +150,100 @@ def health():
 
 @app.post("/match", response_model=JDMatchResponse)
 def match(req: JDMatchRequest):
-    # Stub logic: deterministic placeholders. Wire LLM later.
-    # Simple heuristic for demo
-    score = 0.62
-    missing = ["A/B testing", "Amplitude/GA4", "SQL window functions"]
+    """Score a resume against a JD; repeats of the same normalized inputs come from the result cache.
+
+    The JD's idf weights drift as more JDs are ingested, so a cached score can lag a
+    fresh one by at most the cache TTL.
+    """
+    *_, (_, response) = _match_events(req)
+    return JDMatchResponse(**response)
+
+@app.post("/match/stream")
+def match_stream(req: JDMatchRequest):
+    """/match as Server-Sent Events: `score` (score, gaps, risks) as soon as it is computed,
+    then a `bullet` per rewrite and `cover` token deltas, then `done` with the full response.
+
+    Rewrites and the cover letter are still templates, so today only `score` saves
+    time; the events stay the same once a model streams them.
+    """
+    return StreamingResponse(_sse(_match_events(req)), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@app.get("/match/cache")
+def match_cache_stats():
+    """Result cache hit rates per namespace"""
+    return result_cache.stats()
+
+def _sse(events: Iterator[Tuple[str, Any]]) -> Iterator[str]:
+    for event, payload in events:
+        yield f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+def _cover_tokens(text: str) -> Iterator[str]:
+    for token in COVER_TOKEN.finditer(text):
+        yield token.group()
+
+def _match_events(req: JDMatchRequest) -> Iterator[Tuple[str, Any]]:
+    """(event, payload) pairs: score, bullet..., cover..., done. Scoring never waits on
+    generation, so the first event's latency doesn't depend on the cover letter's length."""
+    started = time.perf_counter()
+    key = result_cache.key_for(MATCH_VERSION, req.resume_text, req.jd_text, req.target_role, req.seniority)
+    cached = result_cache.get("match", key)
+    if cached is not None:
+        resp = JDMatchResponse(**{**cached, "cached": True,
+                                  "latency_ms": round((time.perf_counter() - started) * 1000, 3)})
+        scores = resp.model_dump(include=SCORE_FIELDS)
+        bullets = iter(resp.rewritten_bullets)
+        tokens = _cover_tokens(resp.cover_letter)
+    else:
+        resp = None
+        scores = {**_match_scores(req), "cached": False}
+        bullets = _rewrite_bullets(req)
+        tokens = _cover_letter_tokens(req)
+
+    yield "score", scores
+    rewritten = []
+    for bullet in bullets:
+        rewritten.append(bullet)
+        yield "bullet", bullet.model_dump()
+    cover = []
+    for token in tokens:
+        cover.append(token)
+        yield "cover", {"delta": token}
+
+    if resp is None:
+        resp = JDMatchResponse(**scores, rewritten_bullets=rewritten, cover_letter="".join(cover))
+        result_cache.put("match", key, MATCH_VERSION, resp.model_dump())
+    log_event({"type":"match", "req": req.model_dump(), "resp": resp.model_dump()})
+    yield "done", resp.model_dump()
+
+def _match_scores(req: JDMatchRequest) -> Dict[str, Any]:
+    # Score and gaps come from the local matcher; rewrites and cover letter are still placeholders
+    result = jd_matcher.score(req.resume_text, req.jd_text)
+    # Taxonomy skills name gaps the way a recruiter would; raw JD terms only when the JD names none
+    if skill_extractor.extract(req.jd_text):
+        missing = skill_extractor.missing(req.resume_text, req.jd_text, limit=MAX_MISSING_SKILLS)
+    else:
+        missing = result.missing[:MAX_MISSING_SKILLS]
+    return {
+        "match_score": result.score,
+        "missing_skills": missing,
+        "risks": [f"JD stresses {term} but the resume never mentions it; add a concrete story" for term in missing[:2]],
+        "raw_score": result.raw_score,
+        "term_contributions": result.contributions,
+        "latency_ms": result.latency_ms,
+    }
+
+def _rewrite_bullets(req: JDMatchRequest) -> Iterator[BulletRewrite]:
     # fake rewrite using the first three bullets if available in resume
     sample_original = req.resume_text.split("\n")
-    bw = []
-    for i, line in enumerate(sample_original[:3] or ["Improved process", "Led team", "Shipped feature"]):
-        bw.append(BulletRewrite(
+    for line in sample_original[:3] or ["Improved process", "Led team", "Shipped feature"]:
+        yield BulletRewrite(
             original=line.strip(),
             rewritten=f"{line.strip()} — translated to JD impact (revenue, speed, quality).",
             rationale="Aligns to JD keywords; emphasizes outcomes and metrics."
-        ))
+        )
+
+def _cover_letter_tokens(req: JDMatchRequest) -> Iterator[str]:
+    # Template letter until a model backend exists; a streaming backend yields its deltas here
     cover = (
         f"""Hi Team — applying for {req.target_role}. I’ve shipped AI/IoT/analytics products with clear outcomes: 
         - Reduced onboarding time from 30min → 5min for 10k+ devices (WhyGrene)
@@ -116,14 +252,73 @@ def match(req: JDMatchRequest):
         Looking forward to a quick screen to confirm fit.
         """
     )
-    resp = JDMatchResponse(
-        match_score=score,
-        missing_skills=missing,
-        rewritten_bullets=bw,
-        cover_letter=cover,
-        risks=["Role may require deeper marketplace metrics; add A/B test story"],
+    yield from _cover_tokens(cover)
+
+def _batch_resume(req: JDBatchMatchRequest) -> Tuple[SparseVector, Dict[str, List[Any]]]:
+    """The resume's vector for the JD index and its full term weights for ad-hoc texts"""
+    if req.resume_text:
+        weights = jd_matcher.resume_weights(req.resume_text)
+        return jd_matcher.vocabulary.vector(weights), weights
+    if not req.track:
+        raise HTTPException(status_code=400, detail="Provide resume_text or track")
+    resume = default_resume(req.track)
+    if resume is None or not resume.file_path:
+        raise HTTPException(status_code=404, detail=f"No default resume for track {req.track}")
+
+    def load_text() -> str:
+        try:
+            return extract_text(resume.file_path)
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    # Cached per track and rebuilt only when the default resume changes
+    vector = jd_vector_index.track_vector(req.track, resume.id, load_text)
+    return vector, jd_vector_index.track_weights(req.track, resume.id, load_text)
+
+@app.post("/match/batch", response_model=JDBatchMatchResponse)
+def match_batch(req: JDBatchMatchRequest):
+    """Rank many JDs against one resume in a single call"""
+    started = time.perf_counter()
+    resume, weights = _batch_resume(req)
+    if len(req.job_ids) + len(req.jd_texts) > MAX_BATCH_JDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_JDS} JDs per batch")
+
+    if req.job_ids or req.jd_texts:
+        job_ids = list(dict.fromkeys(req.job_ids))
+    else:
+        job_ids = [job_id for job_id, job in jobs_db.items()
+                   if job.get("status") != "closed" and not job.get("duplicate_of")]
+    indexed = [job_id for job_id in job_ids if job_id in jd_vector_index]
+    skipped = [job_id for job_id in job_ids if job_id not in jd_vector_index] if req.job_ids else []
+    top_k = max(req.top_k, 0)
+
+    # Stored jobs come from the JD index; ad-hoc texts are vectorized here and can
+    # also match resume terms no ingested JD has
+    ranked = [(("job", job_id), score, raw) for job_id, score, raw
+              in jd_vector_index.query(resume, top_k, candidates=indexed)]
+    if req.jd_texts:
+        texts = ((("text", index), jd_text) for index, jd_text in enumerate(req.jd_texts))
+        ranked_texts, _ = jd_matcher.score_many(weights, texts, top_k=top_k)
+        ranked = sorted(ranked + ranked_texts, key=lambda item: -item[2])[:top_k]
+
+    results = [
+        JDBatchMatch(
+            job_id=key if kind == "job" else None,
+            index=key if kind == "text" else None,
+            match_score=score,
+            raw_score=raw,
+        )
+        for (kind, key), score, raw in ranked
+    ]
+    scored = len(indexed) + len(req.jd_texts)
+    resp = JDBatchMatchResponse(
+        results=results,
+        scored=scored,
+        skipped=skipped,
+        latency_ms=round((time.perf_counter() - started) * 1000, 3),
     )
-    log_event({"type":"match", "req": req.model_dump(), "resp": resp.model_dump()})
+    log_event({"type": "match_batch", "track": req.track, "scored": scored,
+               "skipped": len(skipped), "top_k": req.top_k, "latency_ms": resp.latency_ms})
     return resp
 
 @app.post("/apply-pack")
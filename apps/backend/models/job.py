@@ -11,6 +11,7 @@ class JobStatus(str, Enum):
     SUBMITTED = "submitted"
     REJECTED = "rejected"
     INTERVIEW = "interview"
+    CLOSED = "closed"
 
 class JobTrack(str, Enum):
     PO = "PO"
@@ -23,6 +24,7 @@ class JobBase(BaseModel):
     jd_url: str = Field(..., description="Job description URL")
     track: JobTrack = Field(..., description="Resume track to use")
     notes: Optional[str] = Field(None, description="Additional notes")
+    jd_text: Optional[str] = Field(None, description="Job description text")
 
 class JobCreate(JobBase):
     job_id: str = Field(..., description="Unique job identifier")
@@ -33,6 +35,7 @@ class JobUpdate(BaseModel):
     jd_url: Optional[str] = None
     track: Optional[JobTrack] = None
     notes: Optional[str] = None
+    jd_text: Optional[str] = None
 
 class Job(JobBase):
     job_id: str = Field(..., description="Unique job identifier")
@@ -0,0 +1,236 @@
+"""
+Public job-board JSON adapters for Greenhouse, Lever and Ashby
+"""
+import html
+import httpx
+import re
+from typing import Dict, List, Optional, Any
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+from workers.autofill.ats_detector import ATSDetector, ATSType
+from ..models.job import Job, JobStatus, JobTrack
+from ..storage import load_data, save_data
+from ..event_log import log_event
+
+TAGS = re.compile(r"<[^>]+>")
+
+
+class BoardPosting:
+    """A posting as read from an ATS board, before conversion to a Job"""
+
+    def __init__(self, posting_id: str, title: str, url: str, location: str = "",
+                 department: str = "", updated_at: Optional[str] = None, description: str = ""):
+        self.posting_id = posting_id
+        self.title = title
+        self.url = url
+        self.location = location
+        self.department = department
+        self.updated_at = updated_at
+        self.description = description
+
+
+class BoardAdapter:
+    """Base adapter: one HTTP GET lists every open posting on a board"""
+
+    ats_type = ATSType.UNKNOWN
+    base_url = ""
+
+    def __init__(self, base_url: Optional[str] = None):
+        if base_url:
+            self.base_url = base_url.rstrip("/")
+
+    def board_url(self, board_token: str) -> str:
+        raise NotImplementedError
+
+    def parse(self, payload: Any) -> List[BoardPosting]:
+        raise NotImplementedError
+
+
+class GreenhouseBoard(BoardAdapter):
+    """Greenhouse Job Board API"""
+
+    ats_type = ATSType.GREENHOUSE
+    base_url = "https://boards-api.greenhouse.io"
+
+    def board_url(self, board_token: str) -> str:
+        return f"{self.base_url}/v1/boards/{board_token}/jobs?content=true"
+
+    def parse(self, payload: Any) -> List[BoardPosting]:
+        postings = []
+        for job in payload.get("jobs", []):
+            departments = job.get("departments") or []
+            postings.append(BoardPosting(
+                posting_id=str(job["id"]),
+                title=job.get("title", ""),
+                url=job.get("absolute_url", ""),
+                location=(job.get("location") or {}).get("name", ""),
+                department=departments[0].get("name", "") if departments else "",
+                updated_at=job.get("updated_at"),
+                description=job.get("content", "")
+            ))
+        return postings
+
+
+class LeverBoard(BoardAdapter):
+    """Lever Postings API"""
+
+    ats_type = ATSType.LEVER
+    base_url = "https://api.lever.co"
+
+    def board_url(self, board_token: str) -> str:
+        return f"{self.base_url}/v0/postings/{board_token}?mode=json"
+
+    def parse(self, payload: Any) -> List[BoardPosting]:
+        postings = []
+        for job in payload:
+            categories = job.get("categories") or {}
+            timestamp = job.get("updatedAt") or job.get("createdAt")
+            postings.append(BoardPosting(
+                posting_id=str(job["id"]),
+                title=job.get("text", ""),
+                url=job.get("hostedUrl", ""),
+                location=categories.get("location", ""),
+                department=categories.get("team", ""),
+                updated_at=datetime.utcfromtimestamp(timestamp / 1000).isoformat() if timestamp else None,
+                description=job.get("descriptionPlain", "")
+            ))
+        return postings
+
+
+class AshbyBoard(BoardAdapter):
+    """Ashby public Job Posting API"""
+
+    ats_type = ATSType.ASHBY
+    base_url = "https://api.ashbyhq.com"
+
+    def board_url(self, board_token: str) -> str:
+        return f"{self.base_url}/posting-api/job-board/{board_token}"
+
+    def parse(self, payload: Any) -> List[BoardPosting]:
+        postings = []
+        for job in payload.get("jobs", []):
+            if job.get("isListed") is False:
+                continue
+            postings.append(BoardPosting(
+                posting_id=str(job["id"]),
+                title=job.get("title", ""),
+                url=job.get("jobUrl", ""),
+                location=job.get("location", ""),
+                department=job.get("department", ""),
+                updated_at=job.get("publishedAt"),
+                description=job.get("descriptionPlain", "")
+            ))
+        return postings
+
+
+class ATSBoardService:
+    """Lists and incrementally syncs ATS job boards over plain HTTP"""
+
+    def __init__(self, adapters: Optional[Dict[ATSType, BoardAdapter]] = None):
+        self.adapters = adapters or {
+            ATSType.GREENHOUSE: GreenhouseBoard(),
+            ATSType.LEVER: LeverBoard(),
+            ATSType.ASHBY: AshbyBoard()
+        }
+        self.detector = ATSDetector()
+        self.sync_state = load_data("board_sync")
+
+    def board_from_url(self, url: str) -> Optional[tuple]:
+        """Resolve a board URL like https://jobs.lever.co/acme to (ATSType, board token)"""
+        ats_type = self.detector.detect_from_url(url)
+        if ats_type not in self.adapters:
+            return None
+
+        segments = [s for s in urlsplit(url).path.split("/") if s]
+        if not segments:
+            return None
+        return ats_type, segments[0]
+
+    def to_job(self, ats_type: ATSType, board_token: str, posting: BoardPosting,
+               company: str, track: JobTrack) -> Job:
+        """Normalize a board posting into the Job model"""
+        now = datetime.utcnow()
+        notes = " | ".join(part for part in [posting.location, posting.department] if part)
+        return Job(
+            job_id=f"{ats_type.value}_{board_token}_{posting.posting_id}",
+            company=company,
+            role=posting.title.strip(),
+            jd_url=posting.url,
+            track=track,
+            notes=notes or None,
+            jd_text=TAGS.sub(" ", html.unescape(posting.description)).strip() or None,
+            status=JobStatus.NEW,
+            apply_by=now + timedelta(days=1),  # SLA: apply within 24h
+            created_at=now,
+            updated_at=now
+        )
+
+    async def sync_board(self, ats_type: ATSType, board_token: str, company: Optional[str] = None,
+                         track: JobTrack = JobTrack.PM,
+                         client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
+        """Fetch a board and diff it against the last sync"""
+        adapter = self.adapters[ats_type]
+        key = f"{ats_type.value}:{board_token}"
+        state = self.sync_state.get(key, {})
+
+        headers = {"Accept": "application/json"}
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+
+        url = adapter.board_url(board_token)
+        if client is not None:
+            response = await client.get(url, headers=headers)
+        else:
+            async with httpx.AsyncClient(timeout=20, follow_redirects=True) as owned_client:
+                response = await owned_client.get(url, headers=headers)
+
+        result = {"board": key, "not_modified": False, "new": [], "updated": [], "removed": []}
+
+        if response.status_code == 304:
+            result["not_modified"] = True
+            self.log_event({"type": "ats_board_sync", "board": key, "not_modified": True})
+            return result
+
+        response.raise_for_status()
+        postings = adapter.parse(response.json())
+        company = company or board_token.replace("-", " ").title()
+
+        seen = state.get("postings", {})
+        current = {}
+        for posting in postings:
+            current[posting.posting_id] = posting.updated_at
+            job = self.to_job(ats_type, board_token, posting, company, track)
+            if posting.posting_id not in seen:
+                result["new"].append(job)
+            elif seen[posting.posting_id] != posting.updated_at:
+                result["updated"].append(job)
+
+        result["removed"] = [
+            f"{ats_type.value}_{board_token}_{posting_id}"
+            for posting_id in seen if posting_id not in current
+        ]
+
+        self.sync_state[key] = {
+            "etag": response.headers.get("etag"),
+            "postings": current,
+            "synced_at": datetime.utcnow().isoformat()
+        }
+        save_data("board_sync", self.sync_state)
+
+        self.log_event({
+            "type": "ats_board_sync",
+            "board": key,
+            "total": len(postings),
+            "new": len(result["new"]),
+            "updated": len(result["updated"]),
+            "removed": len(result["removed"])
+        })
+
+        return result
+
+    def log_event(self, event: Dict[str, Any]):
+        log_event(event, service="ats_boards")
+
+
+# Global service instance
+ats_board_service = ATSBoardService()
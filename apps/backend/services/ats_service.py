@@ -2,12 +2,22 @@
 ATS (Applicant Tracking System) automation service using Playwright
 """
 import asyncio
-import json
 import pathlib
 from typing import Dict, List, Optional, Any
 from datetime import datetime
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+from urllib.parse import urlsplit
 from ..config.settings import settings
+from .browser_pool import BrowserPool
+from .direct_submit import DirectSubmitter
+from .form_schema_cache import FormSchemaCache
+from .page_profile import PageProfile, ResourcePolicy
+from .run_timer import RunTimer
+from ..event_log import log_event
+from workers.autofill.ats_detector import ATSDetector, ATSType
+from workers.autofill.form_fields import CACHED_FILL_JS, DISCOVER_FIELDS_JS, FILL_FIELDS_JS, match_fields
+
+# Any fillable control means the application form has rendered
+FORM_READY_SELECTOR = "input:not([type=hidden]), textarea, select"
 
 
 class ATSService:
@@ -20,15 +30,31 @@ class ATSService:
         self.headless_mode = settings.ats_headless_mode
         self.timeout = settings.ats_timeout
         self.wait_for_navigation = settings.ats_wait_for_navigation
+        self.detector = ATSDetector()
+        self.schema_cache = FormSchemaCache()
+        self.resource_policy = ResourcePolicy.from_settings(settings)
+        self.trace_slow_runs = settings.ats_trace_slow_runs
+        self.trace_threshold_ms = settings.ats_trace_threshold_ms
+        self.trace_dir = settings.ats_trace_dir
+        self.pool = BrowserPool(
+            launch_options=self._launch_options(),
+            context_options=self._context_options(),
+            size=settings.ats_pool_size,
+            max_uses=settings.ats_context_max_uses,
+            max_heap_mb=settings.ats_context_max_heap_mb
+        )
+        self.direct = DirectSubmitter(
+            self.detector,
+            timeout=self.timeout / 1000,
+            user_agent=self._context_options()["user_agent"]
+        )
         
-    async def _get_browser(self) -> Browser:
-        """Get configured browser instance"""
-        playwright = await async_playwright().start()
-        
-        browser = await playwright.chromium.launch(
-            headless=self.headless_mode,
-            executable_path=self.chrome_executable_path,
-            args=[
+    def _launch_options(self) -> Dict[str, Any]:
+        """Chromium launch options for the shared browser"""
+        return {
+            "headless": self.headless_mode,
+            "executable_path": self.chrome_executable_path,
+            "args": [
                 f"--user-data-dir={self.chrome_user_data_dir}",
                 f"--profile-directory=Default",
                 "--disable-blink-features=AutomationControlled",
@@ -38,153 +64,255 @@ class ATSService:
                 "--disable-web-security",
                 "--disable-features=VizDisplayCompositor"
             ]
-        )
-        
-        return browser
+        }
     
-    async def _get_context(self, browser: Browser) -> BrowserContext:
-        """Get browser context with profile"""
-        context = await browser.new_context(
-            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            viewport={"width": 1920, "height": 1080},
-            locale="en-US",
-            timezone_id="America/New_York"
-        )
-        
-        return context
+    def _context_options(self) -> Dict[str, Any]:
+        """Options for each pooled browser context"""
+        return {
+            "user_agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+            "viewport": {"width": 1920, "height": 1080},
+            "locale": "en-US",
+            "timezone_id": "America/New_York"
+        }
     
     async def fill_application_form(self, job_url: str, form_data: Dict[str, Any]) -> Dict[str, Any]:
         """Fill ATS application form with provided data"""
-        browser = None
+        timer = RunTimer()
+        trace_path = None
         try:
-            browser = await self._get_browser()
-            context = await self._get_context(browser)
-            page = await context.new_page()
-            
-            # Navigate to job application page
-            await page.goto(job_url, wait_until="networkidle", timeout=self.timeout)
-            
-            # Wait for page to load
-            await page.wait_for_load_state("domcontentloaded")
-            
-            # Fill form fields
-            filled_fields = []
-            errors = []
-            
-            for field_name, field_value in form_data.items():
+            async with self.pool.context() as context:
+                timer.add("acquire", timer.elapsed_ms())
+                tracing = await self._start_trace(context)
                 try:
-                    # Try different selectors for the field
-                    selectors = [
-                        f'input[name="{field_name}"]',
-                        f'input[id="{field_name}"]',
-                        f'input[placeholder*="{field_name}"]',
-                        f'textarea[name="{field_name}"]',
-                        f'textarea[id="{field_name}"]',
-                        f'select[name="{field_name}"]',
-                        f'select[id="{field_name}"]'
-                    ]
-                    
-                    field_filled = False
-                    for selector in selectors:
-                        try:
-                            element = await page.wait_for_selector(selector, timeout=5000)
-                            if element:
-                                # Clear existing value
-                                await element.fill("")
-                                # Fill new value
-                                await element.fill(str(field_value))
-                                filled_fields.append(field_name)
-                                field_filled = True
-                                break
-                        except:
-                            continue
-                    
-                    if not field_filled:
-                        errors.append(f"Could not find field: {field_name}")
-                        
-                except Exception as e:
-                    errors.append(f"Error filling field {field_name}: {str(e)}")
+                    result = await self._fill_form(context, job_url, form_data, timer)
+                finally:
+                    if tracing:
+                        trace_path = await self._stop_trace(context, job_url, timer)
             
-            # Handle file uploads
-            if "resume" in form_data:
-                try:
-                    resume_path = form_data["resume"]
-                    if pathlib.Path(resume_path).exists():
-                        # Look for file input
-                        file_input = await page.query_selector('input[type="file"]')
-                        if file_input:
-                            await file_input.set_input_files(resume_path)
-                            filled_fields.append("resume")
-                        else:
-                            errors.append("Could not find file upload field")
-                except Exception as e:
-                    errors.append(f"Error uploading resume: {str(e)}")
+                result["timings"] = timer.summary()
+                result["trace_path"] = trace_path
             
-            # Take screenshot for verification
-            screenshot_path = f"data/screenshots/ats_form_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-            pathlib.Path(screenshot_path).parent.mkdir(parents=True, exist_ok=True)
-            await page.screenshot(path=screenshot_path)
+                # Log the event
+                self.log_event({
+                    "type": "ats_form_filled",
+                    "job_url": job_url,
+                    "result": result
+                })
             
-            result = {
-                "success": len(errors) == 0,
-                "filled_fields": filled_fields,
-                "errors": errors,
-                "screenshot_path": screenshot_path,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
-            # Log the event
-            self.log_event({
-                "type": "ats_form_filled",
-                "job_url": job_url,
-                "result": result
-            })
-            
-            return result
+                return result
             
         except Exception as e:
             error_result = {
                 "success": False,
                 "errors": [f"ATS automation failed: {str(e)}"],
+                "timings": timer.summary(),
+                "trace_path": trace_path,
                 "timestamp": datetime.utcnow().isoformat()
             }
             
             self.log_event({
                 "type": "ats_form_error",
                 "job_url": job_url,
-                "error": str(e)
+                "error": str(e),
+                "timings": error_result["timings"],
+                "trace_path": trace_path
             })
             
             return error_result
-            
-        finally:
-            if browser:
-                await browser.close()
+    
+    async def submit_application(self, job_url: str, form_data: Dict[str, Any],
+                                 ats_type: Optional[ATSType] = None, client=None) -> Dict[str, Any]:
+        """Submit Greenhouse/Lever forms over plain HTTP; anything needing JavaScript or a
+        captcha goes to the Playwright path, which fills the form for review instead"""
+        try:
+            result = await self.direct.submit(job_url, form_data, ats_type=ats_type, client=client)
+        except Exception as e:
+            error_result = {
+                "success": False,
+                "submitted": False,
+                "method": "http",
+                "errors": [f"Direct submission failed: {str(e)}"],
+                "timestamp": datetime.utcnow().isoformat()
+            }
+            self.log_event({"type": "ats_direct_error", "job_url": job_url, "error": str(e)})
+            return error_result
+    
+        reason = result.get("browser_required")
+        if reason is None:
+            return result
+    
+        self.log_event({"type": "ats_direct_fallback", "job_url": job_url, "reason": reason})
+        result = await self.fill_application_form(job_url, form_data)
+        result.update({"submitted": False, "method": "browser", "fallback_reason": reason})
+        return result
+    
+    async def _fill_form(self, context, job_url: str, form_data: Dict[str, Any], timer: RunTimer) -> Dict[str, Any]:
+        page = await context.new_page()
+        profile = await PageProfile(self.resource_policy).attach(page)
+    
+        # Navigate to job application page; ready once a form control exists
+        with timer.phase("navigation"):
+            await profile.goto(page, job_url, ready_selector=FORM_READY_SELECTOR, timeout=self.timeout)
+    
+        # Reuse the learned schema for this board/tenant, else discover
+        ats_type = self.detector.detect_from_url(job_url)
+        schema_key = self.schema_cache.key_for(job_url, ats_type)
+        cached = await self._fill_from_cache(page, schema_key, form_data, timer)
+        if cached is not None:
+            resolved, missing, fill_errors = cached
+            schema_cache, fields_discovered = "hit", 0
+        else:
+            resolved, missing, fill_errors, fields_discovered = await self._discover_and_fill(
+                page, ats_type, schema_key, form_data, timer
+            )
+            schema_cache = "miss"
+    
+        filled_fields = []
+        errors = [f"Could not find field: {field_name}" for field_name in missing]
+        for field_name, field in resolved.items():
+            if field["type"] == "file":
+                continue
+            if field_name in fill_errors:
+                errors.append(f"Error filling field {field_name}: {fill_errors[field_name]}")
+            else:
+                filled_fields.append(field_name)
+    
+        # Handle file uploads
+        for field_name, field in resolved.items():
+            if field["type"] != "file":
+                continue
+            started = timer.elapsed_ms()
+            try:
+                file_path = form_data[field_name]
+                if pathlib.Path(file_path).exists():
+                    await page.set_input_files(field["selector"], file_path)
+                    filled_fields.append(field_name)
+                else:
+                    errors.append(f"File not found for {field_name}: {file_path}")
+            except Exception as e:
+                errors.append(f"Error uploading {field_name}: {str(e)}")
+            timer.field(field_name, timer.elapsed_ms() - started)
+            timer.add("upload", timer.elapsed_ms() - started)
+    
+        # Take screenshot for verification
+        screenshot_path = f"data/screenshots/ats_form_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+        pathlib.Path(screenshot_path).parent.mkdir(parents=True, exist_ok=True)
+        with timer.phase("screenshot"):
+            await page.screenshot(path=screenshot_path)
+        page_profile = await profile.finish(page)
+    
+        return {
+            "success": len(errors) == 0,
+            "filled_fields": filled_fields,
+            "errors": errors,
+            "screenshot_path": screenshot_path,
+            "ats_type": ats_type.value,
+            "fields_discovered": fields_discovered,
+            "schema_cache": schema_cache,
+            "page_profile": page_profile,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    
+    async def _start_trace(self, context) -> bool:
+        """Record a Playwright trace for this run when slow-run tracing is on"""
+        if not self.trace_slow_runs:
+            return False
+        try:
+            await context.tracing.start(screenshots=True, snapshots=True, sources=False)
+            return True
+        except Exception:
+            return False
+    
+    async def _stop_trace(self, context, job_url: str, timer: RunTimer) -> Optional[str]:
+        """Keep the trace zip only if the run was slower than the threshold; discard it otherwise"""
+        try:
+            if timer.elapsed_ms() < self.trace_threshold_ms:
+                await context.tracing.stop()
+                return None
+            host = (urlsplit(job_url).hostname or "unknown").replace(".", "_")
+            path = pathlib.Path(self.trace_dir) / f"ats_{host}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.zip"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            await context.tracing.stop(path=str(path))
+            return str(path)
+        except Exception:
+            return None
+    
+    async def _fill_from_cache(self, page, schema_key: str, form_data: Dict[str, Any], timer: RunTimer):
+        """Fill with cached stable selectors in one round trip; None if there is no usable schema"""
+        plan = self.schema_cache.plan(schema_key, form_data)
+        if plan is None:
+            self.schema_cache.record(schema_key, "miss")
+            return None
+    
+        resolved = {key: plan["fields"][key] for key in form_data if key in plan["fields"]}
+        items = [
+            {"key": key, "selector": field["selector"], "value": form_data[key]}
+            for key, field in resolved.items() if field["type"] != "file"
+        ]
+        with timer.phase("cached_fill"):
+            outcome = await page.evaluate(CACHED_FILL_JS, {"fingerprint": plan["fingerprint"], "items": items})
+        if outcome["stale"]:
+            # The form changed shape since we learned it; rediscover and relearn
+            self.schema_cache.record(schema_key, "stale")
+            self.schema_cache.invalidate(schema_key)
+            return None
+    
+        self.schema_cache.record(schema_key, "hit")
+        if outcome["errors"]:
+            self.schema_cache.invalidate(schema_key)
+        for key, ms in outcome["timings"].items():
+            timer.field(key, ms)
+        missing = [key for key in form_data if key not in resolved]
+        return resolved, missing, outcome["errors"]
+    
+    async def _discover_and_fill(self, page, ats_type: ATSType, schema_key: str, form_data: Dict[str, Any],
+                                 timer: RunTimer):
+        """Discover every control in one round trip, match in Python, fill in one batch"""
+        with timer.phase("discovery"):
+            discovered = await page.evaluate(
+                DISCOVER_FIELDS_JS, self.detector.get_field_mappings(ats_type)
+            )
+            resolved, missing = match_fields(discovered["fields"], form_data, discovered["known"])
+    
+        # Fill all text, select and checkbox fields in one batched call
+        batch = [
+            {"key": field_name, "selector": field["selector"], "value": form_data[field_name]}
+            for field_name, field in resolved.items() if field["type"] != "file"
+        ]
+        fill_errors = {}
+        if batch:
+            with timer.phase("fill"):
+                outcome = await page.evaluate(FILL_FIELDS_JS, batch)
+            fill_errors = outcome["errors"]
+            for key, ms in outcome["timings"].items():
+                timer.field(key, ms)
+    
+        learned = {key: field for key, field in resolved.items() if key not in fill_errors}
+        self.schema_cache.learn(schema_key, discovered["fingerprint"], learned, missing)
+        return resolved, missing, fill_errors, len(discovered["fields"])
     
     async def test_ats_connection(self) -> Dict[str, Any]:
         """Test ATS service connection"""
-        browser = None
         try:
-            browser = await self._get_browser()
-            context = await self._get_context(browser)
-            page = await context.new_page()
+            async with self.pool.context() as context:
+                page = await context.new_page()
             
-            # Test with a simple page
-            await page.goto("https://httpbin.org/get", timeout=10000)
-            content = await page.content()
+                # Test with a simple page
+                await page.goto("https://httpbin.org/get", timeout=10000)
+                content = await page.content()
             
-            result = {
-                "success": True,
-                "message": "ATS service connection successful",
-                "timestamp": datetime.utcnow().isoformat()
-            }
+                result = {
+                    "success": True,
+                    "message": "ATS service connection successful",
+                    "timestamp": datetime.utcnow().isoformat()
+                }
             
-            self.log_event({
-                "type": "ats_connection_test",
-                "result": result
-            })
+                self.log_event({
+                    "type": "ats_connection_test",
+                    "result": result
+                })
             
-            return result
+                return result
             
         except Exception as e:
             error_result = {
@@ -199,10 +327,6 @@ class ATSService:
             })
             
             return error_result
-            
-        finally:
-            if browser:
-                await browser.close()
     
     async def get_chrome_profile_info(self) -> Dict[str, Any]:
         """Get Chrome profile information"""
@@ -242,15 +366,7 @@ class ATSService:
             return error_info
     
     def log_event(self, event: Dict[str, Any]):
-        """Log event to JSONL file"""
-        log_path = pathlib.Path("apps/backend/logs")
-        log_path.mkdir(parents=True, exist_ok=True)
-        
-        event["timestamp"] = datetime.utcnow().isoformat()
-        event["service"] = "ats"
-        
-        with open(log_path / "app.log", "a") as f:
-            f.write(json.dumps(event) + "\n")
+        log_event(event, service="ats")
 
 
 # Global service instance
@@ -0,0 +1,194 @@
+"""
+Long-lived Playwright driver, browser and pre-warmed context pool
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from datetime import datetime
+from playwright.async_api import async_playwright, Browser, BrowserContext, Playwright
+from ..event_log import log_event
+
+
+class PooledContext:
+    """A browser context plus the bookkeeping used to decide when to recycle it"""
+
+    def __init__(self, context: BrowserContext):
+        self.context = context
+        self.uses = 0
+        self.created_at = datetime.utcnow()
+
+
+class BrowserPool:
+    """One Playwright driver and browser per worker, handing out reusable contexts"""
+
+    def __init__(
+        self,
+        launch_options: Dict[str, Any],
+        context_options: Dict[str, Any],
+        size: int = 2,
+        max_uses: int = 20,
+        max_heap_mb: float = 512,
+        max_browser_contexts: int = 200,
+        driver_factory: Optional[Callable[[], Awaitable[Playwright]]] = None,
+        context_setup: Optional[Callable[[BrowserContext], Awaitable[None]]] = None,
+    ):
+        self.launch_options = launch_options
+        self.context_options = context_options
+        self.size = size
+        self.max_uses = max_uses
+        self.max_heap_mb = max_heap_mb
+        self.max_browser_contexts = max_browser_contexts
+        self.driver_factory = driver_factory or (lambda: async_playwright().start())
+        # Called on every new context, e.g. to install routes for offline replay
+        self.context_setup = context_setup
+
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._idle: List[PooledContext] = []
+        self._slots = asyncio.Semaphore(size)
+        self._lock = asyncio.Lock()
+        self._contexts_created = 0
+        self._checked_out = 0
+        self._stats = {"acquired": 0, "contexts_created": 0, "recycled": 0, "browser_launches": 0}
+
+    @property
+    def started(self) -> bool:
+        return self._browser is not None
+
+    async def start(self) -> None:
+        """Start the driver and browser and pre-warm `size` contexts"""
+        async with self._lock:
+            await self._ensure_browser()
+            while len(self._idle) < self.size:
+                self._idle.append(await self._new_context())
+
+    async def _ensure_browser(self) -> Browser:
+        if self._playwright is None:
+            self._playwright = await self.driver_factory()
+        if self._browser is None or not self._browser.is_connected():
+            self._idle = []
+            self._browser = await self._playwright.chromium.launch(**self.launch_options)
+            self._contexts_created = 0
+            self._stats["browser_launches"] += 1
+        return self._browser
+
+    async def _new_context(self) -> PooledContext:
+        browser = await self._ensure_browser()
+        context = await browser.new_context(**self.context_options)
+        if self.context_setup is not None:
+            await self.context_setup(context)
+        self._contexts_created += 1
+        self._stats["contexts_created"] += 1
+        return PooledContext(context)
+
+    async def _healthy(self, pooled: PooledContext) -> bool:
+        if self._browser is None or not self._browser.is_connected():
+            return False
+        try:
+            await pooled.context.cookies()
+            return True
+        except Exception:
+            return False
+
+    async def _heap_mb(self, pooled: PooledContext) -> float:
+        """Largest JS heap among the context's open pages, via the CDP Performance domain"""
+        heap = 0.0
+        for page in pooled.context.pages:
+            try:
+                session = await pooled.context.new_cdp_session(page)
+                await session.send("Performance.enable")
+                metrics = await session.send("Performance.getMetrics")
+                await session.detach()
+            except Exception:
+                continue
+            for metric in metrics.get("metrics", []):
+                if metric.get("name") == "JSHeapUsedSize":
+                    heap = max(heap, metric["value"] / (1024 * 1024))
+        return heap
+
+    async def _discard(self, pooled: PooledContext) -> None:
+        self._stats["recycled"] += 1
+        try:
+            await pooled.context.close()
+        except Exception:
+            pass
+
+    async def _acquire(self) -> PooledContext:
+        async with self._lock:
+            while self._idle:
+                pooled = self._idle.pop()
+                if await self._healthy(pooled):
+                    return pooled
+                await self._discard(pooled)
+
+            # Relaunch the browser once it has served many contexts and nothing is checked out
+            if (self._browser is not None and self._contexts_created >= self.max_browser_contexts
+                    and self._checked_out == 0):
+                await self._browser.close()
+                self._browser = None
+            return await self._new_context()
+
+    async def _release(self, pooled: PooledContext) -> None:
+        recycle = pooled.uses >= self.max_uses
+        if not recycle and self.max_heap_mb:
+            recycle = await self._heap_mb(pooled) > self.max_heap_mb
+
+        if not recycle and await self._healthy(pooled):
+            try:
+                for page in list(pooled.context.pages):
+                    await page.close()
+                await pooled.context.clear_cookies()
+            except Exception:
+                recycle = True
+
+        if recycle or not self.started:
+            await self._discard(pooled)
+        else:
+            async with self._lock:
+                self._idle.append(pooled)
+
+    @asynccontextmanager
+    async def context(self) -> AsyncIterator[BrowserContext]:
+        """Check out a context; pages are closed and cookies cleared on return"""
+        async with self._slots:
+            if not self.started:
+                await self.start()
+            pooled = await self._acquire()
+            pooled.uses += 1
+            self._checked_out += 1
+            self._stats["acquired"] += 1
+            try:
+                yield pooled.context
+            finally:
+                self._checked_out -= 1
+                await self._release(pooled)
+
+    async def stop(self) -> None:
+        """Close every context, the browser and the Playwright driver"""
+        if self._playwright is None:
+            return
+
+        async with self._lock:
+            for pooled in self._idle:
+                try:
+                    await pooled.context.close()
+                except Exception:
+                    pass
+            self._idle = []
+            if self._browser is not None:
+                try:
+                    await self._browser.close()
+                except Exception:
+                    pass
+                self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+        self.log_event({"type": "browser_pool_stopped", "stats": self.stats()})
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "idle": len(self._idle), "started": self.started}
+
+    def log_event(self, event: Dict[str, Any]):
+        log_event(event, service="browser_pool")
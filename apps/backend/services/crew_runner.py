@@ -0,0 +1,210 @@
+"""
+Runs the agent crew in agents/crew.yaml as a task DAG, independent tasks concurrently
+"""
+import asyncio
+import pathlib
+import time
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from .llm_gateway import LLMGateway
+from ..event_log import log_event
+
+AGENTS_DIR = pathlib.Path(__file__).resolve().parents[3] / "agents"
+
+
+class CrewAgent:
+    def __init__(self, id: str, role: str, goal: str, llm: str, system_prompt: str = "",
+                 tools: Optional[List[str]] = None):
+        self.id = id
+        self.role = role
+        self.goal = goal
+        self.llm = llm
+        self.system_prompt = system_prompt
+        self.tools = tools or []
+
+
+class CrewTask:
+    def __init__(self, id: str, description: str, agent: str, next: Optional[List[str]] = None):
+        self.id = id
+        self.description = description
+        self.agent = agent
+        self.next = next or []
+        self.upstream: List[str] = []
+
+
+class TaskRun:
+    """Outcome of one task: status is ok, failed, or skipped when an upstream task failed"""
+
+    def __init__(self, task_id: str, agent: str):
+        self.task_id = task_id
+        self.agent = agent
+        self.status = "pending"
+        self.output: Optional[str] = None
+        self.error: Optional[str] = None
+        self.started_ms: Optional[float] = None  # offset from the start of the run
+        self.latency_ms: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "task_id": self.task_id,
+            "agent": self.agent,
+            "status": self.status,
+            "output": self.output,
+            "error": self.error,
+            "started_ms": self.started_ms,
+            "latency_ms": self.latency_ms,
+        }
+
+
+class CrewRun:
+    def __init__(self, tasks: Dict[str, TaskRun], latency_ms: float):
+        self.tasks = tasks
+        self.latency_ms = latency_ms
+
+    @property
+    def ok(self) -> bool:
+        return all(run.status == "ok" for run in self.tasks.values())
+
+    @property
+    def outputs(self) -> Dict[str, Optional[str]]:
+        return {task_id: run.output for task_id, run in self.tasks.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "latency_ms": self.latency_ms,
+            # What the same tasks would have taken back to back
+            "serial_ms": round(sum(run.latency_ms or 0.0 for run in self.tasks.values()), 3),
+            "tasks": [run.to_dict() for run in self.tasks.values()],
+        }
+
+
+class Crew:
+    """Agents and tasks from crew.yaml. A task's `next` list names the tasks that consume
+    its output; tasks with no upstream start immediately.
+
+    process: dag runs every ready task at once, up to max_concurrency; process:
+    sequential runs the same DAG one task at a time.
+    """
+
+    def __init__(self, agents: Dict[str, CrewAgent], tasks: Dict[str, CrewTask],
+                 process: str = "dag", max_concurrency: int = 2):
+        if process not in ("dag", "sequential"):
+            raise ValueError(f"Unknown crew process: {process}")
+        self.agents = agents
+        self.tasks = tasks
+        self.process = process
+        self.max_concurrency = max_concurrency
+
+        for task in tasks.values():
+            if task.agent not in agents:
+                raise ValueError(f"Task {task.id} uses unknown agent {task.agent}")
+            for downstream in task.next:
+                if downstream not in tasks:
+                    raise ValueError(f"Task {task.id} feeds unknown task {downstream}")
+                tasks[downstream].upstream.append(task.id)
+        self.order = self._topological_order()
+
+    @classmethod
+    def load(cls, path: Optional[pathlib.Path] = None, prompts_dir: Optional[pathlib.Path] = None) -> "Crew":
+        path = pathlib.Path(path or AGENTS_DIR / "crew.yaml")
+        prompts_dir = pathlib.Path(prompts_dir or path.parent / "prompts")
+        spec = yaml.safe_load(path.read_text()) or {}
+
+        agents = {}
+        for agent in spec.get("agents", []):
+            prompt = ""
+            if agent.get("prompt"):
+                prompt = (prompts_dir / f"{agent['prompt']}.system.md").read_text().strip()
+            agents[agent["id"]] = CrewAgent(
+                id=agent["id"], role=agent.get("role", agent["id"]), goal=agent.get("goal", ""),
+                llm=agent["llm"], system_prompt=prompt, tools=agent.get("tools"),
+            )
+        tasks = {
+            task["id"]: CrewTask(id=task["id"], description=task.get("description", ""),
+                                 agent=task["agent"], next=task.get("next"))
+            for task in spec.get("tasks", [])
+        }
+        return cls(agents, tasks, process=spec.get("process", "dag"),
+                   max_concurrency=spec.get("max_concurrency", 2))
+
+    def _topological_order(self) -> List[str]:
+        remaining = {task_id: len(task.upstream) for task_id, task in self.tasks.items()}
+        ready = [task_id for task_id, count in remaining.items() if count == 0]
+        order = []
+        while ready:
+            task_id = ready.pop(0)
+            order.append(task_id)
+            for downstream in self.tasks[task_id].next:
+                remaining[downstream] -= 1
+                if remaining[downstream] == 0:
+                    ready.append(downstream)
+        if len(order) != len(self.tasks):
+            cycle = sorted(set(self.tasks) - set(order))
+            raise ValueError(f"Crew tasks form a cycle: {', '.join(cycle)}")
+        return order
+
+    def system_prompt(self, agent: CrewAgent) -> str:
+        return f"You are the {agent.role}. Goal: {agent.goal}\n{agent.system_prompt}".strip()
+
+    def task_prompt(self, task: CrewTask, inputs: Dict[str, Any], outputs: Dict[str, Optional[str]]) -> str:
+        """Task description, then the run inputs, then each upstream task's output"""
+        parts = [f"Task: {task.description}"]
+        for name, value in inputs.items():
+            parts.append(f"## {name}\n{value}")
+        for upstream in task.upstream:
+            parts.append(f"## Output of {upstream}\n{outputs[upstream]}")
+        return "\n\n".join(parts)
+
+    async def run(self, gateway: LLMGateway, inputs: Optional[Dict[str, Any]] = None,
+                  max_concurrency: Optional[int] = None) -> CrewRun:
+        """Run every task once; a failed task skips everything downstream of it, not its siblings.
+
+        Calls go through `gateway`, so repeated prompts are cached and usage is
+        accounted per agent; FakeLLM makes a gateway that runs offline.
+        """
+        inputs = inputs or {}
+        limit = 1 if self.process == "sequential" else (max_concurrency or self.max_concurrency)
+        semaphore = asyncio.Semaphore(max(1, limit))
+        runs = {task_id: TaskRun(task_id, self.tasks[task_id].agent) for task_id in self.order}
+        outputs: Dict[str, Optional[str]] = {}
+        started = time.perf_counter()
+
+        async def execute(task: CrewTask) -> None:
+            run = runs[task.id]
+            if task.upstream:
+                await asyncio.gather(*(pending[upstream] for upstream in task.upstream))
+                if any(runs[upstream].status != "ok" for upstream in task.upstream):
+                    run.status = "skipped"
+                    return
+            agent = self.agents[task.agent]
+            async with semaphore:
+                task_started = time.perf_counter()
+                run.started_ms = round((task_started - started) * 1000, 3)
+                try:
+                    run.output = await gateway.complete(agent.llm, self.system_prompt(agent),
+                                                        self.task_prompt(task, inputs, outputs), agent=agent.id)
+                    outputs[task.id] = run.output
+                    run.status = "ok"
+                except Exception as e:
+                    run.status = "failed"
+                    run.error = f"{type(e).__name__}: {e}"
+                run.latency_ms = round((time.perf_counter() - task_started) * 1000, 3)
+
+        # Topological order guarantees every upstream future exists before its consumers
+        pending: Dict[str, asyncio.Task] = {}
+        for task_id in self.order:
+            pending[task_id] = asyncio.ensure_future(execute(self.tasks[task_id]))
+        await asyncio.gather(*pending.values())
+
+        result = CrewRun(runs, round((time.perf_counter() - started) * 1000, 3))
+        self.log_event({"type": "crew_run", **result.to_dict(), "tasks": [
+            {"task_id": run.task_id, "status": run.status, "latency_ms": run.latency_ms}
+            for run in runs.values()
+        ]})
+        return result
+
+    def log_event(self, event: Dict[str, Any]):
+        log_event(event, service="crew_runner")
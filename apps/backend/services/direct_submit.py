@@ -0,0 +1,170 @@
+"""
+Browser-free application submission for ATS forms that are a plain multipart POST
+"""
+import httpx
+import mimetypes
+import pathlib
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+from urllib.parse import urljoin
+from workers.autofill.ats_detector import ATSDetector, ATSType
+from workers.autofill.form_fields import FILE_KEYS, match_fields
+from workers.autofill.html_form import StaticForm, browser_required, parse_forms, pick_form, resolve_known
+from ..event_log import log_event
+
+FALSEY = {"", "false", "0", "no"}
+
+
+class DirectSubmitter:
+    """Fetch the application page, map fields with ATSDetector mappings and POST it ourselves"""
+
+    SUPPORTED = {ATSType.GREENHOUSE, ATSType.LEVER}
+
+    def __init__(self, detector: Optional[ATSDetector] = None, timeout: float = 20,
+                 user_agent: Optional[str] = None):
+        self.detector = detector or ATSDetector()
+        self.timeout = timeout
+        self.headers = {"User-Agent": user_agent} if user_agent else {}
+
+    async def submit(self, job_url: str, form_data: Dict[str, Any], ats_type: Optional[ATSType] = None,
+                     client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
+        """Submit over HTTP. Returns {"browser_required": reason} when the page needs a real browser."""
+        if client is not None:
+            return await self._submit(client, job_url, form_data, ats_type)
+        async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True, headers=self.headers) as owned_client:
+            return await self._submit(owned_client, job_url, form_data, ats_type)
+
+    async def _submit(self, client: httpx.AsyncClient, job_url: str, form_data: Dict[str, Any],
+                      ats_type: Optional[ATSType]) -> Dict[str, Any]:
+        response = await client.get(job_url)
+        if response.status_code >= 400:
+            return {"browser_required": f"form page returned HTTP {response.status_code}"}
+        html = response.text
+
+        ats_type = ats_type or self.detector.detect_from_url(job_url)
+        if ats_type == ATSType.UNKNOWN:
+            ats_type = self.detector.detect_from_content(html)
+        if ats_type not in self.SUPPORTED:
+            return {"browser_required": f"no direct path for {ats_type.value}"}
+
+        form = pick_form(parse_forms(html))
+        reason = browser_required(html, form, needs_upload=any(key in FILE_KEYS for key in form_data))
+        if reason:
+            return {"browser_required": reason}
+
+        fields = form.fields()
+        known = resolve_known(form, fields, self.detector.get_field_mappings(ats_type))
+        resolved, missing = match_fields(fields, form_data, known)
+        data, files, filled_fields, errors = build_payload(form, resolved, form_data)
+        errors = [f"Could not find field: {field_name}" for field_name in missing] + errors
+
+        if errors:
+            # Never send a half-filled application; the browser path can't do better
+            return {
+                "success": False,
+                "submitted": False,
+                "method": "http",
+                "filled_fields": filled_fields,
+                "errors": errors,
+                "ats_type": ats_type.value,
+                "timestamp": datetime.utcnow().isoformat()
+            }
+
+        action = urljoin(str(response.url), form.action or str(response.url))
+        upload = [
+            (name, (pathlib.Path(path).name, pathlib.Path(path).read_bytes(),
+                    mimetypes.guess_type(path)[0] or "application/octet-stream"))
+            for name, path in files
+        ]
+        # httpx sends multipart when there are files and urlencoded otherwise; both parse the same server-side
+        posted = await client.post(action, data=data, files=upload or None,
+                                   headers={"Referer": str(response.url)})
+
+        result = {
+            "success": posted.status_code < 400,
+            "submitted": posted.status_code < 400,
+            "method": "http",
+            "status_code": posted.status_code,
+            "confirmation_url": str(posted.url),
+            "filled_fields": filled_fields,
+            "errors": [] if posted.status_code < 400 else [f"Submission rejected: HTTP {posted.status_code}"],
+            "ats_type": ats_type.value,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        self.log_event({"type": "ats_direct_submit", "job_url": job_url, "action": action,
+                        "status_code": posted.status_code, "fields": len(filled_fields)})
+        return result
+
+    def log_event(self, event: Dict[str, Any]):
+        log_event(event, service="ats_direct")
+
+
+def _select_value(control: Dict[str, Any], value: str) -> Optional[str]:
+    wanted = value.strip().lower()
+    for option in control["options"]:
+        if option["value"].strip().lower() == wanted or option["text"].strip().lower() == wanted:
+            return option["value"]
+    return None
+
+
+def build_payload(form: StaticForm, resolved: Dict[str, Dict[str, Any]], form_data: Dict[str, Any]
+                  ) -> Tuple[Dict[str, List[str]], List[Tuple[str, str]], List[str], List[str]]:
+    """What a browser would send: every successful control's default, then our values on top.
+
+    Returns (data, files, filled_fields, errors); `files` pairs a control name with a local path.
+    """
+    values: Dict[int, Optional[str]] = {}
+    for index, control in enumerate(form.controls):
+        if not control["name"] or control["disabled"] or control["type"] in ("submit", "button", "image", "reset", "file"):
+            continue
+        if control["type"] in ("checkbox", "radio"):
+            values[index] = control["value"] if control["checked"] else None
+        elif control["tag"] == "select":
+            chosen = next((o for o in control["options"] if o["selected"]), None)
+            chosen = chosen or (control["options"][0] if control["options"] else None)
+            values[index] = chosen["value"] if chosen else None
+        else:
+            values[index] = control["value"]
+
+    files, filled_fields, errors = [], [], []
+    for field_name, field in resolved.items():
+        control = form.controls[field["control"]]
+        value = form_data[field_name]
+        if control["type"] == "file":
+            if pathlib.Path(str(value)).exists():
+                files.append((control["name"], str(value)))
+                filled_fields.append(field_name)
+            else:
+                errors.append(f"File not found for {field_name}: {value}")
+            continue
+        if control["tag"] == "select":
+            option = _select_value(control, str(value))
+            if option is None:
+                errors.append(f"Error filling field {field_name}: no option matching {value}")
+                continue
+            values[field["control"]] = option
+        elif control["type"] in ("checkbox", "radio"):
+            checked = str(value).strip().lower() not in FALSEY
+            if control["type"] == "radio" and checked:
+                for index, other in enumerate(form.controls):
+                    if other["name"] == control["name"] and other["type"] == "radio":
+                        values[index] = None
+            values[field["control"]] = control["value"] if checked else None
+        else:
+            values[field["control"]] = str(value)
+        filled_fields.append(field_name)
+
+    data: Dict[str, List[str]] = {}
+    for index, value in values.items():
+        if value is not None:
+            data.setdefault(form.controls[index]["name"], []).append(value)
+
+    attached = {name for name, _ in files}
+    unfilled = []
+    for control in form.controls:
+        if control["required"] and control["name"] not in attached and not any(data.get(control["name"], [])):
+            label = control["label"] or control["name"]
+            if label not in unfilled:
+                unfilled.append(label)
+    errors += [f"Required field not filled: {label}" for label in unfilled]
+    return data, files, filled_fields, errors
@@ -0,0 +1,153 @@
+"""
+Learned per-domain/per-ATS form schemas so repeat applications skip field discovery
+"""
+import json
+import pathlib
+import sqlite3
+from contextlib import closing
+from typing import Dict, List, Optional, Any
+from datetime import datetime
+from urllib.parse import urlsplit
+from workers.autofill.ats_detector import ATSType
+from ..config.settings import settings
+from ..event_log import log_event
+
+# ATS hosts where the first path segment names the company board
+BOARD_PATH_ATS = {ATSType.GREENHOUSE, ATSType.LEVER, ATSType.ASHBY}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS forms (
+    key TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    fields TEXT NOT NULL,
+    unresolved TEXT NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0,
+    stale INTEGER NOT NULL DEFAULT 0,
+    learned_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+OUTCOME_COUNTERS = {"hit": "hits", "miss": "misses", "stale": "stale"}
+
+
+class FormSchemaCache:
+    """form key -> {fingerprint, fields: {form_data key: {selector, type}}, unresolved, hits, ...}
+
+    Rows live in SQLite and every write touches only its own form key, so the backend
+    and the autofill worker can share one cache without overwriting each other.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or settings.form_schema_cache_path
+        pathlib.Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @staticmethod
+    def _entry(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        entry = dict(row)
+        entry["fields"] = json.loads(entry["fields"])
+        entry["unresolved"] = json.loads(entry["unresolved"])
+        return entry
+
+    @staticmethod
+    def key_for(url: str, ats_type: ATSType) -> str:
+        """Workday tenants are per host; hosted boards are per company path"""
+        parts = urlsplit(url)
+        host = (parts.hostname or "").lower()
+        segments = [segment for segment in parts.path.split("/") if segment]
+        if ats_type in BOARD_PATH_ATS and segments:
+            return f"{ats_type.value}:{host}/{segments[0].lower()}"
+        return f"{ats_type.value}:{host}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with closing(self._connect()) as conn:
+            return self._entry(conn.execute("SELECT * FROM forms WHERE key = ?", (key,)).fetchone())
+
+    def plan(self, key: str, form_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Cached schema if it already knows where (or that nowhere) every key goes"""
+        entry = self.get(key)
+        if entry is None:
+            return None
+        known = set(entry["fields"]) | set(entry["unresolved"])
+        if not set(form_data) <= known:
+            return None
+        return entry
+
+    def learn(self, key: str, fingerprint: str, resolved: Dict[str, Dict[str, Any]],
+              missing: List[str]) -> None:
+        """Remember the stable selectors discovery produced for this form"""
+        with closing(self._connect()) as conn:
+            # Read-merge-write under the write lock so a concurrent learn isn't lost
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                entry = self._entry(conn.execute("SELECT * FROM forms WHERE key = ?", (key,)).fetchone())
+                fields, unresolved = {}, []
+                if entry is not None and entry["fingerprint"] == fingerprint:
+                    fields, unresolved = entry["fields"], entry["unresolved"]
+
+                for field_name, field in resolved.items():
+                    if field.get("stable"):
+                        fields[field_name] = {"selector": field["stable"], "type": field["type"]}
+                conn.execute(
+                    "INSERT INTO forms (key, fingerprint, fields, unresolved, learned_at) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET fingerprint = excluded.fingerprint, fields = excluded.fields, "
+                    "unresolved = excluded.unresolved, learned_at = excluded.learned_at",
+                    (key, fingerprint, json.dumps(fields), json.dumps(sorted(set(unresolved) | set(missing))),
+                     datetime.utcnow().isoformat()),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def invalidate(self, key: str) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM forms WHERE key = ?", (key,))
+
+    def record(self, key: str, outcome: str) -> None:
+        """Count a lookup outcome: hit | miss | stale"""
+        counter = OUTCOME_COUNTERS[outcome]
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT INTO counters (name, value) VALUES (?, 1) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+                (counter,),
+            )
+            conn.execute(f"UPDATE forms SET {counter} = {counter} + 1 WHERE key = ?", (key,))
+        self.log_event({"type": "form_schema_lookup", "key": key, "outcome": outcome})
+
+    def clear(self) -> None:
+        """Forget every learned form and reset the counters"""
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM forms")
+            conn.execute("DELETE FROM counters")
+
+    def stats(self) -> Dict[str, Any]:
+        with closing(self._connect()) as conn:
+            counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+            forms = conn.execute("SELECT key, hits, fields FROM forms").fetchall()
+        counters = {name: counters.get(name, 0) for name in OUTCOME_COUNTERS.values()}
+        lookups = sum(counters.values())
+        return {
+            **counters,
+            "entries": len(forms),
+            "hit_rate": counters["hits"] / lookups if lookups else 0.0,
+            "by_form": {row["key"]: {"hits": row["hits"], "fields": len(json.loads(row["fields"]))} for row in forms},
+        }
+
+    def log_event(self, event: Dict[str, Any]):
+        log_event(event, service="form_schema_cache")
@@ -0,0 +1,479 @@
+"""
+Local JD-resume matching: BM25-weighted term coverage over NumPy sparse vectors
+"""
+import hashlib
+import html
+import math
+import re
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+# Bump whenever tokenization, weighting or calibration changes what score() returns;
+# memoized match results are keyed on it
+SCORER_VERSION = "bm25-1"
+
+TAGS = re.compile(r"<[^>]+>")
+# (gap, token) pairs; keeps c++, c#, node.js, ci/cd and a/b as single tokens
+TOKEN = re.compile(r"([^a-z0-9]*)([a-z0-9][a-z0-9+#]*(?:[./-][a-z0-9+#]+)*)")
+
+STOPWORDS = frozenset("""
+a about above across after again all also am an and any are as at be been being both but by can
+could did do does doing during each etc for from further had has have having he her here his how
+i if in into is it its itself just may me more most must my no nor not of off on once only or other
+our ours out over own per same she should so some such than that the their them then there these
+they this those through to too under until up upon us very via was we were what when where which
+while who whom why will with within without would you your yours
+ability able candidate candidates company experience experienced including join looking new plus
+preferred related required requirement requirements responsibilities responsible role strong team
+teams work working year years senior junior
+""".split())
+
+# Spellings that should land on the same term
+SYNONYMS = {
+    "a/b": "ab",
+    "js": "javascript",
+    "ts": "typescript",
+    "k8s": "kubernetes",
+    "postgres": "postgresql",
+    "gcp": "google-cloud",
+    "pm": "product-manager",
+    "okrs": "okr",
+    "apis": "api",
+}
+
+# Resume section headers -> weight of a term mention inside that section.
+# Demonstrated use (experience, projects) counts more than a keyword list.
+SECTION_WEIGHTS = {
+    "experience": 1.0,
+    "projects": 0.9,
+    "other": 0.8,
+    "skills": 0.7,
+    "summary": 0.6,
+    "education": 0.5,
+}
+
+SECTION_HEADERS = {
+    "experience": ("experience", "work experience", "professional experience", "employment", "work history"),
+    "projects": ("projects", "selected projects", "key projects"),
+    "skills": ("skills", "technical skills", "core competencies", "tools", "technologies"),
+    "summary": ("summary", "profile", "objective", "about", "professional summary"),
+    "education": ("education", "certifications", "certificates", "education and certifications"),
+}
+HEADER_TO_SECTION = {header: section for section, headers in SECTION_HEADERS.items() for header in headers}
+
+
+def normalize_token(token: str) -> str:
+    """Synonyms, trailing punctuation and a light, conservative plural/tense stem"""
+    token = SYNONYMS.get(token, token).rstrip(".-/")
+    if not token.isalpha() or len(token) <= 3:
+        return token
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-3] + "y"
+    if token.endswith("ing") and len(token) > 5:
+        return token[:-3]
+    if token.endswith("ed") and len(token) > 4:
+        return token[:-2]
+    if token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+@lru_cache(maxsize=1 << 16)
+def _term(surface: str) -> Optional[Tuple[str, str]]:
+    """(term, display form) for a token, None for stopwords"""
+    if surface in STOPWORDS:
+        return None
+    term = normalize_token(surface)
+    if not term or term in STOPWORDS:
+        return None
+    return term, SYNONYMS.get(surface, surface).rstrip(".-/")
+
+
+def tokenize(text: str) -> List[List[Tuple[str, str]]]:
+    """(term, surface) pairs for content words, grouped into runs of adjacent words;
+    punctuation and stopwords end a run"""
+    text = TAGS.sub(" ", html.unescape(text or "")).lower()
+    runs, run = [], []
+    for gap, surface in TOKEN.findall(text):
+        pair = _term(surface)
+        if run and (pair is None or (gap and not gap.isspace())):
+            runs.append(run)
+            run = []
+        if pair is not None:
+            run.append(pair)
+    if run:
+        runs.append(run)
+    return runs
+
+
+def terms(text: str) -> List[Tuple[str, str]]:
+    """Unigrams plus bigrams within a run, so 'ab testing' and 'window functions' count as phrases"""
+    pairs = []
+    for run in tokenize(text):
+        pairs.extend(run)
+        pairs.extend(
+            (f"{left[0]} {right[0]}", f"{left[1]} {right[1]}")
+            for left, right in zip(run, run[1:])
+        )
+    return pairs
+
+
+def resume_sections(resume_text: str) -> List[Tuple[str, str]]:
+    """Split a plain-text resume into (section, text) blocks by header lines"""
+    blocks, section, lines = [], "other", []
+    for line in (resume_text or "").splitlines():
+        header = re.sub(r"[^a-z ]", "", line.lower()).strip()
+        if header in HEADER_TO_SECTION and len(line.strip()) <= 40:
+            if lines:
+                blocks.append((section, "\n".join(lines)))
+            section, lines = HEADER_TO_SECTION[header], []
+        else:
+            lines.append(line)
+    if lines:
+        blocks.append((section, "\n".join(lines)))
+    return blocks
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class SparseVector:
+    """Term ids (sorted, unique) and their weights"""
+
+    __slots__ = ("ids", "values")
+
+    def __init__(self, ids: np.ndarray, values: np.ndarray):
+        self.ids = ids
+        self.values = values
+
+    @classmethod
+    def from_weights(cls, weights: Dict[int, float]) -> "SparseVector":
+        ids = np.fromiter(weights.keys(), dtype=np.int64, count=len(weights))
+        values = np.fromiter(weights.values(), dtype=np.float64, count=len(weights))
+        order = np.argsort(ids)
+        return cls(ids[order], values[order])
+
+    def overlap(self, other: "SparseVector") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Shared ids and the matching weights on each side"""
+        shared, mine, theirs = np.intersect1d(self.ids, other.ids, assume_unique=True, return_indices=True)
+        return shared, self.values[mine], other.values[theirs]
+
+
+class ScratchTerms:
+    """Ids for terms the vocabulary has not seen, local to one scoring call.
+
+    They are negative so they never collide with vocabulary ids, and they are
+    dropped with the call, so scoring ad-hoc text never grows the vocabulary.
+    """
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.surfaces: List[str] = []
+
+    def id_for(self, term: str, surface: str) -> int:
+        term_id = self.ids.get(term)
+        if term_id is None:
+            self.surfaces.append(surface)
+            term_id = self.ids[term] = -len(self.surfaces)
+        return term_id
+
+
+class Vocabulary:
+    """term -> id, plus document frequencies over the JD corpus for IDF.
+
+    Only JD ingestion adds terms (id_for); everything else looks terms up. Writers
+    take the lock; readers don't, since a term is appended before its id is published.
+    """
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.terms: List[str] = []
+        self.surfaces: List[str] = []
+        self.df = np.zeros(1024, dtype=np.int64)
+        self.documents = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def id_for(self, term: str, surface: str) -> int:
+        term_id = self.ids.get(term)
+        if term_id is not None:
+            return term_id
+        with self._lock:
+            term_id = self.ids.get(term)
+            if term_id is None:
+                term_id = len(self.surfaces)
+                if term_id >= len(self.df):
+                    self.df = np.concatenate([self.df, np.zeros(len(self.df), dtype=np.int64)])
+                self.terms.append(term)
+                self.surfaces.append(surface)
+                self.ids[term] = term_id
+        return term_id
+
+    def lookup(self, term: str, surface: str, scratch: Optional[ScratchTerms] = None) -> Optional[int]:
+        """Id of a known term; unknown terms get a scratch id, or None without a scratch"""
+        term_id = self.ids.get(term)
+        if term_id is None and scratch is not None:
+            term_id = scratch.id_for(term, surface)
+        return term_id
+
+    def surface(self, term_id: int, scratch: Optional[ScratchTerms] = None) -> str:
+        return self.surfaces[term_id] if term_id >= 0 else scratch.surfaces[-term_id - 1]
+
+    def vector(self, weights: Dict[str, List[Any]], scratch: Optional[ScratchTerms] = None) -> SparseVector:
+        """SparseVector from a {term: [surface, weight]} mapping (the persisted form).
+        Terms the vocabulary doesn't know can't match any JD, so they are dropped
+        unless a scratch gives them call-local ids."""
+        vector: Dict[int, float] = {}
+        for term, (surface, weight) in weights.items():
+            term_id = self.lookup(term, surface, scratch)
+            if term_id is not None:
+                vector[term_id] = weight
+        return SparseVector.from_weights(vector)
+
+    def weights(self, vector: SparseVector) -> Dict[str, List[Any]]:
+        """Inverse of vector(): ids are process-local, terms are not"""
+        return {
+            self.terms[term_id]: [self.surfaces[term_id], value]
+            for term_id, value in zip(vector.ids.tolist(), vector.values.tolist())
+        }
+
+    def add_document(self, term_ids: Iterable[int]) -> None:
+        ids = np.fromiter(set(term_ids), dtype=np.int64)
+        with self._lock:
+            self.df[ids] += 1
+            self.documents += 1
+
+    def idf(self, ids: np.ndarray) -> np.ndarray:
+        """BM25 idf, always positive; with an empty corpus every term weighs the same.
+        Scratch (negative) ids have a document frequency of zero."""
+        df = self.df
+        n, df = self.documents, np.where(ids >= 0, df[np.maximum(ids, 0)], 0)
+        return np.log1p((n - df + 0.5) / (df + 0.5))
+
+
+class MatchResult:
+    def __init__(self, score: float, raw_score: float, contributions: List[Dict[str, Any]],
+                 missing: List[str], latency_ms: float):
+        self.score = score
+        self.raw_score = raw_score
+        self.contributions = contributions
+        self.missing = missing
+        self.latency_ms = latency_ms
+
+
+class JDMatcher:
+    """Scores how well a resume covers a JD without calling an LLM.
+
+    The JD becomes an idf * (1 + ln tf) query vector; the resume a vector of
+    BM25-saturated, section-weighted term frequencies in [0, 1]. The raw score is
+    the share of JD weight the resume covers, and each shared term's share is its
+    contribution. A logistic calibration maps raw coverage to the reported score.
+    """
+
+    def __init__(self, k1: float = 1.2, calibration: Tuple[float, float] = (7.0, -2.6),
+                 section_weights: Dict[str, float] = SECTION_WEIGHTS):
+        self.k1 = k1
+        self.calibration = calibration
+        self.section_weights = section_weights
+        self.vocabulary = Vocabulary()
+        self._seen_jds = set()
+        self._lock = threading.Lock()
+
+    def observe(self, jd_text: str) -> None:
+        """Count a JD towards document frequencies, once per distinct text"""
+        if not jd_text:
+            return
+        digest = text_digest(jd_text)
+        if digest not in self._seen_jds:
+            self.observe_counts(digest, self.jd_counts(jd_text))
+
+    def observe_counts(self, digest: str, counts: SparseVector) -> None:
+        """observe() for a JD that is already vectorized, keyed by its text_digest"""
+        with self._lock:
+            if digest in self._seen_jds:
+                return
+            self._seen_jds.add(digest)
+        self.vocabulary.add_document(counts.ids.tolist())
+
+    def fit(self, jd_texts: Iterable[str]) -> "JDMatcher":
+        for jd_text in jd_texts:
+            self.observe(jd_text)
+        return self
+
+    def jd_counts(self, jd_text: str, scratch: Optional[ScratchTerms] = None) -> SparseVector:
+        """Term counts for a JD. Without a scratch the JD is being ingested and its
+        terms join the vocabulary; with one, unseen terms stay call-local."""
+        counts: Dict[int, float] = {}
+        for (term, surface), count in Counter(terms(jd_text)).items():
+            if scratch is None:
+                term_id = self.vocabulary.id_for(term, surface)
+            else:
+                term_id = self.vocabulary.lookup(term, surface, scratch)
+            counts[term_id] = counts.get(term_id, 0.0) + count
+        return SparseVector.from_weights(counts)
+
+    def jd_vector(self, jd_text: str, scratch: Optional[ScratchTerms] = None) -> SparseVector:
+        vector = self.jd_counts(jd_text, scratch)
+        vector.values = (1.0 + np.log(vector.values)) * self.vocabulary.idf(vector.ids)
+        return vector
+
+    def resume_weights(self, resume_text: str) -> Dict[str, List[Any]]:
+        """{term: [surface, weight]} for every resume term, known to the vocabulary or not"""
+        counts: Dict[str, List[Any]] = {}
+        for section, text in resume_sections(resume_text):
+            weight = self.section_weights.get(section, self.section_weights["other"])
+            for (term, surface), count in Counter(terms(text)).items():
+                counts.setdefault(term, [surface, 0.0])[1] += weight * count
+        # BM25 saturation (b = 0: one resume, no length normalization), capped so one
+        # mention in experience fully covers a term and keyword lists cover it partially
+        for entry in counts.values():
+            entry[1] = min(1.0, entry[1] * (self.k1 + 1) / (entry[1] + self.k1))
+        return counts
+
+    def resume_vector(self, resume_text: str, scratch: Optional[ScratchTerms] = None) -> SparseVector:
+        """Resume terms are looked up, never added: only JDs grow the vocabulary"""
+        return self.vocabulary.vector(self.resume_weights(resume_text), scratch)
+
+    def calibrated(self, raw: float) -> float:
+        slope, intercept = self.calibration
+        return 1.0 / (1.0 + math.exp(-(slope * raw + intercept)))
+
+    def calibrated_many(self, raw: np.ndarray) -> np.ndarray:
+        slope, intercept = self.calibration
+        return 1.0 / (1.0 + np.exp(-(slope * raw + intercept)))
+
+    def calibrate(self, raw_scores: List[float], outcomes: List[int], iterations: int = 25) -> Tuple[float, float]:
+        """Refit the logistic calibration (Newton's method) from raw scores and 0/1
+        outcomes, e.g. whether an application got a screen"""
+        x = np.column_stack([np.asarray(raw_scores, dtype=np.float64), np.ones(len(raw_scores))])
+        y = np.asarray(outcomes, dtype=np.float64)
+        theta = np.array(self.calibration, dtype=np.float64)
+        for _ in range(iterations):
+            p = 1.0 / (1.0 + np.exp(-x @ theta))
+            hessian = (x * (p * (1 - p))[:, None]).T @ x + 1e-6 * np.eye(2)
+            theta -= np.linalg.solve(hessian, x.T @ (p - y))
+        self.calibration = (float(theta[0]), float(theta[1]))
+        return self.calibration
+
+    def score(self, resume_text: str, jd_text: str, top_k: int = 15, missing_k: int = 8) -> MatchResult:
+        started = time.perf_counter()
+        scratch = ScratchTerms()
+        query = self.jd_vector(jd_text, scratch)
+        resume = self.resume_vector(resume_text, scratch)
+
+        total = float(query.values.sum())
+        shared, jd_weights, resume_weights = query.overlap(resume)
+        products = jd_weights * resume_weights / total if total else jd_weights * 0.0
+        raw = float(products.sum())
+
+        def surface(term_id: int) -> str:
+            return self.vocabulary.surface(term_id, scratch)
+
+        top = np.argsort(-products)[:top_k]
+        contributions = [
+            {
+                "term": surface(int(shared[i])),
+                "jd_weight": round(float(jd_weights[i]), 4),
+                "resume_weight": round(float(resume_weights[i]), 4),
+                "contribution": round(float(products[i]), 4),
+            }
+            for i in top if products[i] > 0
+        ]
+
+        uncovered = ~np.isin(query.ids, shared, assume_unique=True)
+        gaps = sorted(
+            zip(query.values[uncovered].tolist(), query.ids[uncovered].tolist()),
+            key=lambda gap: (-gap[0], -surface(gap[1]).count(" ")),
+        )
+        missing, listed = [], set()
+        for _, term_id in gaps:
+            if len(missing) == missing_k:
+                break
+            words = surface(term_id).split()
+            # A phrase and its own words are the same gap; list the phrase on a tie
+            if not listed.issuperset(words):
+                missing.append(surface(term_id))
+                listed.update(words)
+
+        return MatchResult(
+            score=round(self.calibrated(raw), 4),
+            raw_score=round(raw, 4),
+            contributions=contributions,
+            missing=missing,
+            latency_ms=round((time.perf_counter() - started) * 1000, 3),
+        )
+
+    def score_many(self, resume: Union[str, Dict[str, List[Any]], SparseVector], jds: Iterable[Tuple[Any, str]],
+                   top_k: int = 20, chunk_size: int = 2048) -> Tuple[List[Tuple[Any, float, float]], int]:
+        """Rank (key, jd_text) pairs against one resume: its text, its resume_weights(),
+        or a precomputed resume_vector.
+
+        JDs are vectorized a chunk at a time into a CSR term matrix and scored with
+        one sparse matrix-vector product per chunk, keeping only the running top-k,
+        so memory is bounded by `chunk_size` however many JDs stream through.
+        Returns ([(key, score, raw_score)] best first, number of JDs scored).
+
+        Neither the resume nor the JDs add terms to the vocabulary. A resume vector
+        only holds terms some ingested JD has, so pass text or weights when the JDs
+        may share terms nothing in the corpus has.
+        """
+        scratch = ScratchTerms()
+        if isinstance(resume, str):
+            resume = self.resume_weights(resume)
+        if isinstance(resume, dict):
+            resume = self.vocabulary.vector(resume, scratch)
+        best_keys: List[Any] = []
+        best_raw = np.empty(0, dtype=np.float64)
+        scored = 0
+
+        chunk: List[Tuple[Any, str]] = []
+        for item in jds:
+            chunk.append(item)
+            if len(chunk) == chunk_size:
+                best_keys, best_raw = self._merge_top(resume, chunk, best_keys, best_raw, top_k, scratch)
+                scored += len(chunk)
+                chunk = []
+        if chunk:
+            best_keys, best_raw = self._merge_top(resume, chunk, best_keys, best_raw, top_k, scratch)
+            scored += len(chunk)
+
+        order = np.argsort(-best_raw, kind="stable")
+        scores = self.calibrated_many(best_raw)
+        return [(best_keys[i], round(float(scores[i]), 4), round(float(best_raw[i]), 4)) for i in order], scored
+
+    def _merge_top(self, resume: SparseVector, chunk: List[Tuple[Any, str]], best_keys: List[Any],
+                   best_raw: np.ndarray, top_k: int, scratch: ScratchTerms) -> Tuple[List[Any], np.ndarray]:
+        rows = [self.jd_counts(jd_text, scratch) for _, jd_text in chunk]
+        lengths = np.fromiter((len(row.ids) for row in rows), dtype=np.int64, count=len(rows))
+        indices = np.concatenate([row.ids for row in rows]) if rows else np.empty(0, dtype=np.int64)
+        counts = np.concatenate([row.values for row in rows]) if rows else np.empty(0)
+        row_of = np.repeat(np.arange(len(rows)), lengths)
+
+        data = (1.0 + np.log(counts)) * self.vocabulary.idf(indices)
+        # The resume's weight for each JD term (resume ids are sorted; scratch ids are negative)
+        at = np.minimum(np.searchsorted(resume.ids, indices), max(len(resume.ids) - 1, 0))
+        resume_weights = (np.where(resume.ids[at] == indices, resume.values[at], 0.0)
+                          if len(resume.ids) else np.zeros(len(indices)))
+
+        covered = np.bincount(row_of, weights=data * resume_weights, minlength=len(rows))
+        totals = np.bincount(row_of, weights=data, minlength=len(rows))
+        raw = covered / np.where(totals > 0, totals, 1.0)
+
+        keys = best_keys + [key for key, _ in chunk]
+        raw = np.concatenate([best_raw, raw])
+        if len(raw) > top_k:
+            keep = np.argpartition(-raw, top_k - 1)[:top_k] if top_k > 0 else np.empty(0, dtype=np.int64)
+            return [keys[i] for i in keep], raw[keep]
+        return keys, raw
+
+
+# Global matcher instance; document frequencies are fed by job ingestion
+jd_matcher = JDMatcher()
@@ -0,0 +1,268 @@
+"""
+Persistent JD inverted index and per-track resume vectors, so ranking jobs for a
+resume track is a top-k index query instead of re-tokenizing every JD and resume
+"""
+import array
+import json
+import pathlib
+import sqlite3
+import time
+from contextlib import closing
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..config.settings import settings
+from .jd_matcher import JDMatcher, SparseVector, jd_matcher, text_digest
+from ..event_log import log_event
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY,
+    term TEXT NOT NULL UNIQUE,
+    surface TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jds (
+    job_id TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    term_ids BLOB NOT NULL,
+    counts BLOB NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS resume_vectors (
+    track TEXT PRIMARY KEY,
+    resume_id TEXT NOT NULL,
+    weights TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class JDVectorIndex:
+    """Term counts for every job's JD, with in-memory posting lists per term.
+
+    Each JD is stored once in SQLite as packed int64 term ids and float64 counts
+    (ids refer to the `terms` table, since vocabulary ids are process-local), so
+    loading rebuilds the postings without tokenizing anything. Postings hold
+    1 + ln(tf); idf is applied at query time, so JDs ingested later never leave
+    earlier postings stale. Removed or re-ingested jobs leave a dead slot in
+    memory until the next load.
+    """
+
+    def __init__(self, matcher: JDMatcher, path: str):
+        self.matcher = matcher
+        self.path = path
+        self.slots: Dict[str, int] = {}
+        self.job_ids: List[str] = []
+        self.digests: List[str] = []
+        self.rows: List[Optional[SparseVector]] = []
+        self.postings: Dict[int, Tuple[array.array, array.array]] = {}
+        self._stored_ids: Dict[int, int] = {}  # vocabulary id -> terms.id
+        self._totals = np.zeros(0)
+        self._totals_key: Optional[Tuple[int, int]] = None
+        # track -> (resume_id, vector, resume weights, vocabulary size the vector was built at)
+        self.track_vectors: Dict[str, Tuple[str, Optional[SparseVector], Dict[str, List[Any]], int]] = {}
+
+        pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+        self._load()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _load(self) -> None:
+        """Rebuild the in-memory postings and the matcher's document frequencies from disk"""
+        vocabulary = self.matcher.vocabulary
+        with closing(self._connect()) as conn, conn:
+            terms = conn.execute("SELECT id, term, surface FROM terms ORDER BY id").fetchall()
+            jds = conn.execute("SELECT job_id, digest, term_ids, counts FROM jds").fetchall()
+        local = np.zeros(terms[-1]["id"] + 1 if terms else 0, dtype=np.int64)
+        for row in terms:
+            local[row["id"]] = vocabulary.id_for(row["term"], row["surface"])
+            self._stored_ids[int(local[row["id"]])] = row["id"]
+        for row in jds:
+            ids = local[np.frombuffer(row["term_ids"], dtype=np.int64)]
+            order = np.argsort(ids)
+            counts = SparseVector(ids[order], np.frombuffer(row["counts"], dtype=np.float64)[order])
+            self.matcher.observe_counts(row["digest"], counts)
+            self._insert(row["job_id"], row["digest"], counts)
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self.slots
+
+    def _insert(self, job_id: str, digest: str, counts: SparseVector) -> None:
+        slot = len(self.job_ids)
+        self.slots[job_id] = slot
+        self.job_ids.append(job_id)
+        self.digests.append(digest)
+        row = SparseVector(counts.ids, 1.0 + np.log(counts.values))
+        self.rows.append(row)
+        for term_id, weight in zip(row.ids.tolist(), row.values.tolist()):
+            posting = self.postings.get(term_id)
+            if posting is None:
+                posting = self.postings[term_id] = (array.array("q"), array.array("d"))
+            posting[0].append(slot)
+            posting[1].append(weight)
+        self._totals_key = None
+
+    def _drop(self, job_id: str) -> None:
+        slot = self.slots.pop(job_id, None)
+        if slot is not None:
+            self.rows[slot] = None
+            self._totals_key = None
+
+    def add(self, job_id: str, jd_text: str) -> bool:
+        """Index (or re-index) a job's JD; returns False when it was already indexed unchanged"""
+        return self.add_many([(job_id, jd_text)]) == 1
+
+    def add_many(self, jds: Iterable[Tuple[str, str]]) -> int:
+        """add() for a batch of (job_id, jd_text), written in one transaction; returns how many changed"""
+        changed = []
+        for job_id, jd_text in jds:
+            digest = text_digest(jd_text)
+            slot = self.slots.get(job_id)
+            if slot is not None and self.digests[slot] == digest:
+                continue
+            counts = self.matcher.jd_counts(jd_text)
+            self.matcher.observe_counts(digest, counts)
+            self._drop(job_id)
+            self._insert(job_id, digest, counts)
+            changed.append((job_id, digest, counts))
+        if not changed:
+            return 0
+
+        vocabulary = self.matcher.vocabulary
+        new_terms = []
+        rows = []
+        for job_id, digest, counts in changed:
+            for term_id in counts.ids.tolist():
+                if term_id not in self._stored_ids:
+                    self._stored_ids[term_id] = len(self._stored_ids)
+                    new_terms.append((self._stored_ids[term_id], vocabulary.terms[term_id], vocabulary.surfaces[term_id]))
+            stored = np.fromiter((self._stored_ids[term_id] for term_id in counts.ids.tolist()),
+                                 dtype=np.int64, count=len(counts.ids))
+            rows.append((job_id, digest, stored.tobytes(), counts.values.astype(np.float64).tobytes(), time.time()))
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("INSERT INTO terms (id, term, surface) VALUES (?, ?, ?)", new_terms)
+            conn.executemany(
+                "INSERT OR REPLACE INTO jds (job_id, digest, term_ids, counts, updated_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(changed)
+
+    def remove(self, job_id: str) -> None:
+        if job_id not in self.slots:
+            return
+        self._drop(job_id)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM jds WHERE job_id = ?", (job_id,))
+
+    def sync(self, jobs: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+        """Bring the index in line with the job store: only new or edited JDs are tokenized"""
+        added = self.add_many((job_id, job["jd_text"]) for job_id, job in jobs.items() if job.get("jd_text"))
+        stale = [job_id for job_id in self.slots if not (jobs.get(job_id) or {}).get("jd_text")]
+        for job_id in stale:
+            self.remove(job_id)
+        summary = {"indexed": len(self.slots), "added": added, "removed": len(stale)}
+        self.log_event({"type": "jd_vectors_synced", **summary})
+        return summary
+
+    def _jd_totals(self) -> np.ndarray:
+        """Σ idf * (1 + ln tf) per slot: the denominator of every JD's coverage score"""
+        key = (self.matcher.vocabulary.documents, len(self.job_ids))
+        if self._totals_key != key:
+            live = [(slot, row) for slot, row in enumerate(self.rows) if row is not None]
+            ids = np.concatenate([row.ids for _, row in live]) if live else np.empty(0, dtype=np.int64)
+            values = np.concatenate([row.values for _, row in live]) if live else np.empty(0)
+            slot_of = np.repeat([slot for slot, _ in live], [len(row.ids) for _, row in live]).astype(np.int64)
+            self._totals = np.bincount(slot_of, weights=values * self.matcher.vocabulary.idf(ids),
+                                       minlength=len(self.job_ids))
+            self._totals_key = key
+        return self._totals
+
+    def query(self, resume: SparseVector, top_k: int = 20,
+              candidates: Optional[Iterable[str]] = None) -> List[Tuple[str, float, float]]:
+        """Best-covered indexed JDs for a resume vector: [(job_id, score, raw_score)], best first.
+
+        Only the postings of the resume's own terms are touched; `candidates` limits
+        the ranking to those job ids.
+        """
+        count = len(self.job_ids)
+        covered = np.zeros(count)
+        weights = resume.values * self.matcher.vocabulary.idf(resume.ids)
+        for term_id, weight in zip(resume.ids.tolist(), weights.tolist()):
+            posting = self.postings.get(term_id)
+            if posting is not None:
+                covered[np.frombuffer(posting[0], dtype=np.int64)] += weight * np.frombuffer(posting[1])
+
+        eligible = np.zeros(count, dtype=bool)
+        pool = self.slots if candidates is None else candidates
+        eligible[[self.slots[job_id] for job_id in pool if job_id in self.slots]] = True
+
+        totals = self._jd_totals()
+        raw = np.where(eligible, covered / np.where(totals > 0, totals, 1.0), -1.0)
+        k = min(max(top_k, 0), int(eligible.sum()))
+        if k == 0:
+            return []
+        best = np.argpartition(-raw, k - 1)[:k]
+        best = best[np.argsort(-raw[best], kind="stable")]
+        scores = self.matcher.calibrated_many(raw[best])
+        return [
+            (self.job_ids[slot], round(float(score), 4), round(float(raw[slot]), 4))
+            for slot, score in zip(best.tolist(), scores.tolist())
+        ]
+
+    def track_weights(self, track: str, resume_id: str, load_text: Callable[[], str]) -> Dict[str, List[Any]]:
+        """Every term of a track's default resume as {term: [surface, weight]}, computed once
+        per resume_id and persisted; `load_text` is only called when nothing valid is stored"""
+        cached = self.track_vectors.get(track)
+        if cached is not None and cached[0] == resume_id:
+            return cached[2]
+
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT resume_id, weights FROM resume_vectors WHERE track = ?", (track,)).fetchone()
+        if row is not None and row["resume_id"] == resume_id:
+            weights = json.loads(row["weights"])
+        else:
+            weights = self.matcher.resume_weights(load_text())
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO resume_vectors (track, resume_id, weights, updated_at) VALUES (?, ?, ?, ?)",
+                    (track, resume_id, json.dumps(weights), time.time()),
+                )
+            self.log_event({"type": "resume_vector_built", "track": track, "resume_id": resume_id,
+                            "terms": len(weights)})
+        self.track_vectors[track] = (resume_id, None, weights, -1)
+        return weights
+
+    def track_vector(self, track: str, resume_id: str, load_text: Callable[[], str]) -> SparseVector:
+        """The resume vector for a track's default resume. It only holds terms the
+        vocabulary knows, so it is rebuilt from track_weights() once newer JDs add terms."""
+        weights = self.track_weights(track, resume_id, load_text)
+        _, vector, _, size = self.track_vectors[track]
+        if size != len(self.matcher.vocabulary):
+            size = len(self.matcher.vocabulary)
+            vector = self.matcher.vocabulary.vector(weights)
+            self.track_vectors[track] = (resume_id, vector, weights, size)
+        return vector
+
+    def invalidate_track(self, track: str) -> None:
+        """Forget a track's resume vector; called when its default resume changes"""
+        self.track_vectors.pop(track, None)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM resume_vectors WHERE track = ?", (track,))
+
+    def log_event(self, event: Dict[str, Any]):
+        log_event(event, service="jd_vectors")
+
+
+# Global index over the shared matcher's vocabulary; synced with jobs_db at startup
+jd_vector_index = JDVectorIndex(jd_matcher, settings.jd_vectors_path)
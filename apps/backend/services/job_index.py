@@ -0,0 +1,152 @@
+"""
+Canonical job URLs and an O(1) canonical URL -> job index for dedupe
+"""
+import re
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit, urlunsplit
+from workers.autofill.ats_detector import ATSDetector, ATSType
+from workers.crawler.frontier import canonicalize_url
+
+# Wrapper links that carry the real destination in a query parameter:
+# host -> (path prefix, candidate parameter names)
+REDIRECTORS = {
+    "google.com": ("/url", ("q", "url")),
+    "l.facebook.com": ("/l.php", ("u",)),
+    "lm.facebook.com": ("/l.php", ("u",)),
+    "linkedin.com": ("/redir/redirect", ("url",)),
+    "safelinks.protection.outlook.com": ("/", ("url",)),
+}
+
+LINKEDIN_JOB_ID = re.compile(r"/jobs/view/(?:[^/]*?-)?(\d+)")
+WORKDAY_LOCALE = re.compile(r"^[a-z]{2}-[A-Z]{2}$")
+
+detector = ATSDetector()
+
+
+def _unwrap_redirect(url: str) -> str:
+    """Follow wrapper links (Google, Facebook, Outlook safelinks...) without a network call"""
+    for _ in range(3):
+        parts = urlsplit(url)
+        host = (parts.hostname or "").lower()
+        if host.startswith("www."):
+            host = host[4:]
+        if host.endswith(".safelinks.protection.outlook.com"):
+            host = "safelinks.protection.outlook.com"
+
+        rule = REDIRECTORS.get(host)
+        if not rule or not parts.path.startswith(rule[0]):
+            return url
+        params = rule[1]
+
+        query = parse_qs(parts.query)
+        target = next((query[name][0] for name in params if name in query), None)
+        if not target or not target.startswith(("http://", "https://")):
+            return url
+        url = target
+    return url
+
+
+def _segments(path: str) -> list:
+    return [segment for segment in path.split("/") if segment]
+
+
+def _normalize_ats(url: str, ats_type: ATSType) -> str:
+    parts = urlsplit(url)
+    host = parts.netloc
+    segments = _segments(parts.path)
+    query = parse_qs(parts.query)
+
+    if ats_type == ATSType.GREENHOUSE:
+        # boards.greenhouse.io/embed/job_app?for=acme&token=123 and
+        # job-boards.greenhouse.io/acme/jobs/123 both mean boards.greenhouse.io/acme/jobs/123
+        if "for" in query and "token" in query:
+            return f"https://boards.greenhouse.io/{query['for'][0]}/jobs/{query['token'][0]}"
+        if len(segments) >= 3 and segments[1] == "jobs":
+            return f"https://boards.greenhouse.io/{segments[0]}/jobs/{segments[2]}"
+
+    elif ats_type == ATSType.LEVER:
+        # jobs.lever.co/acme/<uuid>/apply -> jobs.lever.co/acme/<uuid>
+        if len(segments) >= 2:
+            return f"https://jobs.lever.co/{segments[0]}/{segments[1]}"
+
+    elif ats_type == ATSType.ASHBY:
+        # jobs.ashbyhq.com/acme/<uuid>/application -> jobs.ashbyhq.com/acme/<uuid>
+        if len(segments) >= 2:
+            return f"https://jobs.ashbyhq.com/{segments[0]}/{segments[1]}"
+
+    elif ats_type == ATSType.WORKDAY:
+        # acme.wd5.myworkdayjobs.com/en-US/Careers/job/Remote/PM_R123/apply
+        segments = [s for s in segments if not WORKDAY_LOCALE.match(s)]
+        if segments and segments[-1] in ("apply", "login"):
+            segments = segments[:-1]
+        return urlunsplit(("https", host, "/" + "/".join(segments), "", ""))
+
+    return url
+
+
+def canonicalize_job_url(url: str) -> str:
+    """Canonical form of a jd_url: same posting -> same string, whatever the source"""
+    url = canonicalize_url(_unwrap_redirect(url.strip()))
+    parts = urlsplit(url)
+    host = parts.netloc
+    query = parse_qs(parts.query)
+
+    if host.endswith("linkedin.com"):
+        match = LINKEDIN_JOB_ID.search(parts.path)
+        job_id = match.group(1) if match else (query.get("currentJobId") or [None])[0]
+        if job_id:
+            return f"https://linkedin.com/jobs/view/{job_id}"
+
+    if host.endswith("indeed.com") and "jk" in query:
+        return f"https://indeed.com/viewjob?jk={query['jk'][0]}"
+
+    # Company career pages that embed a Greenhouse board keep only the job id
+    if "gh_jid" in query and detector.detect_from_url(url) != ATSType.GREENHOUSE:
+        return urlunsplit((parts.scheme, host, parts.path, f"gh_jid={query['gh_jid'][0]}", ""))
+
+    ats_type = detector.detect_from_url(url)
+    if ats_type != ATSType.UNKNOWN:
+        return _normalize_ats(url, ats_type)
+
+    return url
+
+
+class JobIndex:
+    """Hash index from canonical jd_url to the job_id that first claimed it.
+
+    Later jobs with the same posting are kept behind the owner, so deleting the
+    owner hands the URL to the oldest surviving duplicate instead of forgetting it.
+    """
+
+    def __init__(self):
+        self._by_url: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_url)
+
+    @classmethod
+    def from_jobs(cls, jobs: Dict[str, Dict[str, Any]]) -> "JobIndex":
+        index = cls()
+        for job_id, job in jobs.items():
+            index.add(job_id, job["jd_url"])
+        return index
+
+    def lookup(self, jd_url: str) -> Optional[str]:
+        """job_id already holding this posting, if any"""
+        claims = self._by_url.get(canonicalize_job_url(jd_url))
+        return claims[0] if claims else None
+
+    def add(self, job_id: str, jd_url: str) -> Optional[str]:
+        """Claim the canonical URL for job_id; returns the existing owner if it was taken"""
+        claims = self._by_url.setdefault(canonicalize_job_url(jd_url), [])
+        if job_id not in claims:
+            claims.append(job_id)
+        return None if claims[0] == job_id else claims[0]
+
+    def remove(self, job_id: str, jd_url: str) -> None:
+        key = canonicalize_job_url(jd_url)
+        claims = self._by_url.get(key)
+        if claims and job_id in claims:
+            claims.remove(job_id)
+            if not claims:
+                del self._by_url[key]
@@ -2,10 +2,54 @@
 LinkedIn automation using Playwright (no OAuth required)
 """
 import asyncio
+import os
+import pathlib
+import time
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from playwright.async_api import async_playwright
 from ..config.settings import settings
+from .page_profile import PageProfile, ResourcePolicy
+from ..event_log import log_event
+
+# Scrolls the results list until `limit` cards are attached (or no new cards show
+# up for idleMs), then returns every card as a plain object: one driver round trip.
+EXTRACT_CARDS_JS = """
+async ({limit, idleMs, maxRounds}) => {
+  const cards = () => document.querySelectorAll('[data-job-id]');
+  const list = document.querySelector('.jobs-search-results-list, .scaffold-layout__list')
+    || document.scrollingElement;
+  const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+  for (let round = 0; cards().length < limit && round < maxRounds; round++) {
+    const before = cards().length;
+    if (before) cards()[before - 1].scrollIntoView({block: 'end'});
+    list.scrollTop = list.scrollHeight;
+    window.scrollTo(0, document.body.scrollHeight);
+    const deadline = Date.now() + idleMs;
+    while (cards().length === before && Date.now() < deadline) await sleep(100);
+    if (cards().length === before) break;
+  }
+  const text = (el) => (el ? el.innerText || el.textContent : '').replace(/\\s+/g, ' ').trim();
+  const pick = (card, selectors) => {
+    for (const selector of selectors) {
+      const el = card.querySelector(selector);
+      if (el) return el;
+    }
+    return null;
+  };
+  return Array.from(cards()).slice(0, limit).map((card) => {
+    const link = pick(card, ['a[data-control-name="job_card_click"]', 'a.job-card-list__title',
+                             'a.job-card-container__link', 'a[href*="/jobs/view/"]']);
+    return {
+      job_id: card.getAttribute('data-job-id'),
+      title: text(link),
+      company: text(pick(card, ['.job-card-container__company-name', '.artdeco-entity-lockup__subtitle'])),
+      location: text(pick(card, ['.job-card-container__metadata-item', '.artdeco-entity-lockup__caption'])),
+      href: link ? link.getAttribute('href') : '',
+    };
+  });
+}
+"""
 
 
 class LinkedInPlaywrightService:
@@ -15,12 +59,101 @@ class LinkedInPlaywrightService:
         self.email = settings.linkedin_email
         self.password = settings.linkedin_password
         self.base_url = "https://www.linkedin.com"
+        self.resource_policy = ResourcePolicy.from_settings(settings)
+        self.storage_state_path = pathlib.Path(settings.linkedin_storage_state_path)
+        self.session_cookie = settings.linkedin_session_cookie
+        self.logins = 0
+    
+    def has_session(self) -> bool:
+        return self.storage_state_path.exists()
+    
+    def clear_session(self):
+        self.storage_state_path.unlink(missing_ok=True)
+    
+    async def save_session(self, context):
+        """Persist cookies and local storage so later calls skip the login flow"""
+        self.storage_state_path.parent.mkdir(parents=True, exist_ok=True)
+        await context.storage_state(path=str(self.storage_state_path))
+        # The file holds live auth cookies
+        os.chmod(self.storage_state_path, 0o600)
+    
+    async def _new_context(self, browser):
+        """New context carrying the saved session (or the configured li_at cookie)"""
+        if self.has_session():
+            try:
+                return await browser.new_context(storage_state=str(self.storage_state_path))
+            except Exception:
+                # Unreadable or corrupt state file; fall back to a fresh login
+                self.clear_session()
+        
+        context = await browser.new_context()
+        if self.session_cookie and not self.session_cookie.startswith("your_"):
+            await context.add_cookies([{
+                "name": "li_at",
+                "value": self.session_cookie,
+                "domain": ".linkedin.com",
+                "path": "/",
+                "secure": True,
+                "httpOnly": True
+            }])
+        return context
+    
+    @staticmethod
+    def session_cookie_valid(cookies: List[Dict[str, Any]], now: Optional[float] = None) -> bool:
+        """True if the li_at auth cookie is present and not past its expiry"""
+        now = time.time() if now is None else now
+        for cookie in cookies:
+            if cookie.get("name") == "li_at" and cookie.get("value"):
+                expires = cookie.get("expires", -1)
+                return expires == -1 or expires > now
+        return False
+    
+    @staticmethod
+    def on_login_wall(url: str) -> bool:
+        return any(marker in url for marker in ("/login", "/authwall", "/checkpoint", "/uas/"))
+    
+    async def ensure_session(self, context, page) -> bool:
+        """Reuse the saved session when its auth cookie is live, otherwise log in once and save it"""
+        if self.session_cookie_valid(await context.cookies(self.base_url)):
+            self.log_event({"type": "linkedin_session_reused"})
+            return True
+        return await self._login_and_save(context, page)
+    
+    async def _login_and_save(self, context, page) -> bool:
+        if not await self.login(page):
+            return False
+        await self.save_session(context)
+        self.logins += 1
+        self.log_event({"type": "linkedin_login"})
+        return True
+    
+    async def _goto_authenticated(self, context, page, profile, url: str, ready_selector: str,
+                                  timeout: int = 10000) -> bool:
+        """Navigate to url; if LinkedIn bounces us to a login wall the saved session
+        has expired, so log in again and retry once. Returns False if login fails."""
+        # Also stop waiting if a sign-in form shows up instead of the target
+        await profile.goto(page, url, ready_selector=f'{ready_selector}, input[name="session_key"]', timeout=timeout)
+        if not self.on_login_wall(page.url):
+            return True
+        
+        self.clear_session()
+        self.log_event({"type": "linkedin_session_expired"})
+        if not await self._login_and_save(context, page):
+            return False
+        await profile.goto(page, url, ready_selector=ready_selector, timeout=timeout)
+        return True
+    
+    async def _new_page(self, context):
+        """Open a page with images, fonts, media and trackers blocked"""
+        page = await context.new_page()
+        profile = await PageProfile(self.resource_policy).attach(page)
+        return page, profile
         
     async def login(self, page) -> bool:
         """Login to LinkedIn using credentials"""
         try:
-            await page.goto(f"{self.base_url}/login")
-            await page.wait_for_load_state('networkidle')
+            await page.goto(f"{self.base_url}/login", wait_until="domcontentloaded")
+            await page.wait_for_selector('input[name="session_key"]', timeout=10000)
             
             # Fill login form
             await page.fill('input[name="session_key"]', self.email)
@@ -46,55 +179,27 @@ class LinkedInPlaywrightService:
             async with async_playwright() as p:
                 # Launch browser
                 browser = await p.chromium.launch(headless=False)  # Set to True for headless
-                context = await browser.new_context()
-                page = await context.new_page()
+                context = await self._new_context(browser)
+                page, profile = await self._new_page(context)
                 
-                # Login
-                if not await self.login(page):
+                # Login only if there is no live saved session
+                if not await self.ensure_session(context, page):
                     return jobs
                 
-                # Navigate to jobs page
+                # Navigate to jobs page; ready as soon as the first job card is attached
                 jobs_url = f"{self.base_url}/jobs/search/?keywords={keywords}&location={location}"
-                await page.goto(jobs_url)
-                await page.wait_for_load_state('networkidle')
-                
-                # Wait for job listings to load
-                await page.wait_for_selector('[data-job-id]', timeout=10000)
-                
-                # Extract job information
-                job_elements = await page.query_selector_all('[data-job-id]')
-                
-                for i, job_element in enumerate(job_elements[:limit]):
-                    try:
-                        # Extract job details
-                        title_element = await job_element.query_selector('a[data-control-name="job_card_click"]')
-                        company_element = await job_element.query_selector('.job-card-container__company-name')
-                        location_element = await job_element.query_selector('.job-card-container__metadata-item')
-                        
-                        title = await title_element.inner_text() if title_element else "N/A"
-                        company = await company_element.inner_text() if company_element else "N/A"
-                        location_text = await location_element.inner_text() if location_element else "N/A"
-                        
-                        # Get job URL
-                        job_url = await title_element.get_attribute('href') if title_element else ""
-                        if job_url and not job_url.startswith('http'):
-                            job_url = f"{self.base_url}{job_url}"
-                        
-                        jobs.append({
-                            "id": f"linkedin_{i}",
-                            "title": title.strip(),
-                            "company": company.strip(),
-                            "location": location_text.strip(),
-                            "url": job_url,
-                            "description": "Job description available on LinkedIn",
-                            "posted_date": datetime.utcnow().isoformat(),
-                            "source": "LinkedIn"
-                        })
-                        
-                    except Exception as e:
-                        print(f"Error extracting job {i}: {e}")
-                        continue
+                if not await self._goto_authenticated(context, page, profile, jobs_url, '[data-job-id]'):
+                    return jobs
+                
+                # Scroll and extract every card in a single round trip
+                cards = await page.evaluate(EXTRACT_CARDS_JS, {"limit": limit, "idleMs": 3000, "maxRounds": 20})
+                jobs = self.cards_to_jobs(cards)
                 
+                self.log_event({
+                    "type": "linkedin_search_page",
+                    "cards": len(jobs),
+                    "page_profile": await profile.finish(page)
+                })
                 await browser.close()
                 
         except Exception as e:
@@ -102,21 +207,41 @@ class LinkedInPlaywrightService:
             
         return jobs
     
+    def cards_to_jobs(self, cards: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Shape raw card objects from EXTRACT_CARDS_JS into job dicts"""
+        jobs = []
+        for i, card in enumerate(cards):
+            job_url = card.get("href") or ""
+            if job_url and not job_url.startswith('http'):
+                job_url = f"{self.base_url}{job_url}"
+            
+            jobs.append({
+                "id": f"linkedin_{card.get('job_id') or i}",
+                "title": card.get("title") or "N/A",
+                "company": card.get("company") or "N/A",
+                "location": card.get("location") or "N/A",
+                "url": job_url,
+                "description": "Job description available on LinkedIn",
+                "posted_date": datetime.utcnow().isoformat(),
+                "source": "LinkedIn"
+            })
+        return jobs
+    
     async def apply_to_job(self, job_url: str, resume_path: str, cover_letter: str = "") -> Dict[str, Any]:
         """Apply to a job on LinkedIn (requires Easy Apply)"""
         try:
             async with async_playwright() as p:
                 browser = await p.chromium.launch(headless=False)
-                context = await browser.new_context()
-                page = await context.new_page()
+                context = await self._new_context(browser)
+                page, profile = await self._new_page(context)
                 
-                # Login
-                if not await self.login(page):
+                # Login only if there is no live saved session
+                if not await self.ensure_session(context, page):
                     return {"success": False, "error": "Login failed"}
                 
                 # Navigate to job page
-                await page.goto(job_url)
-                await page.wait_for_load_state('networkidle')
+                if not await self._goto_authenticated(context, page, profile, job_url, 'button[aria-label*="Easy Apply"]'):
+                    return {"success": False, "error": "Login failed"}
                 
                 # Look for Easy Apply button
                 easy_apply_button = await page.query_selector('button[aria-label*="Easy Apply"]')
@@ -125,18 +250,20 @@ class LinkedInPlaywrightService:
                 
                 # Click Easy Apply
                 await easy_apply_button.click()
-                await page.wait_for_load_state('networkidle')
+                await page.wait_for_selector('.jobs-easy-apply-modal, [role="dialog"]', timeout=10000)
                 
                 # Fill out application form
                 # This would need to be customized based on the specific form fields
                 # For now, return a placeholder response
                 
+                page_profile = await profile.finish(page)
                 await browser.close()
                 
                 return {
                     "success": True,
                     "message": "Application submitted successfully",
                     "job_url": job_url,
+                    "page_profile": page_profile,
                     "timestamp": datetime.utcnow().isoformat()
                 }
                 
@@ -148,15 +275,19 @@ class LinkedInPlaywrightService:
         try:
             async with async_playwright() as p:
                 browser = await p.chromium.launch(headless=True)
-                context = await browser.new_context()
-                page = await context.new_page()
+                context = await self._new_context(browser)
+                page, profile = await self._new_page(context)
                 
-                # Test login
-                success = await self.login(page)
+                # Test the saved session against the feed, logging in only if needed
+                logins = self.logins
+                success = await self.ensure_session(context, page)
+                if success:
+                    success = await self._goto_authenticated(context, page, profile, f"{self.base_url}/feed/", "main")
                 await browser.close()
                 
                 return {
                     "success": success,
+                    "session_reused": success and self.logins == logins,
                     "message": "LinkedIn connection test successful" if success else "LinkedIn login failed",
                     "timestamp": datetime.utcnow().isoformat()
                 }
@@ -167,6 +298,9 @@ class LinkedInPlaywrightService:
                 "error": str(e),
                 "timestamp": datetime.utcnow().isoformat()
             }
+    
+    def log_event(self, event: Dict[str, Any]):
+        log_event(event, service="linkedin_playwright")
 
 
 # Global instance
@@ -2,11 +2,10 @@
 LinkedIn service for job search automation
 """
 import httpx
-import json
-import pathlib
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from ..config.settings import settings
+from ..event_log import log_event
 
 
 class LinkedInService:
@@ -194,15 +193,7 @@ class LinkedInService:
             return error_result
     
     def log_event(self, event: Dict[str, Any]):
-        """Log event to JSONL file"""
-        log_path = pathlib.Path("apps/backend/logs")
-        log_path.mkdir(parents=True, exist_ok=True)
-        
-        event["timestamp"] = datetime.utcnow().isoformat()
-        event["service"] = "linkedin"
-        
-        with open(log_path / "app.log", "a") as f:
-            f.write(json.dumps(event) + "\n")
+        log_event(event, service="linkedin")
 
 
 # Global service instance
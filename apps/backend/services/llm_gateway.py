@@ -0,0 +1,191 @@
+"""
+LLM gateway: response cache, in-flight dedupe, per-minute budgets and per-agent accounting
+in front of a pluggable completion backend
+"""
+import asyncio
+import hashlib
+import json
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from ..config.settings import settings
+from .result_cache import ResultCache, result_cache
+from ..event_log import log_event
+
+# USD per million (input, output) tokens
+MODEL_PRICES = {
+    "openai:gpt-4o-mini": (0.15, 0.60),
+    "openai:gpt-4o": (2.50, 10.00),
+}
+
+# Completion tokens reserved against the budget when a call sets no max_tokens
+DEFAULT_COMPLETION_TOKENS = 512
+
+
+def estimate_tokens(text: str) -> int:
+    """~4 characters per token, the usual rule of thumb for English with BPE tokenizers"""
+    return max(1, math.ceil(len(text or "") / 4))
+
+
+def prompt_hash(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+class FakeLLM:
+    """Deterministic offline backend: the reply depends only on (model, system, prompt, params)"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls: List[Dict[str, Any]] = []
+
+    async def complete(self, model: str, system: str, prompt: str, **params: Any) -> str:
+        self.calls.append({"model": model, "system": system, "prompt": prompt, **params})
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        digest = hashlib.sha256(
+            "\x1f".join((model, system, prompt, json.dumps(params, sort_keys=True))).encode("utf-8")
+        ).hexdigest()
+        first_line = prompt.splitlines()[0] if prompt else ""
+        return f"[{model}] {first_line} ({digest[:12]})"
+
+
+class LLMGateway:
+    """Every LLM call goes through complete(), which in order:
+
+    1. returns a cached response for the same (model, system hash, prompt hash, params);
+    2. joins an identical request already in flight instead of sending another; a
+       cancelled caller never cancels the call the others are waiting on;
+    3. waits in a FIFO queue until the per-minute request and token budgets have room;
+    4. calls the backend and caches the response.
+
+    Budgets reserve prompt tokens plus max_tokens before sending, then settle on the
+    response's size; token counts are estimates. Any object with
+    `async complete(model, system, prompt, **params) -> str` can be the backend.
+    """
+
+    COUNTERS = ("requests", "backend_calls", "cache_hits", "deduped", "prompt_tokens",
+                "completion_tokens", "tokens_saved", "latency_ms", "queued_ms", "cost_usd", "cost_saved_usd")
+
+    def __init__(self, backend: Any, cache: Optional[ResultCache] = None,
+                 requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None,
+                 window_seconds: float = 60.0, cache_ttl_seconds: Optional[float] = None):
+        self.backend = backend
+        self.cache = cache if cache is not None else result_cache
+        self.requests_per_minute = requests_per_minute or settings.llm_requests_per_minute
+        self.tokens_per_minute = tokens_per_minute or settings.llm_tokens_per_minute
+        self.window_seconds = window_seconds
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self._window: Deque[List[float]] = deque()  # [sent_at, tokens] per backend call
+        self._queue = asyncio.Lock()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.agents: Dict[str, Dict[str, float]] = {}
+
+    @staticmethod
+    def cache_key(model: str, system: str, prompt: str, params: Dict[str, Any]) -> str:
+        payload = json.dumps([model, prompt_hash(system), prompt_hash(prompt), params], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _account(self, agent: str, **amounts: float) -> None:
+        counters = self.agents.setdefault(agent, dict.fromkeys(self.COUNTERS, 0))
+        for name, amount in amounts.items():
+            counters[name] += amount
+
+    @staticmethod
+    def cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        price_in, price_out = MODEL_PRICES.get(model, (0.0, 0.0))
+        return (prompt_tokens * price_in + completion_tokens * price_out) / 1_000_000
+
+    async def _reserve(self, tokens: int) -> List[float]:
+        """Wait in line until one more request of `tokens` fits in the rolling window"""
+        async with self._queue:
+            while True:
+                now = time.monotonic()
+                while self._window and self._window[0][0] <= now - self.window_seconds:
+                    self._window.popleft()
+                used = sum(entry[1] for entry in self._window)
+                # A request larger than the whole token budget still goes out, alone
+                if len(self._window) < self.requests_per_minute and (
+                        not self._window or used + tokens <= self.tokens_per_minute):
+                    entry = [now, float(tokens)]
+                    self._window.append(entry)
+                    return entry
+                await asyncio.sleep(self._window[0][0] + self.window_seconds - now)
+
+    async def complete(self, model: str, system: str, prompt: str, agent: str = "default",
+                       **params: Any) -> str:
+        started = time.perf_counter()
+        key = self.cache_key(model, system, prompt, params)
+        self._account(agent, requests=1)
+
+        cached = self.cache.get("llm", key)
+        if cached is not None:
+            self._saved(agent, model, cached, "cache_hits", started)
+            return cached["text"]
+
+        # The backend call runs in a task no caller owns: cancelling any caller, even
+        # the one that started it, leaves the call running for the others
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            response = await asyncio.shield(pending)
+            self._saved(agent, model, response, "deduped", started)
+            return response["text"]
+
+        pending = self._in_flight[key] = asyncio.ensure_future(
+            self._call(key, model, system, prompt, params, agent, started))
+        # Mark a failure nobody is left to await as retrieved so it isn't logged
+        pending.add_done_callback(lambda task: task.cancelled() or task.exception())
+        return (await asyncio.shield(pending))["text"]
+
+    async def _call(self, key: str, model: str, system: str, prompt: str, params: Dict[str, Any],
+                    agent: str, started: float) -> Dict[str, Any]:
+        """Reserve budget, call the backend and cache the response, accounted to the
+        agent whose request started it"""
+        try:
+            prompt_tokens = estimate_tokens(system) + estimate_tokens(prompt)
+            entry = await self._reserve(prompt_tokens + params.get("max_tokens", DEFAULT_COMPLETION_TOKENS))
+            queued_ms = (time.perf_counter() - started) * 1000
+            text = await self.backend.complete(model, system, prompt, **params)
+            response = {"text": text, "prompt_tokens": prompt_tokens, "completion_tokens": estimate_tokens(text)}
+            entry[1] = prompt_tokens + response["completion_tokens"]
+            self.cache.put("llm", key, model, response, ttl_seconds=self.cache_ttl_seconds)
+        finally:
+            self._in_flight.pop(key, None)
+
+        latency_ms = (time.perf_counter() - started) * 1000
+        self._account(
+            agent, backend_calls=1, prompt_tokens=prompt_tokens, completion_tokens=response["completion_tokens"],
+            latency_ms=latency_ms, queued_ms=queued_ms,
+            cost_usd=self.cost(model, prompt_tokens, response["completion_tokens"]),
+        )
+        self.log_event({"type": "llm_call", "agent": agent, "model": model, "prompt_tokens": prompt_tokens,
+                        "completion_tokens": response["completion_tokens"],
+                        "latency_ms": round(latency_ms, 3), "queued_ms": round(queued_ms, 3)})
+        return response
+
+    def _saved(self, agent: str, model: str, response: Dict[str, Any], outcome: str, started: float) -> None:
+        """Account a call answered without the backend; the tokens it would have used are savings"""
+        tokens = response["prompt_tokens"] + response["completion_tokens"]
+        self._account(agent, **{outcome: 1}, tokens_saved=tokens,
+                      latency_ms=(time.perf_counter() - started) * 1000,
+                      cost_saved_usd=self.cost(model, response["prompt_tokens"], response["completion_tokens"]))
+
+    def stats(self) -> Dict[str, Any]:
+        agents = {}
+        for agent, counters in sorted(self.agents.items()):
+            requests = counters["requests"]
+            agents[agent] = {
+                **{name: round(value, 6) if isinstance(value, float) else value for name, value in counters.items()},
+                "avg_latency_ms": round(counters["latency_ms"] / requests, 3) if requests else 0.0,
+                "saved_rate": (counters["cache_hits"] + counters["deduped"]) / requests if requests else 0.0,
+            }
+        return {
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "in_flight": len(self._in_flight),
+            "agents": agents,
+        }
+
+    def log_event(self, event: Dict[str, Any]):
+        log_event(event, service="llm_gateway")
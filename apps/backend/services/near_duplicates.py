@@ -0,0 +1,123 @@
+"""
+Near-duplicate job description detection with MinHash signatures and LSH banding
+"""
+import html
+import re
+import zlib
+from typing import Dict, List, Optional, Set, Tuple, Any
+
+import numpy as np
+
+TAGS = re.compile(r"<[^>]+>")
+WORDS = re.compile(r"[a-z0-9]+")
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def jd_tokens(text: str) -> List[str]:
+    """Lowercased word tokens of a JD, with HTML markup removed"""
+    return WORDS.findall(TAGS.sub(" ", html.unescape(text)).lower())
+
+
+class MinHasher:
+    """MinHash over word shingles using universal hashing (a*x + b) mod p"""
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self._b = rng.randint(0, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64)
+
+    def shingles(self, text: str) -> Set[int]:
+        tokens = jd_tokens(text)
+        size = min(self.shingle_size, len(tokens)) or 1
+        return {
+            zlib.crc32(" ".join(tokens[i:i + size]).encode("utf-8"))
+            for i in range(max(len(tokens) - size + 1, 1))
+        }
+
+    def signature(self, text: str) -> np.ndarray:
+        """num_perm-long uint64 signature; equal slots estimate Jaccard similarity"""
+        hashes = np.fromiter(self.shingles(text), dtype=np.uint64)
+        # Overflow in a*x wraps modulo 2**64, which is fine for hashing purposes
+        with np.errstate(over="ignore"):
+            permuted = (np.outer(self._a, hashes) + self._b[:, None]) % MERSENNE_PRIME
+        return (permuted & MAX_HASH).min(axis=1)
+
+    @staticmethod
+    def similarity(left: np.ndarray, right: np.ndarray) -> float:
+        return float(np.mean(left == right))
+
+
+class NearDuplicateIndex:
+    """LSH index over MinHash signatures: candidate lookup touches only colliding buckets"""
+
+    def __init__(self, hasher: Optional[MinHasher] = None, bands: int = 32, threshold: float = 0.7):
+        self.hasher = hasher or MinHasher()
+        if self.hasher.num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.bands = bands
+        self.rows = self.hasher.num_perm // bands
+        self.threshold = threshold
+        self.signatures: Dict[str, np.ndarray] = {}
+        self._buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    @classmethod
+    def from_jobs(cls, jobs: Dict[str, Dict[str, Any]], **kwargs) -> "NearDuplicateIndex":
+        index = cls(**kwargs)
+        for job_id, job in jobs.items():
+            if job.get("jd_text"):
+                index.add(job_id, job["jd_text"])
+        return index
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def query(self, text: str, exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        """Indexed jobs whose JD is at least `threshold` similar, best first"""
+        return self._query_signature(self.hasher.signature(text), exclude)
+
+    def _query_signature(self, signature: np.ndarray, exclude: Optional[str]) -> List[Tuple[str, float]]:
+        candidates: Set[str] = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates |= self._buckets[band].get(key, set())
+        candidates.discard(exclude)
+
+        matches = []
+        for job_id in candidates:
+            score = MinHasher.similarity(signature, self.signatures[job_id])
+            if score >= self.threshold:
+                matches.append((job_id, score))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+    def add(self, job_id: str, text: str) -> Optional[Tuple[str, float]]:
+        """Index a JD and return its closest existing near-duplicate, if any"""
+        signature = self.hasher.signature(text)
+        matches = self._query_signature(signature, exclude=job_id)
+
+        self.remove(job_id)
+        self.signatures[job_id] = signature
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, set()).add(job_id)
+
+        return matches[0] if matches else None
+
+    def remove(self, job_id: str) -> None:
+        signature = self.signatures.pop(job_id, None)
+        if signature is None:
+            return
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(key)
+            if bucket:
+                bucket.discard(job_id)
+                if not bucket:
+                    del self._buckets[band][key]
@@ -2,11 +2,10 @@
 Overleaf API service for resume management
 """
 import httpx
-import json
 import pathlib
 from typing import Dict, List, Optional, Any
-from datetime import datetime
 from ..config.settings import settings
+from ..event_log import log_event
 
 
 class OverleafService:
@@ -132,15 +131,7 @@ class OverleafService:
         raise TimeoutError("Compilation timed out")
     
     def log_event(self, event: Dict[str, Any]):
-        """Log event to JSONL file"""
-        log_path = pathlib.Path("apps/backend/logs")
-        log_path.mkdir(parents=True, exist_ok=True)
-        
-        event["timestamp"] = datetime.utcnow().isoformat()
-        event["service"] = "overleaf"
-        
-        with open(log_path / "app.log", "a") as f:
-            f.write(json.dumps(event) + "\n")
+        log_event(event, service="overleaf")
 
 
 # Global service instance
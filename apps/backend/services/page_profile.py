@@ -0,0 +1,154 @@
+"""
+Lightweight page profile for automation sessions: block what autofill never needs,
+wait for the element we actually want instead of networkidle, and measure the savings
+"""
+import time
+from typing import Dict, Iterable, Optional, Any
+from urllib.parse import urlsplit
+
+# Analytics, ads and session-replay hosts (suffix match) that never affect a form
+TRACKER_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "adservice.google.com",
+    "facebook.net",
+    "connect.facebook.net",
+    "bat.bing.com",
+    "px.ads.linkedin.com",
+    "snap.licdn.com",
+    "hotjar.com",
+    "fullstory.com",
+    "segment.io",
+    "cdn.segment.com",
+    "mixpanel.com",
+    "amplitude.com",
+    "optimizely.com",
+    "nr-data.net",
+    "quantserve.com",
+    "scorecardresearch.com",
+    "clarity.ms",
+)
+
+# Blocked requests never report a size, so savings use typical transfer sizes
+TYPICAL_BYTES = {
+    "image": 60_000,
+    "media": 500_000,
+    "font": 40_000,
+    "stylesheet": 30_000,
+    "script": 80_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+}
+
+# Time from navigation start to the load event, read once the work on a page is done
+LOAD_EVENT_JS = """
+() => {
+  const nav = performance.getEntriesByType('navigation')[0];
+  return nav && nav.loadEventEnd > 0 ? nav.loadEventEnd : null;
+}
+"""
+
+
+class ResourcePolicy:
+    """Which requests an automation page aborts: by resource type or tracker host"""
+
+    def __init__(self, block_types: Iterable[str] = ("image", "media", "font"),
+                 block_domains: Iterable[str] = TRACKER_DOMAINS):
+        self.block_types = {t.strip() for t in block_types if t.strip()} - {"document"}
+        self.block_domains = tuple(domain.lower() for domain in block_domains)
+
+    @classmethod
+    def from_settings(cls, settings) -> "ResourcePolicy":
+        return cls(
+            block_types=settings.automation_block_resources.split(","),
+            block_domains=TRACKER_DOMAINS if settings.automation_block_trackers else (),
+        )
+
+    def should_block(self, resource_type: str, url: str) -> Optional[str]:
+        """Reason to abort the request ('tracker' or its resource type), or None to let it through"""
+        if resource_type == "document":
+            return None
+        host = (urlsplit(url).hostname or "").lower()
+        if any(host == domain or host.endswith("." + domain) for domain in self.block_domains):
+            return "tracker"
+        if resource_type in self.block_types:
+            return resource_type
+        return None
+
+
+class PageProfile:
+    """Per-page record of what was blocked, what loaded, and how soon the page was usable"""
+
+    def __init__(self, policy: ResourcePolicy):
+        self.policy = policy
+        self.blocked: Dict[str, int] = {}
+        self.bytes_saved = 0
+        self.bytes_loaded = 0
+        self.requests_allowed = 0
+        self.ready_ms: Optional[float] = None
+        self.load_event_ms: Optional[float] = None
+
+    async def attach(self, page) -> "PageProfile":
+        """Install the request interceptor on a fresh page"""
+        await page.route("**/*", self._handle)
+        page.on("response", self._on_response)
+        return self
+
+    async def _handle(self, route) -> None:
+        request = route.request
+        reason = self.policy.should_block(request.resource_type, request.url)
+        if reason is None:
+            self.requests_allowed += 1
+            # fallback() lets context-level routes (e.g. offline replay) see the request
+            await route.fallback()
+            return
+        self.blocked[reason] = self.blocked.get(reason, 0) + 1
+        self.bytes_saved += TYPICAL_BYTES.get(request.resource_type, 10_000)
+        await route.abort()
+
+    def _on_response(self, response) -> None:
+        try:
+            self.bytes_loaded += int(response.headers.get("content-length", 0))
+        except (TypeError, ValueError):
+            pass
+
+    async def goto(self, page, url: str, ready_selector: Optional[str] = None,
+                   timeout: int = 30000) -> bool:
+        """Navigate and return as soon as `ready_selector` is attached (or DOMContentLoaded).
+        Returns False if the selector never showed up; callers carry on regardless."""
+        started = time.perf_counter()
+        await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+        ready = True
+        if ready_selector:
+            try:
+                await page.wait_for_selector(ready_selector, state="attached", timeout=timeout)
+            except Exception:
+                ready = False
+        self.ready_ms = round((time.perf_counter() - started) * 1000, 1)
+        return ready
+
+    async def finish(self, page) -> Dict[str, Any]:
+        """Read the page's load-event time so the wait we skipped can be reported"""
+        try:
+            self.load_event_ms = await page.evaluate(LOAD_EVENT_JS)
+        except Exception:
+            self.load_event_ms = None
+        return self.summary()
+
+    def summary(self) -> Dict[str, Any]:
+        time_saved = None
+        if self.ready_ms is not None and self.load_event_ms is not None:
+            # networkidle fires at least 500ms after the load event's last request
+            time_saved = round(max(0.0, self.load_event_ms + 500 - self.ready_ms), 1)
+        return {
+            "blocked": dict(self.blocked),
+            "blocked_requests": sum(self.blocked.values()),
+            "allowed_requests": self.requests_allowed,
+            "bytes_loaded": self.bytes_loaded,
+            "estimated_bytes_saved": self.bytes_saved,
+            "ready_ms": self.ready_ms,
+            "load_event_ms": self.load_event_ms,
+            "estimated_ms_saved": time_saved,
+        }
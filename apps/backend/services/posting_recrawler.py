@@ -0,0 +1,181 @@
+"""
+Change detection and adaptive recrawl for stored job postings
+"""
+import asyncio
+import httpx
+from typing import Dict, List, Optional, Any
+from datetime import datetime, timedelta
+from workers.crawler.main import content_hash
+from ..models.job import JobStatus
+from ..storage import load_data, save_data
+from ..event_log import log_event
+
+HOUR = 3600.0
+
+# Base recheck interval per pipeline status; statuses not listed are never rechecked
+STATUS_INTERVALS = {
+    JobStatus.NEW.value: 6 * HOUR,
+    JobStatus.PREPARED.value: 6 * HOUR,
+    JobStatus.PDF_READY.value: 12 * HOUR,
+    JobStatus.AUTOFILLED.value: 12 * HOUR,
+    JobStatus.SUBMITTED.value: 7 * 24 * HOUR,
+    JobStatus.INTERVIEW.value: 7 * 24 * HOUR,
+}
+
+# A closed posting only closes jobs that haven't been applied to yet; past that the
+# application is still live, so only the posting's closed_at is recorded
+CLOSABLE_STATUSES = frozenset({
+    JobStatus.NEW.value,
+    JobStatus.PREPARED.value,
+    JobStatus.PDF_READY.value,
+    JobStatus.AUTOFILLED.value,
+})
+
+# Unchanged postings back off up to this multiple of their status interval
+MAX_BACKOFF = 4.0
+
+CLOSED_PHRASES = (
+    "no longer accepting applications",
+    "job is no longer available",
+    "position has been filled",
+    "this job has expired",
+    "job you are looking for is no longer open",
+    "posting has been closed",
+)
+
+
+class PostingRecrawler:
+    """Revalidates stored postings with conditional GETs and flags closed or edited ones"""
+
+    def __init__(self, concurrency: int = 8):
+        self.concurrency = concurrency
+        # jd_url -> {hash, etag, last_modified, checked_at, next_check, backoff, ...}
+        self.state: Dict[str, Dict[str, Any]] = load_data("posting_state")
+
+    def interval_for(self, status: str, backoff: float = 1.0) -> Optional[float]:
+        """Seconds until the next check for a posting in the given status"""
+        base = STATUS_INTERVALS.get(status)
+        return None if base is None else base * backoff
+
+    def due_jobs(self, jobs: Dict[str, Dict[str, Any]], now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Jobs whose posting should be revalidated now, hottest statuses first"""
+        now = now or datetime.utcnow()
+        due = []
+        for job in jobs.values():
+            if self.interval_for(job.get("status")) is None:
+                continue
+            entry = self.state.get(job["jd_url"])
+            if entry is None or datetime.fromisoformat(entry["next_check"]) <= now:
+                due.append(job)
+        due.sort(key=lambda job: STATUS_INTERVALS[job["status"]])
+        return due
+
+    def _is_closed(self, response: httpx.Response) -> bool:
+        if response.status_code in (404, 410):
+            return True
+        if response.history and "error=true" in str(response.url):
+            # Greenhouse redirects closed postings back to the board with ?error=true
+            return True
+        text = response.text.lower()
+        return any(phrase in text for phrase in CLOSED_PHRASES)
+
+    async def check(self, client: httpx.AsyncClient, job: Dict[str, Any],
+                    now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Revalidate one posting; returns {'job_id', 'outcome'} with outcome in
+        unchanged | changed | closed | error"""
+        now = now or datetime.utcnow()
+        url = job["jd_url"]
+        entry = self.state.get(url, {"backoff": 1.0})
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            response = await client.get(url, headers=headers)
+        except httpx.HTTPError as e:
+            outcome = "error"
+            entry["last_error"] = str(e)
+        else:
+            if response.status_code == 304:
+                outcome = "unchanged"
+            elif self._is_closed(response):
+                outcome = "closed"
+            elif response.status_code >= 400:
+                outcome = "error"
+                entry["last_error"] = f"HTTP {response.status_code}"
+            else:
+                digest = content_hash(response.text)
+                outcome = "changed" if entry.get("hash") not in (None, digest) else "unchanged"
+                entry["hash"] = digest
+                entry["etag"] = response.headers.get("etag")
+                entry["last_modified"] = response.headers.get("last-modified")
+
+        if outcome == "unchanged" and entry.get("checked_at"):
+            entry["backoff"] = min(MAX_BACKOFF, entry.get("backoff", 1.0) * 1.5)
+        else:
+            entry["backoff"] = 1.0
+        if outcome == "changed":
+            entry["changed_at"] = now.isoformat()
+        if outcome == "closed":
+            entry.setdefault("closed_at", now.isoformat())
+
+        status = job.get("status")
+        if outcome == "closed" and status in CLOSABLE_STATUSES:
+            status = JobStatus.CLOSED.value
+        interval = self.interval_for(status, entry["backoff"]) or STATUS_INTERVALS[JobStatus.SUBMITTED.value]
+        entry["checked_at"] = now.isoformat()
+        entry["next_check"] = (now + timedelta(seconds=interval)).isoformat()
+        self.state[url] = entry
+
+        return {"job_id": job["job_id"], "jd_url": url, "outcome": outcome}
+
+    async def run(self, jobs: Dict[str, Dict[str, Any]], limit: Optional[int] = None,
+                  client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
+        """Revalidate due postings, close jobs not yet applied to whose posting closed
+        and persist validators"""
+        due = self.due_jobs(jobs)
+        if limit is not None:
+            due = due[:limit]
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(http_client, job):
+            async with semaphore:
+                return await self.check(http_client, job)
+
+        if client is not None:
+            results = await asyncio.gather(*(bounded(client, job) for job in due))
+        else:
+            async with httpx.AsyncClient(timeout=20, follow_redirects=True) as owned_client:
+                results = await asyncio.gather(*(bounded(owned_client, job) for job in due))
+
+        now = datetime.utcnow()
+        for result in results:
+            job = jobs[result["job_id"]]
+            if result["outcome"] == "closed" and job.get("status") in CLOSABLE_STATUSES:
+                job["status"] = JobStatus.CLOSED.value
+                job["updated_at"] = now
+            elif result["outcome"] == "changed":
+                job["updated_at"] = now
+
+        save_data("posting_state", self.state)
+
+        summary = {
+            "checked": len(results),
+            "unchanged": sum(1 for r in results if r["outcome"] == "unchanged"),
+            "changed": [r["job_id"] for r in results if r["outcome"] == "changed"],
+            "closed": [r["job_id"] for r in results if r["outcome"] == "closed"],
+            "errors": sum(1 for r in results if r["outcome"] == "error"),
+        }
+        self.log_event({"type": "postings_recrawled", **summary})
+        return summary
+
+    def log_event(self, event: Dict[str, Any]):
+        log_event(event, service="posting_recrawler")
+
+
+# Global service instance
+posting_recrawler = PostingRecrawler()
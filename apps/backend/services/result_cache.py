@@ -0,0 +1,171 @@
+"""
+Content-hash memoization of computed results: an in-memory LRU in front of SQLite
+"""
+import hashlib
+import json
+import pathlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from contextlib import closing
+from typing import Any, Dict, Optional, Tuple
+
+from ..config.settings import settings
+from ..event_log import log_event
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    version TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS results_expiry ON results (expires_at);
+"""
+
+INLINE_SPACE = re.compile(r"[ \t ]+")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Unicode, line endings and spacing normalized; line breaks kept since resume sections depend on them"""
+    text = unicodedata.normalize("NFKC", text or "").replace("\r\n", "\n").replace("\r", "\n")
+    lines = (INLINE_SPACE.sub(" ", line).strip() for line in text.split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+class ResultCache:
+    """namespace + content hash -> JSON result, with a TTL and a producer version.
+
+    The version is hashed into the key, so bumping it (a new scorer, a new prompt)
+    makes every older entry unreachable; purge() then deletes them from disk.
+    """
+
+    COUNTERS = ("memory_hits", "disk_hits", "misses", "expired", "writes")
+
+    def __init__(self, path: str, ttl_seconds: float = 7 * 24 * 3600, memory_size: int = 1024):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+        pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @staticmethod
+    def key_for(version: str, *parts: Optional[str]) -> str:
+        """sha256 of the producer version and the normalized inputs"""
+        digest = hashlib.sha256(version.encode("utf-8"))
+        for part in parts:
+            digest.update(b"\x1f" + normalize_text(part).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _count(self, namespace: str, counter: str) -> None:
+        counters = self._counters.setdefault(namespace, dict.fromkeys(self.COUNTERS, 0))
+        counters[counter] += 1
+
+    def _remember(self, namespace: str, key: str, expires_at: float, value: Dict[str, Any]) -> None:
+        self._memory[(namespace, key)] = (expires_at, value)
+        self._memory.move_to_end((namespace, key))
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, namespace: str, key: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._memory.get((namespace, key))
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end((namespace, key))
+                    self._count(namespace, "memory_hits")
+                    return entry[1]
+                del self._memory[(namespace, key)]
+
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM results WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+        with self._lock:
+            if row is None:
+                self._count(namespace, "misses")
+                return None
+            if row[1] <= now:
+                self._count(namespace, "expired")
+                return None
+            value = json.loads(row[0])
+            self._remember(namespace, key, row[1], value)
+            self._count(namespace, "disk_hits")
+            return value
+
+    def put(self, namespace: str, key: str, version: str, value: Dict[str, Any],
+            ttl_seconds: Optional[float] = None, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        expires_at = now + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        payload = json.dumps(value, default=str)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (namespace, key, version, value, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (namespace, key, version, payload, now, expires_at),
+            )
+        with self._lock:
+            # Memory holds the decoded JSON so hits look the same whichever tier served them
+            self._remember(namespace, key, expires_at, json.loads(payload))
+            self._count(namespace, "writes")
+
+    def purge(self, namespace: Optional[str] = None, keep_version: Optional[str] = None,
+              now: Optional[float] = None) -> int:
+        """Delete expired entries, and entries of `namespace` not produced by `keep_version`"""
+        now = time.time() if now is None else now
+        with closing(self._connect()) as conn, conn:
+            removed = conn.execute("DELETE FROM results WHERE expires_at <= ?", (now,)).rowcount
+            if namespace is not None and keep_version is not None:
+                removed += conn.execute(
+                    "DELETE FROM results WHERE namespace = ? AND version != ?", (namespace, keep_version)
+                ).rowcount
+        with self._lock:
+            self._memory.clear()
+        if removed:
+            self.log_event({"type": "result_cache_purged", "namespace": namespace, "removed": removed})
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with closing(self._connect()) as conn, conn:
+            stored = dict(conn.execute("SELECT namespace, COUNT(*) FROM results GROUP BY namespace").fetchall())
+        with self._lock:
+            namespaces = {}
+            for namespace in sorted(set(self._counters) | set(stored)):
+                counters = self._counters.get(namespace, dict.fromkeys(self.COUNTERS, 0))
+                hits = counters["memory_hits"] + counters["disk_hits"]
+                lookups = hits + counters["misses"] + counters["expired"]
+                namespaces[namespace] = {
+                    **counters,
+                    "stored": stored.get(namespace, 0),
+                    "hit_rate": hits / lookups if lookups else 0.0,
+                }
+            return {"memory_entries": len(self._memory), "namespaces": namespaces}
+
+    def log_event(self, event: Dict[str, Any]):
+        log_event(event, service="result_cache")
+
+
+# Global cache shared by /match and, later, LLM-backed rewrites
+result_cache = ResultCache(
+    settings.result_cache_path,
+    ttl_seconds=settings.result_cache_ttl_seconds,
+    memory_size=settings.result_cache_memory_size,
+)
@@ -0,0 +1,39 @@
+"""
+Plain text from stored resume files, for local matching
+"""
+import html
+import pathlib
+import re
+import zipfile
+
+LATEX_COMMENT = re.compile(r"(?<!\\)%.*")
+# \section*{Experience} -> Experience on its own line, \textbf{x} -> x, \item -> newline
+LATEX_HEADING = re.compile(r"\\(?:section|subsection|cventry|resumeSection)\*?\{([^}]*)\}")
+LATEX_STRUCTURE = re.compile(r"\\(?:begin|end|documentclass|usepackage)(?:\[[^\]]*\])?\{[^}]*\}")
+LATEX_COMMAND = re.compile(r"\\[a-zA-Z]+\*?(?:\[[^\]]*\])?")
+DOCX_PARAGRAPH = re.compile(r"</w:p>")
+XML_TAGS = re.compile(r"<[^>]+>")
+
+
+def extract_text(path: str) -> str:
+    """Text of a .tex or .docx resume. PDFs need a text layer parser this repo doesn't
+    ship, so they raise ValueError and callers should ask for resume_text instead."""
+    file_path = pathlib.Path(path)
+    suffix = file_path.suffix.lower()
+    if suffix == ".tex":
+        return latex_text(file_path.read_text(errors="ignore"))
+    if suffix == ".docx":
+        with zipfile.ZipFile(file_path) as archive:
+            xml = archive.read("word/document.xml").decode("utf-8", errors="ignore")
+        return html.unescape(XML_TAGS.sub("", DOCX_PARAGRAPH.sub("\n", xml)))
+    raise ValueError(f"Cannot extract text from {suffix or 'extensionless'} resumes; send resume_text")
+
+
+def latex_text(source: str) -> str:
+    text = LATEX_COMMENT.sub("", source)
+    text = LATEX_STRUCTURE.sub("\n", text)
+    text = LATEX_HEADING.sub(lambda m: f"\n{m.group(1)}\n", text)
+    text = re.sub(r"\\([%&$#_])", r"\1", text)
+    text = text.replace("\\item", "\n").replace("\\\\", "\n")
+    text = LATEX_COMMAND.sub(" ", text)
+    return re.sub(r"[{}~]", " ", text)
@@ -0,0 +1,42 @@
+"""
+Wall-clock timings for the phases of one automation run
+"""
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+
+class RunTimer:
+    """Accumulates per-phase and per-field durations (ms) from the moment it is created"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.fields: Dict[str, float] = {}
+
+    def elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self.started) * 1000, 1)
+
+    def add(self, name: str, ms: float) -> None:
+        """Add time to a phase; a phase entered twice (e.g. stale cache then discovery) sums"""
+        self.phases[name] = round(self.phases.get(name, 0.0) + ms, 1)
+
+    def field(self, key: str, ms: float) -> None:
+        self.fields[key] = round(ms, 1)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - started) * 1000)
+
+    def summary(self) -> Dict[str, Any]:
+        slowest: Optional[str] = max(self.phases, key=self.phases.get) if self.phases else None
+        return {
+            "total_ms": self.elapsed_ms(),
+            "phases": dict(self.phases),
+            "fields": dict(self.fields),
+            "slowest_phase": slowest,
+        }
@@ -0,0 +1,165 @@
+"""
+Skill extraction from JDs and resumes with an Aho-Corasick automaton over a skill taxonomy
+"""
+import html
+import json
+import pathlib
+import re
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .jd_matcher import text_digest
+
+TAXONOMY_PATH = pathlib.Path(__file__).resolve().parents[1] / "config" / "skill_taxonomy.json"
+
+TAGS = re.compile(r"<[^>]+>")
+# Everything but word characters and the punctuation inside tech names (c++, c#, node.js,
+# a/b, ci/cd, r&d, t-sql) is a separator; so is that punctuation when not inside a word
+SEPARATORS = re.compile(r"[^a-z0-9+#./&-]+|(?<![a-z0-9])[./&-]+|[./&-]+(?![a-z0-9+#])")
+SPACES = re.compile(r" {2,}")
+SLASHED = re.compile(r"\S+/\S+")
+
+
+def normalize(text: str) -> str:
+    """Lowercased text with single-space separators, padded so every word is space-delimited"""
+    text = TAGS.sub(" ", html.unescape(text or "")).lower()
+    return " " + SPACES.sub(" ", SEPARATORS.sub(" ", text)).strip() + " "
+
+
+class AhoCorasick:
+    """Multi-pattern matcher: every occurrence of every pattern in one pass over the text"""
+
+    def __init__(self, patterns: List[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List[int]] = [[]]
+
+        for index, pattern in enumerate(patterns):
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = self.goto[state][char] = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                state = next_state
+            self.out[state].append(index)
+
+        # Breadth-first failure links; each state's output includes its failure chain's
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+
+    def find(self, text: str) -> List[Tuple[int, int]]:
+        """(end offset, pattern index) for every match, in text order"""
+        goto, fail, out = self.goto, self.fail, self.out
+        found = []
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.extend((end, index) for index in out[state])
+        return found
+
+
+class SkillExtractor:
+    """Canonical skills mentioned in a text, matched by name or alias on word boundaries.
+
+    A slash separates words ("SQL/Excel") except inside a slashed name or alias of the
+    taxonomy itself ("A/B testing", "CI/CD").
+
+    Results are cached per text hash, so bulk ingestion and repeat /match calls on
+    the same JD pay for one automaton pass.
+    """
+
+    def __init__(self, taxonomy_path: pathlib.Path = TAXONOMY_PATH, cache_size: int = 4096):
+        taxonomy = json.loads(pathlib.Path(taxonomy_path).read_text())
+        self.version = taxonomy.get("version", 1)
+        self.skills: Dict[str, Dict[str, Any]] = {skill["name"]: skill for skill in taxonomy["skills"]}
+
+        patterns, self._pattern_skill = [], []
+        for skill in taxonomy["skills"]:
+            names = list(skill.get("aliases", []))
+            if skill.get("match_name", True):
+                names.insert(0, skill["name"])
+            for name in dict.fromkeys(normalize(name) for name in names):
+                if name.strip():
+                    patterns.append(name)
+                    self._pattern_skill.append(skill["name"])
+        self._slashed = {word for pattern in patterns for word in pattern.split() if "/" in word}
+        self.automaton = AhoCorasick(patterns)
+
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, List[str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def extract(self, text: str) -> List[str]:
+        """Skills in order of first mention"""
+        if not text:
+            return []
+        key = text_digest(text)
+        skills = self._cache.get(key)
+        if skills is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return list(skills)
+
+        self.misses += 1
+        seen: Dict[str, None] = {}
+        for _, index in self.automaton.find(self._split_slashes(normalize(text))):
+            seen.setdefault(self._pattern_skill[index])
+        skills = list(seen)
+        self._cache[key] = skills
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return list(skills)
+
+    def _split_slashes(self, text: str) -> str:
+        return SLASHED.sub(lambda match: self._split_word(match.group()), text)
+
+    def _split_word(self, word: str) -> str:
+        """'sql/excel' -> 'sql excel', keeping the longest slashed taxonomy words whole:
+        'ci/cd/python' -> 'ci/cd python'"""
+        parts, words, start = word.split("/"), [], 0
+        while start < len(parts):
+            for end in range(len(parts), start + 1, -1):
+                joined = "/".join(parts[start:end])
+                if joined in self._slashed:
+                    words.append(joined)
+                    start = end
+                    break
+            else:
+                words.append(parts[start])
+                start += 1
+        return " ".join(word for word in words if word)
+
+    def missing(self, resume_text: str, jd_text: str, limit: Optional[int] = None) -> List[str]:
+        """JD skills the resume never mentions, in JD order"""
+        have = set(self.extract(resume_text))
+        gaps = [skill for skill in self.extract(jd_text) if skill not in have]
+        return gaps[:limit] if limit is not None else gaps
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "skills": len(self.skills),
+            "patterns": len(self._pattern_skill),
+            "cached": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Global extractor over the bundled taxonomy
+skill_extractor = SkillExtractor()
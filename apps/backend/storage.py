@@ -3,6 +3,7 @@ Simple file-based storage for demo purposes
 In production, this would be replaced with a proper database
 """
 import json
+import os
 import pathlib
 from typing import Dict, List, Any
 from datetime import datetime
@@ -22,11 +23,14 @@ def load_data(filename: str) -> Dict[str, Any]:
     return {}
 
 def save_data(filename: str, data: Dict[str, Any]) -> None:
-    """Save data to JSON file"""
+    """Save data to JSON file, replaced atomically so a concurrent reader in another
+    process never sees a half-written file"""
     file_path = STORAGE_DIR / f"{filename}.json"
+    tmp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.tmp")
     try:
-        with open(file_path, 'w') as f:
+        with open(tmp_path, 'w') as f:
             json.dump(data, f, indent=2, default=str)
+        os.replace(tmp_path, file_path)
     except IOError as e:
         print(f"Error saving data to {file_path}: {e}")
 
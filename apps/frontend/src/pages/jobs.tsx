@@ -86,6 +86,7 @@ export default function JobsPage() {
       case 'submitted': return 'bg-green-100 text-green-800';
       case 'rejected': return 'bg-red-100 text-red-800';
       case 'interview': return 'bg-indigo-100 text-indigo-800';
+      case 'closed': return 'bg-gray-200 text-gray-500';
       default: return 'bg-gray-100 text-gray-800';
     }
   };
@@ -287,6 +288,7 @@ export default function JobsPage() {
                       <option value="submitted">Submitted</option>
                       <option value="rejected">Rejected</option>
                       <option value="interview">Interview</option>
+                      <option value="closed">Closed</option>
                     </select>
                     <div className="text-xs text-gray-500">
                       Created: {new Date(job.created_at).toLocaleDateString()}
@@ -78,6 +78,8 @@ export const api = {
       apiClient.put(`/sites/${siteId}`, updates),
     delete: (siteId: string) => apiClient.delete(`/sites/${siteId}`),
     test: (siteId: string) => apiClient.post(`/sites/${siteId}/test`),
+    sync: (siteId: string, track: string = 'PM') => 
+      apiClient.post(`/sites/${siteId}/sync`, null, { params: { track } }),
   },
 
   // Apply Pack API
@@ -85,6 +87,13 @@ export const api = {
     prepare: (data: any) => apiClient.post('/apply/prepare', data),
   },
 
+  // Autofill API
+  autofill: {
+    run: (data: any) => apiClient.post('/autofill/run', data),
+    task: (taskId: string) => apiClient.get(`/autofill/tasks/${taskId}`),
+    tasks: (params?: any) => apiClient.get('/autofill/tasks', { params }),
+  },
+
   // Outreach API
   outreach: {
     plan: (jobId: string, company: string, role: string) => 
@@ -0,0 +1,104 @@
+"""
+Benchmark ATSService.fill_application_form against recorded ATS pages, offline.
+
+Pages from tests/fixtures/ats_forms (and any --har recordings) are served through
+Playwright routing at their real ATS URLs; every other request gets a 404, so the
+run needs no network.
+
+    python scripts/bench_autofill.py --repeat 5
+    python scripts/bench_autofill.py --har recordings/workday.har --json
+    python scripts/bench_autofill.py --warm   # keep learned form schemas between runs
+"""
+import argparse
+import asyncio
+import json
+import pathlib
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from apps.backend.services.ats_service import ATSService
+from apps.backend.services.browser_pool import BrowserPool
+from apps.backend.services.form_schema_cache import FormSchemaCache
+from workers.autofill.replay import FIXTURES_DIR, ReplayRouter, load_manifest
+
+
+async def run(repeat: int, har_paths, executable: str = None, warm: bool = False, only: str = None):
+    fixtures = [f for f in load_manifest(FIXTURES_DIR) if not only or only in f.name]
+    router = ReplayRouter(fixtures, har_paths=har_paths)
+
+    service = ATSService()
+    service.pool = BrowserPool(
+        launch_options={"headless": True, "executable_path": executable, "args": ["--no-sandbox"]},
+        context_options=service._context_options(),
+        size=1,
+        context_setup=router.install,
+    )
+    service.schema_cache = FormSchemaCache(str(pathlib.Path(tempfile.mkdtemp()) / "form_schemas.db"))
+
+    resume = pathlib.Path(tempfile.mkdtemp()) / "resume.pdf"
+    resume.write_bytes(b"%PDF-1.4\n% benchmark resume\n")
+
+    rows = []
+    try:
+        for fixture in fixtures:
+            form_data = fixture.form_data_with(str(resume))
+            walls, result = [], {}
+            for _ in range(repeat):
+                if not warm:
+                    service.schema_cache.clear()
+                started = time.perf_counter()
+                result = await service.fill_application_form(fixture.url, form_data)
+                walls.append((time.perf_counter() - started) * 1000)
+
+            filled = len(result.get("filled_fields", []))
+            wall = statistics.median(walls)
+            rows.append({
+                "form": fixture.name,
+                "ats": result.get("ats_type", fixture.ats),
+                "wall_ms": round(wall, 1),
+                "per_field_ms": round(wall / filled, 1) if filled else None,
+                "fields_filled": filled,
+                "fields_requested": len(form_data),
+                "schema_cache": result.get("schema_cache"),
+                "phases": result.get("timings", {}).get("phases", {}),
+                "errors": result.get("errors", []),
+            })
+    finally:
+        await service.pool.stop()
+
+    return rows, router
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--har", action="append", default=[], help="HAR file to replay (repeatable)")
+    parser.add_argument("--executable", default=None, help="Chromium/Chrome binary to use")
+    parser.add_argument("--warm", action="store_true", help="Reuse learned form schemas across runs")
+    parser.add_argument("--only", default=None, help="Only forms whose name contains this")
+    parser.add_argument("--json", action="store_true", help="Print rows as JSON")
+    args = parser.parse_args()
+
+    rows, router = asyncio.run(run(args.repeat, args.har, args.executable, args.warm, args.only))
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"{'form':<18} {'ats':<11} {'wall ms':>9} {'ms/field':>9} {'filled':>8}  cache")
+    for row in rows:
+        per_field = f"{row['per_field_ms']:.1f}" if row["per_field_ms"] is not None else "-"
+        print(f"{row['form']:<18} {row['ats']:<11} {row['wall_ms']:>9.1f} {per_field:>9} "
+              f"{row['fields_filled']:>3}/{row['fields_requested']:<4}  {row['schema_cache']}")
+        for error in row["errors"]:
+            print(f"    ! {error}")
+    print(f"served {router.served} recorded pages, refused {len(router.missed)} other requests")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark LinkedIn job card extraction on the saved search results fixture.
+
+Compares the old per-element path (query_selector + inner_text for every field of
+every card) with the single page.evaluate used by LinkedInPlaywrightService.
+
+    python scripts/bench_linkedin_cards.py --cards 100 --repeat 5
+    python scripts/bench_linkedin_cards.py --executable /path/to/chrome
+"""
+import argparse
+import asyncio
+import pathlib
+import sys
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from playwright.async_api import async_playwright
+from apps.backend.services.linkedin_playwright import EXTRACT_CARDS_JS, LinkedInPlaywrightService
+
+FIXTURE = ROOT / "tests" / "fixtures" / "linkedin" / "job_search.html"
+
+
+async def extract_per_element(page, limit):
+    """The pre-bulk extraction loop, kept here as the baseline"""
+    cards = []
+    for job_element in (await page.query_selector_all('[data-job-id]'))[:limit]:
+        title_element = await job_element.query_selector('a[data-control-name="job_card_click"]')
+        company_element = await job_element.query_selector('.job-card-container__company-name')
+        location_element = await job_element.query_selector('.job-card-container__metadata-item')
+        cards.append({
+            "title": await title_element.inner_text() if title_element else "N/A",
+            "company": await company_element.inner_text() if company_element else "N/A",
+            "location": await location_element.inner_text() if location_element else "N/A",
+            "href": await title_element.get_attribute('href') if title_element else "",
+        })
+    return cards
+
+
+async def extract_bulk(page, limit):
+    return await page.evaluate(EXTRACT_CARDS_JS, {"limit": limit, "idleMs": 2000, "maxRounds": 20})
+
+
+async def load_fixture(browser, cards):
+    page = await browser.new_page()
+    await page.set_content(FIXTURE.read_text().replace('data-total="100"', f'data-total="{cards}"'))
+    return page
+
+
+async def run(cards: int, repeat: int, executable: str = None):
+    service = LinkedInPlaywrightService()
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, executable_path=executable)
+
+        # Scroll everything in first, so only extraction is timed
+        old_times, bulk_times = [], []
+        for _ in range(repeat):
+            page = await load_fixture(browser, cards)
+            await extract_bulk(page, cards)
+            started = time.perf_counter()
+            extracted = await extract_per_element(page, cards)
+            old_times.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            await extract_bulk(page, cards)
+            bulk_times.append(time.perf_counter() - started)
+            await page.close()
+
+        # End to end, including the infinite-scroll loading
+        new_times = []
+        for _ in range(repeat):
+            page = await load_fixture(browser, cards)
+            started = time.perf_counter()
+            jobs = service.cards_to_jobs(await extract_bulk(page, cards))
+            new_times.append(time.perf_counter() - started)
+            await page.close()
+
+        await browser.close()
+
+    old, bulk, new = min(old_times), min(bulk_times), min(new_times)
+    print(f"cards: {len(extracted)} per-element / {len(jobs)} bulk (best of {repeat})")
+    print(f"per-element:       {old * 1000:8.1f} ms  {len(extracted) / old:8.1f} cards/sec  "
+          f"~{1 + 7 * len(extracted)} round trips")
+    print(f"bulk:              {bulk * 1000:8.1f} ms  {len(extracted) / bulk:8.1f} cards/sec  1 round trip")
+    print(f"bulk + scrolling:  {new * 1000:8.1f} ms  {len(jobs) / new:8.1f} cards/sec  1 round trip")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cards", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--executable", default=None, help="Chromium/Chrome binary to use")
+    args = parser.parse_args()
+    asyncio.run(run(args.cards, args.repeat, args.executable))
+
+
+if __name__ == "__main__":
+    main()
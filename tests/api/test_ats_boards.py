@@ -0,0 +1,142 @@
+import asyncio
+import hashlib
+import json
+import pathlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from datetime import datetime
+from fastapi.testclient import TestClient
+from apps.backend import storage
+from apps.backend.main import app
+from apps.backend.api.sources import Site, sites_db
+from apps.backend.services.ats_board_service import (
+    ATSBoardService, AshbyBoard, GreenhouseBoard, LeverBoard
+)
+from workers.autofill.ats_detector import ATSType
+
+FIXTURES = pathlib.Path(__file__).parent.parent / "fixtures" / "ats_boards"
+
+# Stand-in for the public board APIs: request path -> recorded payload
+ROUTES = {
+    "/v1/boards/acme/jobs": "greenhouse_acme.json",
+    "/v0/postings/acme": "lever_acme.json",
+    "/posting-api/job-board/acme": "ashby_acme.json",
+}
+
+
+class BoardHandler(BaseHTTPRequestHandler):
+    payloads = {}
+    hits = []
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        BoardHandler.hits.append(path)
+        body = BoardHandler.payloads.get(path)
+        if body is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def isolated_storage(tmp_path, monkeypatch):
+    """board_sync.json goes to a tmp dir instead of data/storage"""
+    monkeypatch.setattr(storage, "STORAGE_DIR", tmp_path)
+
+
+@pytest.fixture
+def board_server():
+    BoardHandler.payloads = {path: (FIXTURES / name).read_bytes() for path, name in ROUTES.items()}
+    BoardHandler.hits = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), BoardHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def make_service(base_url):
+    service = ATSBoardService(adapters={
+        ATSType.GREENHOUSE: GreenhouseBoard(base_url),
+        ATSType.LEVER: LeverBoard(base_url),
+        ATSType.ASHBY: AshbyBoard(base_url),
+    })
+    service.sync_state = {}
+    return service
+
+
+def test_board_from_url():
+    """Board URLs recognized by ATSDetector resolve to an adapter and token"""
+    service = ATSBoardService()
+    assert service.board_from_url("https://boards.greenhouse.io/acme") == (ATSType.GREENHOUSE, "acme")
+    assert service.board_from_url("https://jobs.lever.co/acme/abc-123") == (ATSType.LEVER, "acme")
+    assert service.board_from_url("https://jobs.ashbyhq.com/acme") == (ATSType.ASHBY, "acme")
+    assert service.board_from_url("https://example.com/careers") is None
+
+
+@pytest.mark.parametrize("ats_type,expected_roles", [
+    (ATSType.GREENHOUSE, {"Senior Product Manager, Payments", "Technical Program Manager"}),
+    (ATSType.LEVER, {"Product Owner, Data Platform"}),
+    (ATSType.ASHBY, {"Group Product Manager"}),
+])
+def test_sync_normalizes_postings_into_jobs(board_server, ats_type, expected_roles):
+    """Each board is listed with one HTTP request and normalized into Job models"""
+    service = make_service(board_server)
+    result = asyncio.run(service.sync_board(ats_type, "acme", company="Acme"))
+
+    assert {job.role for job in result["new"]} == expected_roles
+    for job in result["new"]:
+        assert job.company == "Acme"
+        assert job.status == "new"
+        assert job.job_id.startswith(f"{ats_type.value}_acme_")
+        assert job.jd_url.startswith("https://")
+    assert len(BoardHandler.hits) == 1
+
+
+def test_incremental_sync(board_server):
+    """Unchanged boards return 304; edits and removals are reported as diffs"""
+    service = make_service(board_server)
+    first = asyncio.run(service.sync_board(ATSType.GREENHOUSE, "acme"))
+    assert len(first["new"]) == 2
+
+    second = asyncio.run(service.sync_board(ATSType.GREENHOUSE, "acme"))
+    assert second["not_modified"] is True
+
+    payload = json.loads(BoardHandler.payloads["/v1/boards/acme/jobs"])
+    payload["jobs"][0]["updated_at"] = "2025-01-20T09:00:00-05:00"
+    del payload["jobs"][1]
+    BoardHandler.payloads["/v1/boards/acme/jobs"] = json.dumps(payload).encode()
+
+    third = asyncio.run(service.sync_board(ATSType.GREENHOUSE, "acme"))
+    assert third["new"] == []
+    assert [job.job_id for job in third["updated"]] == ["greenhouse_acme_4012345"]
+    assert third["removed"] == ["greenhouse_acme_4012399"]
+
+
+def test_sync_site_rejects_an_unknown_track(monkeypatch):
+    """A bad track is a client error, not a failed board sync"""
+    now = datetime.utcnow()
+    monkeypatch.setitem(sites_db, "site_tracks", Site(
+        id="site_tracks", name="Acme", type="ats", url="https://boards.greenhouse.io/acme",
+        created_at=now, updated_at=now,
+    ))
+    response = TestClient(app).post("/sites/site_tracks/sync", params={"track": "CEO"})
+    assert response.status_code == 422
@@ -0,0 +1,22 @@
+from fastapi.testclient import TestClient
+from apps.backend.main import app
+
+client = TestClient(app)
+
+def test_detect_classifies_a_batch_of_urls():
+    urls = [
+        "https://boards.greenhouse.io/acme/jobs/1",
+        "https://jobs.lever.co/acme/2",
+        "https://www.linkedin.com/jobs/view/3",
+        "https://jobs.lever.co/globex/4",
+    ]
+    response = client.post("/ats/detect", json={"urls": urls})
+    assert response.status_code == 200
+    body = response.json()
+    assert [r["ats_type"] for r in body["results"]] == ["greenhouse", "lever", "unknown", "lever"]
+    assert body["counts"] == {"greenhouse": 1, "lever": 2, "unknown": 1}
+
+def test_detect_rejects_oversized_batches(monkeypatch):
+    import apps.backend.api.ats as ats_api
+    monkeypatch.setattr(ats_api, "MAX_DETECT_URLS", 2)
+    assert client.post("/ats/detect", json={"urls": ["a", "b", "c"]}).status_code == 400
@@ -0,0 +1,195 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from apps.backend.services.ats_service import ATSService
+from apps.backend.services.form_schema_cache import FormSchemaCache
+from apps.backend.services.page_profile import LOAD_EVENT_JS
+from workers.autofill.form_fields import CACHED_FILL_JS, DISCOVER_FIELDS_JS, FILL_FIELDS_JS
+
+FORM = [
+    {"selector": f'[data-autofill-idx="{i}"]', "stable": f'input[name="{name}"]', "tag": "input",
+     "type": kind, "name": name, "id": "", "label": "", "placeholder": "", "aria_label": "", "autocomplete": ""}
+    for i, (name, kind) in enumerate([
+        ("first_name", "text"), ("last_name", "text"), ("email", "email"), ("phone", "tel"),
+        ("linkedin", "url"), ("website", "url"), ("city", "text"), ("resume", "file"),
+    ])
+]
+
+
+class FakePage:
+    """Records driver round trips; evaluate answers the discovery and fill scripts"""
+
+    def __init__(self, fingerprint="f00d"):
+        self.fingerprint = fingerprint
+        self.calls = []
+        self.uploads = []
+
+    async def route(self, pattern, handler):
+        self.calls.append("route")
+
+    def on(self, event, callback):
+        pass
+
+    async def goto(self, url, **kwargs):
+        assert kwargs.get("wait_until") != "networkidle"
+        self.calls.append("goto")
+
+    async def wait_for_selector(self, selector, **kwargs):
+        self.calls.append("wait_for_selector")
+
+    async def evaluate(self, script, arg=None):
+        if script == LOAD_EVENT_JS:
+            self.calls.append("load_event")
+            return 1800.0
+        self.calls.append("evaluate")
+        if script == DISCOVER_FIELDS_JS:
+            known = {key: i for i, field in enumerate(FORM) for key in arg if field["name"] == key}
+            return {"fields": FORM, "known": known, "fingerprint": self.fingerprint}
+        if script == CACHED_FILL_JS:
+            if arg["fingerprint"] != self.fingerprint:
+                return {"stale": True, "errors": {}, "timings": {}}
+            arg = arg["items"]
+        else:
+            assert script == FILL_FIELDS_JS
+        self.filled = {item["key"]: item["value"] for item in arg}
+        outcome = {"errors": {}, "timings": {item["key"]: 0.4 for item in arg}}
+        return outcome if script == FILL_FIELDS_JS else {"stale": False, **outcome}
+
+    async def set_input_files(self, selector, path):
+        self.calls.append("set_input_files")
+        self.uploads.append((selector, path))
+
+    async def screenshot(self, path):
+        self.calls.append("screenshot")
+
+
+class FakeTracing:
+    def __init__(self):
+        self.started = 0
+        self.saved = []
+
+    async def start(self, **options):
+        self.started += 1
+
+    async def stop(self, path=None):
+        if path:
+            self.saved.append(path)
+
+
+class FakePool:
+    def __init__(self, page):
+        self.page = page
+        self.tracing = FakeTracing()
+
+    @asynccontextmanager
+    async def context(self):
+        page, tracing = self.page, self.tracing
+
+        class Context:
+            async def new_page(self):
+                return page
+
+        context = Context()
+        context.tracing = tracing
+        yield context
+
+
+def make_service(page, tmp_path):
+    service = ATSService()
+    service.pool = FakePool(page)
+    service.schema_cache = FormSchemaCache(str(tmp_path / "form_schemas.db"))
+    service.trace_slow_runs = False
+    return service
+
+
+def test_fill_uses_constant_round_trips_regardless_of_field_count(tmp_path):
+    """Discovery and filling are one evaluate each; misses cost nothing extra"""
+    resume = tmp_path / "cv.pdf"
+    resume.write_bytes(b"%PDF-1.4")
+    page = FakePage()
+    service = make_service(page, tmp_path)
+
+    form_data = {"first_name": "Ada", "last_name": "Lovelace", "email": "a@b.co", "phone": "555",
+                 "linkedin": "https://linkedin.com/in/ada", "city": "London", "resume": str(resume),
+                 "visa_status": "citizen"}
+    result = asyncio.run(service.fill_application_form("https://boards.greenhouse.io/acme/jobs/1", form_data))
+
+    assert page.calls.count("evaluate") == 2
+    assert set(page.filled) == {"first_name", "last_name", "email", "phone", "linkedin", "city"}
+    assert page.uploads == [('[data-autofill-idx="7"]', str(resume))]
+    assert result["errors"] == ["Could not find field: visa_status"]
+    assert result["ats_type"] == "greenhouse" and result["fields_discovered"] == len(FORM)
+
+
+def test_schema_cache_skips_discovery_until_the_form_changes(tmp_path):
+    """Second visit to the same board fills from cache; a redesigned form is relearned"""
+    url = "https://boards.greenhouse.io/acme/jobs/{}"
+    form_data = {"first_name": "Ada", "email": "a@b.co", "visa_status": "citizen"}
+    page = FakePage()
+    service = make_service(page, tmp_path)
+
+    first = asyncio.run(service.fill_application_form(url.format(1), form_data))
+    assert first["schema_cache"] == "miss" and first["fields_discovered"] == len(FORM)
+
+    page.calls.clear()
+    second = asyncio.run(service.fill_application_form(url.format(2), form_data))
+    assert second["schema_cache"] == "hit" and page.calls.count("evaluate") == 1
+    assert second["filled_fields"] == ["first_name", "email"]
+    assert second["errors"] == ["Could not find field: visa_status"]
+
+    page.fingerprint = "beef"
+    third = asyncio.run(service.fill_application_form(url.format(3), form_data))
+    assert third["schema_cache"] == "miss" and third["fields_discovered"] == len(FORM)
+
+    stats = service.schema_cache.stats()
+    assert (stats["hits"], stats["misses"], stats["stale"]) == (1, 1, 1)
+    assert stats["by_form"]["greenhouse:boards.greenhouse.io/acme"]["fields"] == 2
+
+
+def test_result_reports_per_phase_and_per_field_timings(tmp_path):
+    resume = tmp_path / "cv.pdf"
+    resume.write_bytes(b"%PDF-1.4")
+    service = make_service(FakePage(), tmp_path)
+
+    result = asyncio.run(service.fill_application_form(
+        "https://boards.greenhouse.io/acme/jobs/1", {"first_name": "Ada", "email": "a@b.co", "resume": str(resume)}
+    ))
+
+    timings = result["timings"]
+    assert {"acquire", "navigation", "discovery", "fill", "upload", "screenshot"} <= set(timings["phases"])
+    assert timings["fields"]["first_name"] == 0.4 and "resume" in timings["fields"]
+    assert timings["total_ms"] >= sum(timings["phases"].values()) - 1
+    assert result["trace_path"] is None
+
+
+def test_trace_is_kept_only_for_runs_over_the_threshold(tmp_path):
+    page = FakePage()
+    service = make_service(page, tmp_path)
+    service.trace_slow_runs, service.trace_dir = True, str(tmp_path)
+    url = "https://jobs.lever.co/acme/123"
+
+    service.trace_threshold_ms = 60000
+    fast = asyncio.run(service.fill_application_form(url, {"first_name": "Ada"}))
+    assert fast["trace_path"] is None
+
+    service.trace_threshold_ms = 0
+    slow = asyncio.run(service.fill_application_form(url, {"first_name": "Ada"}))
+    assert slow["trace_path"].startswith(str(tmp_path / "ats_jobs_lever_co_"))
+    assert service.pool.tracing.started == 2 and service.pool.tracing.saved == [slow["trace_path"]]
+
+
+def test_schema_caches_sharing_a_path_keep_each_others_entries(tmp_path):
+    """The backend and the autofill worker each hold a cache; neither overwrites the other"""
+    backend = FormSchemaCache(str(tmp_path / "form_schemas.db"))
+    worker = FormSchemaCache(backend.path)
+    field = {"stable": "#first_name", "type": "text"}
+
+    backend.learn("greenhouse:boards.greenhouse.io/acme", "f1", {"first_name": field}, [])
+    worker.learn("lever:jobs.lever.co/acme", "f2", {"first_name": field}, ["visa_status"])
+    backend.record("greenhouse:boards.greenhouse.io/acme", "hit")
+    worker.record("lever:jobs.lever.co/acme", "miss")
+
+    stats = FormSchemaCache(backend.path).stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (2, 1, 1)
+    assert worker.plan("greenhouse:boards.greenhouse.io/acme", {"first_name": "Ada"})["fields"] == {
+        "first_name": {"selector": "#first_name", "type": "text"}}
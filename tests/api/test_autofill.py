@@ -0,0 +1,31 @@
+from fastapi.testclient import TestClient
+from apps.backend.main import app
+from apps.backend.api.jobs import jobs_db
+
+client = TestClient(app)
+
+def test_autofill_run_queues_a_pollable_task():
+    """POST /autofill/run returns immediately with a queued task the UI can poll"""
+    response = client.post("/autofill/run", json={
+        "job_id": "autofill_job_001",
+        "url": "https://boards.greenhouse.io/acme/jobs/42",
+        "form_data": {"first_name": "Ada"}
+    })
+    assert response.status_code == 200
+    task = response.json()
+    assert task["status"] == "queued" and task["attempts"] == 0
+
+    polled = client.get(f"/autofill/tasks/{task['id']}").json()
+    assert polled["id"] == task["id"] and polled["url"].endswith("/jobs/42")
+    assert client.get("/autofill/tasks/missing").status_code == 404
+
+def test_autofill_run_skips_closed_and_duplicate_jobs():
+    """No browser time is spent on closed postings or flagged duplicates"""
+    jobs_db["autofill_closed"] = {"job_id": "autofill_closed", "status": "closed"}
+    jobs_db["autofill_dupe"] = {"job_id": "autofill_dupe", "status": "new", "duplicate_of": "orig"}
+    try:
+        url = "https://jobs.lever.co/acme/1"
+        assert client.post("/autofill/run", json={"job_id": "autofill_closed", "url": url}).status_code == 400
+        assert client.post("/autofill/run", json={"job_id": "autofill_dupe", "url": url}).status_code == 409
+    finally:
+        del jobs_db["autofill_closed"], jobs_db["autofill_dupe"]
@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+from apps.backend.services.browser_pool import BrowserPool
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+
+    async def close(self):
+        self.context.pages.remove(self)
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+        self.closed = False
+
+    async def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    async def cookies(self):
+        if self.closed:
+            raise RuntimeError("context closed")
+        return []
+
+    async def clear_cookies(self):
+        pass
+
+    async def new_cdp_session(self, page):
+        raise RuntimeError("no CDP in fakes")
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **options):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.connected = False
+
+
+class FakeChromium:
+    def __init__(self):
+        self.launches = 0
+
+    async def launch(self, **options):
+        self.launches += 1
+        return FakeBrowser()
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.chromium = FakeChromium()
+        self.stopped = False
+
+    async def stop(self):
+        self.stopped = True
+
+
+def make_pool(**kwargs):
+    driver = FakePlaywright()
+
+    async def factory():
+        return driver
+
+    return BrowserPool({}, {}, driver_factory=factory, **kwargs), driver
+
+
+def test_pool_reuses_one_browser_and_context():
+    """Repeated checkouts share one driver, one browser and warm contexts"""
+    pool, driver = make_pool(size=1)
+
+    async def scenario():
+        seen = []
+        for _ in range(5):
+            async with pool.context() as context:
+                await context.new_page()
+                seen.append(context)
+        return seen
+
+    seen = asyncio.run(scenario())
+    assert driver.chromium.launches == 1
+    assert all(context is seen[0] for context in seen)
+    assert seen[0].pages == []
+
+
+def test_pool_recycles_after_max_uses_and_unhealthy_contexts():
+    """Contexts are replaced after N uses or when they stop responding"""
+    pool, driver = make_pool(size=1, max_uses=2)
+
+    async def scenario():
+        contexts = []
+        for _ in range(3):
+            async with pool.context() as context:
+                contexts.append(context)
+        contexts[-1].closed = True
+        async with pool.context() as context:
+            contexts.append(context)
+        return contexts
+
+    first, second, third, fourth = asyncio.run(scenario())
+    assert first is second
+    assert third is not second and second.closed
+    assert fourth is not third
+    assert pool.stats()["recycled"] == 2
+
+
+def test_pool_stop_closes_browser_and_driver():
+    """Shutdown closes the browser and stops the Playwright driver it started"""
+    pool, driver = make_pool(size=2)
+
+    async def scenario():
+        async with pool.context():
+            pass
+        await pool.stop()
+
+    asyncio.run(scenario())
+    assert driver.stopped
+    assert not pool.started
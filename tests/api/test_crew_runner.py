@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+from apps.backend.services.crew_runner import Crew
+from apps.backend.services.llm_gateway import FakeLLM, LLMGateway
+from apps.backend.services.result_cache import ResultCache
+
+INPUTS = {"resume_text": "Led A/B testing in Amplitude", "jd_text": "Senior PM: A/B testing, SQL"}
+
+
+@pytest.fixture
+def gateway(tmp_path):
+    def make(backend):
+        return LLMGateway(backend, cache=ResultCache(str(tmp_path / f"llm_{id(backend)}.db")))
+    return make
+
+
+def overlaps(a, b):
+    return a.started_ms < b.started_ms + b.latency_ms and b.started_ms < a.started_ms + a.latency_ms
+
+
+def test_load_builds_the_dag_and_system_prompts():
+    crew = Crew.load()
+    assert crew.process == "dag" and set(crew.agents) == {"jd_matcher", "apply_pack", "outreach_planner", "day_summarizer"}
+    assert crew.tasks["plan_outreach"].upstream == ["match_and_apply"]
+    assert crew.order.index("match_and_apply") < crew.order.index("assemble_apply_pack")
+    assert "Do not invent projects" in crew.system_prompt(crew.agents["jd_matcher"])
+
+
+def test_independent_tasks_run_concurrently_and_receive_upstream_output(gateway):
+    crew = Crew.load()
+    llm = FakeLLM(delay=0.05)
+    run = asyncio.run(crew.run(gateway(llm), INPUTS))
+
+    assert run.ok and len(llm.calls) == 4
+    tasks = run.tasks
+    assert overlaps(tasks["match_and_apply"], tasks["daily_summary"])
+    assert overlaps(tasks["assemble_apply_pack"], tasks["plan_outreach"])
+    assert not overlaps(tasks["plan_outreach"], tasks["match_and_apply"])
+    assert run.latency_ms < run.to_dict()["serial_ms"]
+
+    pack_prompt = next(call["prompt"] for call in llm.calls if call["prompt"].startswith("Task: Render final"))
+    assert tasks["match_and_apply"].output in pack_prompt and INPUTS["jd_text"] in pack_prompt
+    assert asyncio.run(crew.run(gateway(FakeLLM()), INPUTS)).outputs == run.outputs
+
+
+def test_concurrency_cap_of_one_serializes_tasks(gateway):
+    run = asyncio.run(Crew.load().run(gateway(FakeLLM(delay=0.02)), INPUTS, max_concurrency=1))
+    runs = list(run.tasks.values())
+    assert not any(overlaps(a, b) for i, a in enumerate(runs) for b in runs[i + 1:])
+
+
+def test_failed_task_skips_only_its_downstream(gateway):
+    class FailingLLM(FakeLLM):
+        async def complete(self, model, system, prompt, **params):
+            if prompt.startswith("Task: Given resume+JD"):
+                raise RuntimeError("rate limited")
+            return await super().complete(model, system, prompt, **params)
+
+    run = asyncio.run(Crew.load().run(gateway(FailingLLM()), INPUTS))
+    statuses = {task_id: task.status for task_id, task in run.tasks.items()}
+    assert statuses == {"match_and_apply": "failed", "daily_summary": "ok",
+                        "assemble_apply_pack": "skipped", "plan_outreach": "skipped"}
+    assert run.tasks["match_and_apply"].error == "RuntimeError: rate limited"
+
+
+def test_invalid_crews_are_rejected(tmp_path):
+    crew_yaml = tmp_path / "crew.yaml"
+    crew_yaml.write_text(
+        "agents:\n  - {id: a, role: A, goal: g, llm: fake}\n"
+        "tasks:\n  - {id: one, agent: a, next: [two]}\n  - {id: two, agent: a, next: [one]}\n"
+    )
+    with pytest.raises(ValueError, match="cycle"):
+        Crew.load(crew_yaml)
+    crew_yaml.write_text("agents: []\ntasks:\n  - {id: one, agent: missing}\n")
+    with pytest.raises(ValueError, match="unknown agent"):
+        Crew.load(crew_yaml)
@@ -0,0 +1,154 @@
+import asyncio
+import email
+import email.policy
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from apps.backend.services.ats_service import ATSService
+from workers.autofill.replay import FIXTURES_DIR, load_manifest
+
+FORMS = {fixture.name: fixture for fixture in load_manifest()}
+CAPTCHA = '<div class="g-recaptcha" data-sitekey="6Lc-acme"></div>\n    <input type="submit"'
+SPA = """<!DOCTYPE html><html><body><div id="root"></div>
+<script src="https://boards.cdn.greenhouse.io/embed/job_app.js"></script></body></html>"""
+
+
+class FormHandler(BaseHTTPRequestHandler):
+    """Stand-in ATS: serves recorded application pages and records what gets POSTed"""
+
+    pages = {}
+    posts = []
+
+    def _send(self, status, body=b"", location=None):
+        self.send_response(status)
+        if location:
+            self.send_header("Location", location)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.endswith("/confirmation"):
+            self._send(200, b"<h1>Thank you for applying</h1>")
+            return
+        page = FormHandler.pages.get(self.path)
+        self._send(200 if page else 404, (page or "").encode())
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        FormHandler.posts.append((self.path, self.headers["Content-Type"], body))
+        self._send(302, location=self.path.rstrip("/") + "/confirmation")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def form_server():
+    greenhouse = FORMS["greenhouse_acme"].path.read_text()
+    FormHandler.pages = {
+        "/acme/jobs/4012345": greenhouse,
+        "/acme/7f3c2a10/apply": FORMS["lever_acme"].path.read_text(),
+        "/captcha/jobs/1": greenhouse.replace('<input type="submit"', CAPTCHA),
+        "/spa/jobs/1": SPA,
+    }
+    FormHandler.posts = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FormHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def make_service():
+    service = ATSService()
+    service.browser_runs = []
+
+    async def fake_fill(job_url, form_data):
+        service.browser_runs.append(job_url)
+        return {"success": True, "filled_fields": list(form_data), "errors": []}
+
+    service.fill_application_form = fake_fill
+    return service
+
+
+def parse_multipart(content_type, body):
+    message = email.message_from_bytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + body, policy=email.policy.HTTP
+    )
+    fields, files = {}, {}
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        if part.get_filename():
+            files[name] = (part.get_filename(), part.get_content())
+        else:
+            fields[name] = part.get_content()
+    return fields, files
+
+
+def test_greenhouse_form_is_posted_without_a_browser(form_server, tmp_path):
+    resume = tmp_path / "ada_resume.pdf"
+    resume.write_bytes(b"%PDF-1.4 ada")
+    service = make_service()
+    form_data = FORMS["greenhouse_acme"].form_data_with(str(resume))
+
+    result = asyncio.run(service.submit_application(f"{form_server}/acme/jobs/4012345", form_data))
+
+    assert result["method"] == "http" and result["submitted"] and result["success"]
+    assert result["ats_type"] == "greenhouse" and result["confirmation_url"].endswith("/confirmation")
+    assert set(result["filled_fields"]) == set(form_data)
+    assert service.browser_runs == []
+
+    path, content_type, body = FormHandler.posts[0]
+    fields, files = parse_multipart(content_type, body)
+    assert path == "/acme/jobs/4012345" and content_type.startswith("multipart/form-data")
+    assert fields["authenticity_token"] == "dGVzdA=="
+    assert fields["job_application[first_name]"] == "Ada"
+    assert fields["job_application[cover_letter_text]"] == "I build analytical engines."
+    assert fields["job_application[answers_attributes][0][text_value]"] == "https://linkedin.com/in/ada"
+    assert fields["job_application[answers_attributes][1][boolean_value]"] == ""
+    assert files["job_application[resume]"] == ("ada_resume.pdf", b"%PDF-1.4 ada")
+
+
+def test_lever_form_posts_back_to_its_own_url_using_the_ats_mappings(form_server, tmp_path):
+    resume = tmp_path / "resume.pdf"
+    resume.write_bytes(b"%PDF-1.4")
+    service = make_service()
+
+    result = asyncio.run(service.submit_application(
+        f"{form_server}/acme/7f3c2a10/apply", FORMS["lever_acme"].form_data_with(str(resume))
+    ))
+
+    assert result["submitted"] and result["ats_type"] == "lever"
+    path, content_type, body = FormHandler.posts[0]
+    fields, files = parse_multipart(content_type, body)
+    assert path == "/acme/7f3c2a10/apply"
+    # ATSDetector maps first_name to Lever's single full-name input
+    assert fields["name"] == "Ada Lovelace" and fields["urls[LinkedIn]"] == "https://linkedin.com/in/ada"
+    assert fields["accountId"] == "a1b2c3" and "resume" in files
+
+
+def test_missing_required_field_is_not_submitted(form_server):
+    service = make_service()
+    result = asyncio.run(service.submit_application(
+        f"{form_server}/acme/7f3c2a10/apply", {"phone": "+1 555 0100"}
+    ))
+
+    assert not result["submitted"] and result["method"] == "http"
+    assert "Required field not filled: Full name" in result["errors"]
+    assert FormHandler.posts == [] and service.browser_runs == []
+
+
+@pytest.mark.parametrize("path, reason", [
+    ("/captcha/jobs/1", "captcha"),
+    ("/spa/jobs/1", "form is rendered by JavaScript"),
+])
+def test_forms_needing_a_browser_fall_back_to_playwright(form_server, path, reason):
+    service = make_service()
+    result = asyncio.run(service.submit_application(f"{form_server}{path}", {"first_name": "Ada"}))
+
+    assert result["method"] == "browser" and result["fallback_reason"] == reason
+    assert not result["submitted"] and service.browser_runs == [f"{form_server}{path}"]
+    assert FormHandler.posts == []
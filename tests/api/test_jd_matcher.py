@@ -0,0 +1,148 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+from apps.backend.main import app
+from apps.backend.services.jd_matcher import JDMatcher, resume_sections, tokenize
+
+client = TestClient(app)
+
+JDS = [
+    "Senior Product Manager. Own A/B testing, SQL window functions, Amplitude and GA4 dashboards "
+    "for our marketplace. Experience with experimentation and product analytics required.",
+    "Backend engineer: Python, FastAPI, PostgreSQL, Kubernetes. CI/CD pipelines.",
+    "Data analyst: SQL, Tableau, stakeholder communication, dashboards.",
+]
+
+RESUME = """Summary
+Product manager with analytics background
+Experience
+Led A/B testing program across marketplace checkout, lifting conversion 4%
+Built SQL dashboards in Amplitude for product analytics
+Skills
+SQL, Python, Tableau
+Education
+BS Computer Science"""
+
+
+@pytest.fixture
+def matcher():
+    return JDMatcher().fit(JDS)
+
+
+def test_tokenizer_keeps_technical_tokens_and_breaks_runs_at_punctuation():
+    runs = tokenize("<p>Run A/B testing &amp; C++, Node.js and the CI/CD pipelines.</p>")
+    assert [[term for term, _ in run] for run in runs] == [["run", "ab", "test"], ["c++"], ["node.js"], ["ci/cd", "pipeline"]]
+
+
+def test_resume_sections_follow_header_lines():
+    assert [section for section, _ in resume_sections(RESUME)] == ["summary", "experience", "skills", "education"]
+
+
+def test_best_matching_jd_scores_highest(matcher):
+    scores = [matcher.score(RESUME, jd).score for jd in JDS]
+    assert scores[0] > scores[2] > scores[1]
+    assert all(0 < score < 1 for score in scores)
+
+
+def test_contributions_explain_the_raw_score(matcher):
+    result = matcher.score(RESUME, JDS[0], top_k=1000)
+    assert sum(c["contribution"] for c in result.contributions) == pytest.approx(result.raw_score, abs=1e-3)
+    assert {"product", "ab testing", "amplitude"} <= {c["term"] for c in result.contributions}
+    assert "window functions" in result.missing and "ab testing" not in result.missing
+
+
+def test_experience_mentions_outweigh_keyword_lists(matcher):
+    jd = "Kubernetes and Terraform for our platform."
+    in_experience = matcher.score("Experience\nRan Kubernetes and Terraform in production", jd)
+    in_skills = matcher.score("Skills\nKubernetes, Terraform", jd)
+    assert in_experience.raw_score > in_skills.raw_score > 0
+
+
+def test_only_ingested_jds_grow_the_vocabulary(matcher):
+    size = len(matcher.vocabulary)
+    result = matcher.score("Experience\nShipped Zanzibar-style authz", "Need zanzibar-style authz experience")
+    ranked, _ = matcher.score_many("Experience\nShipped Zanzibar-style authz", [(0, "Zanzibar-style authz.")])
+    matcher.resume_vector("Skills\nCOBOL, Fortran")
+    assert len(matcher.vocabulary) == size
+    assert "zanzibar-style" in {c["term"] for c in result.contributions} and ranked[0][2] > 0.9
+
+
+def test_concurrent_ingestion_assigns_each_term_one_id():
+    matcher = JDMatcher()
+    texts = [f"skill{i % 50} tool{i % 7} shared" for i in range(400)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(matcher.observe, texts))
+    vocabulary = matcher.vocabulary
+    assert len(vocabulary) == len(set(vocabulary.terms)) == len(vocabulary.ids)
+    assert all(vocabulary.terms[term_id] == term for term, term_id in vocabulary.ids.items())
+    assert vocabulary.documents == len(set(texts))
+
+
+def test_calibration_refits_towards_observed_outcomes(matcher):
+    slope, _ = matcher.calibrate([0.1, 0.2, 0.3, 0.5, 0.6, 0.7], [0, 0, 1, 0, 1, 1])
+    assert slope > 0
+    assert matcher.calibrated(0.7) > matcher.calibrated(0.1)
+
+
+def test_scoring_a_pair_takes_single_digit_milliseconds(matcher):
+    started = time.perf_counter()
+    for _ in range(200):
+        matcher.score(RESUME, JDS[0])
+    assert (time.perf_counter() - started) / 200 < 0.01
+
+
+def test_match_endpoint_returns_local_score_and_contributions():
+    response = client.post("/match", json={
+        "resume_text": RESUME, "jd_text": JDS[0], "target_role": "Product Manager", "seniority": "senior",
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert 0 < body["match_score"] < 1 and body["match_score"] != 0.62
+    assert body["term_contributions"] and body["latency_ms"] < 10
+    assert body["missing_skills"] == ["SQL window functions", "Google Analytics 4", "Experimentation"]
+
+
+def test_batch_scores_agree_with_pairwise_scores_across_chunks(matcher):
+    jds = [(i, jd) for i, jd in enumerate(JDS * 5)]
+    ranked, scored = matcher.score_many(RESUME, jds, top_k=4, chunk_size=3)
+    assert scored == 15 and len(ranked) == 4
+    assert [raw for _, _, raw in ranked] == sorted((raw for _, _, raw in ranked), reverse=True)
+    assert {key % 3 for key, _, _ in ranked} == {0}
+    best = matcher.score(RESUME, JDS[0])
+    assert ranked[0][1:] == (best.score, best.raw_score)
+
+
+def test_match_batch_ranks_jobs_and_texts(monkeypatch):
+    from apps.backend.api.jobs import jobs_db, jd_vector_index
+    monkeypatch.setitem(jobs_db, "batch-pm", {"jd_text": JDS[0], "status": "saved"})
+    monkeypatch.setitem(jobs_db, "batch-empty", {"status": "saved"})
+    jd_vector_index.add("batch-pm", JDS[0])
+
+    try:
+        response = client.post("/match/batch", json={
+            "resume_text": RESUME, "job_ids": ["batch-pm", "batch-empty", "batch-unknown"], "jd_texts": JDS[1:], "top_k": 2,
+        })
+    finally:
+        jd_vector_index.remove("batch-pm")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["scored"] == 3 and body["skipped"] == ["batch-empty", "batch-unknown"]
+    assert [(r["job_id"], r["index"]) for r in body["results"]] == [("batch-pm", None), (None, 1)]
+
+
+def test_match_batch_reads_the_tracks_default_resume(monkeypatch, tmp_path):
+    from datetime import datetime
+    from apps.backend.api.resumes import Resume, resumes_db
+    tex = tmp_path / "pm.tex"
+    tex.write_text("\\section*{Experience}\n\\item Ran Kubernetes and Terraform in production\n")
+    now = datetime.utcnow()
+    monkeypatch.setitem(resumes_db, "batchtrack_v1", Resume(
+        id="batchtrack_v1", track="batchtrack", version="v1", is_default=True,
+        created_at=now, updated_at=now, file_path=str(tex),
+    ))
+
+    body = client.post("/match/batch", json={"track": "batchtrack", "jd_texts": JDS + ["Kubernetes, Terraform."]}).json()
+    assert body["results"][0]["index"] == 3 and body["results"][0]["raw_score"] > 0.9
+    assert client.post("/match/batch", json={"track": "nope", "jd_texts": JDS}).status_code == 404
@@ -0,0 +1,97 @@
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from apps.backend.main import app
+from apps.backend.api.resumes import Resume, resumes_db
+from apps.backend.services.jd_matcher import JDMatcher
+from apps.backend.services.jd_vectors import JDVectorIndex, jd_vector_index
+
+client = TestClient(app)
+
+JOBS = {
+    "pm": {"jd_text": "Product manager: A/B testing, SQL window functions, Amplitude dashboards, product analytics."},
+    "be": {"jd_text": "Backend engineer: Python, FastAPI, PostgreSQL, Kubernetes. CI/CD pipelines."},
+    "da": {"jd_text": "Data analyst: SQL, Tableau, stakeholder communication, dashboards."},
+    "no-jd": {"jd_url": "https://example.com/jobs/4"},
+}
+RESUME = "Experience\nLed A/B testing and product analytics with SQL dashboards in Amplitude\nSkills\nPython, Tableau"
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = JDVectorIndex(JDMatcher(), str(tmp_path / "jd_vectors.db"))
+    index.sync(JOBS)
+    return index
+
+
+def test_index_query_matches_scoring_the_texts_directly(index):
+    resume = index.matcher.resume_vector(RESUME)
+    texts = [(job_id, job["jd_text"]) for job_id, job in JOBS.items() if "jd_text" in job]
+    expected, _ = index.matcher.score_many(resume, texts, top_k=3)
+    assert index.query(resume, top_k=3) == expected
+    assert [job_id for job_id, _, _ in index.query(resume, top_k=5, candidates=["be", "da"])] == ["da", "be"]
+
+
+def test_reload_rebuilds_postings_without_tokenizing(index, monkeypatch):
+    before = index.query(index.matcher.resume_vector(RESUME))
+
+    reloaded = JDVectorIndex(JDMatcher(), index.path)
+    monkeypatch.setattr(reloaded.matcher, "jd_counts", lambda text: pytest.fail("JD re-tokenized"))
+    assert reloaded.sync(JOBS) == {"indexed": 3, "added": 0, "removed": 0}
+    assert reloaded.matcher.vocabulary.documents == 3
+    assert reloaded.query(reloaded.matcher.resume_vector(RESUME)) == before
+
+
+def test_sync_reindexes_edits_and_drops_removed_jobs(index):
+    jobs = {"pm": {"jd_text": "Kubernetes and Terraform platform work."}, "da": JOBS["da"]}
+    assert index.sync(jobs) == {"indexed": 2, "added": 1, "removed": 1}
+    resume = index.matcher.resume_vector("Experience\nRan Kubernetes and Terraform")
+    assert index.query(resume, top_k=1)[0][0] == "pm"
+    assert "be" not in index and len(JDVectorIndex(JDMatcher(), index.path)) == 2
+
+
+def test_track_vector_is_persisted_until_invalidated(index):
+    loads = []
+
+    def load_text():
+        loads.append(1)
+        return RESUME
+
+    first = index.track_vector("pm", "pm_v1", load_text)
+    assert index.track_vector("pm", "pm_v1", load_text) is first
+    reloaded = JDVectorIndex(JDMatcher(), index.path)
+    assert reloaded.query(reloaded.track_vector("pm", "pm_v1", load_text)) == index.query(first)
+    assert len(loads) == 1
+
+    index.track_vector("pm", "pm_v2", load_text)
+    index.invalidate_track("pm")
+    index.track_vector("pm", "pm_v2", load_text)
+    assert len(loads) == 3
+
+
+def test_track_vector_picks_up_terms_from_later_jds(index):
+    first = index.track_vector("pm", "pm_v1", lambda: "Experience\nRan Kubernetes and Terraform")
+    index.add("tf", "Terraform modules for the platform.")
+    assert index.query(index.track_vector("pm", "pm_v1", lambda: pytest.fail("resume re-read")), top_k=1)[0][0] == "tf"
+    assert index.query(first, top_k=1)[0][0] != "tf"
+
+
+def test_set_default_resume_refreshes_the_track_vector(monkeypatch, tmp_path):
+    now = datetime.utcnow()
+    for version, body in [("v1", "Ran Kubernetes and Terraform in production"), ("v2", "Led A/B testing in Amplitude")]:
+        tex = tmp_path / f"{version}.tex"
+        tex.write_text(f"\\section*{{Experience}}\n\\item {body}\n")
+        monkeypatch.setitem(resumes_db, f"vectrack_{version}", Resume(
+            id=f"vectrack_{version}", track="vectrack", version=version, is_default=version == "v1",
+            created_at=now, updated_at=now, file_path=str(tex),
+        ))
+    jds = ["Kubernetes, Terraform.", "A/B testing, Amplitude."]
+
+    first = client.post("/match/batch", json={"track": "vectrack", "jd_texts": jds}).json()
+    assert client.post("/resume/set-default", params={"resume_id": "vectrack_v2"}).status_code == 200
+    second = client.post("/match/batch", json={"track": "vectrack", "jd_texts": jds}).json()
+
+    assert first["results"][0]["index"] == 0 and second["results"][0]["index"] == 1
+    resume_id, vector, _, _ = jd_vector_index.track_vectors["vectrack"]
+    assert resume_id == "vectrack_v2" and vector is not None
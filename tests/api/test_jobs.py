@@ -1,9 +1,28 @@
 import pytest
 from fastapi.testclient import TestClient
+from apps.backend import storage
+from apps.backend.api import jobs as jobs_api
 from apps.backend.main import app
+from apps.backend.services.jd_matcher import JDMatcher
+from apps.backend.services.jd_vectors import JDVectorIndex
+from apps.backend.services.job_index import JobIndex
+from apps.backend.services.near_duplicates import NearDuplicateIndex
 
 client = TestClient(app)
 
+@pytest.fixture(autouse=True)
+def isolated_jobs(tmp_path, monkeypatch):
+    """Each test starts from an empty job store and fresh indexes; nothing reaches data/"""
+    monkeypatch.setattr(storage, "STORAGE_DIR", tmp_path)
+    saved = dict(jobs_api.jobs_db)
+    jobs_api.jobs_db.clear()
+    monkeypatch.setattr(jobs_api, "job_index", JobIndex())
+    monkeypatch.setattr(jobs_api, "jd_index", NearDuplicateIndex())
+    monkeypatch.setattr(jobs_api, "jd_vector_index", JDVectorIndex(JDMatcher(), str(tmp_path / "jd_vectors.db")))
+    yield
+    jobs_api.jobs_db.clear()
+    jobs_api.jobs_db.update(saved)
+
 def test_health_endpoint():
     """Test health check endpoint"""
     response = client.get("/health")
@@ -124,3 +143,75 @@ def test_job_deletion():
     # Verify job is deleted
     response = client.get("/jobs/test_job_004")
     assert response.status_code == 404
+
+def test_job_creation_flags_duplicate_posting():
+    """The same posting added under a different ID and URL is linked to the first job"""
+    job_data = {
+        "job_id": "test_job_dup_a",
+        "company": "Acme",
+        "role": "Senior PM",
+        "jd_url": "https://boards.greenhouse.io/acme/jobs/777001",
+        "track": "PM"
+    }
+    response = client.post("/jobs/add", json=job_data)
+    assert response.status_code == 200
+    assert response.json()["duplicate_of"] is None
+    
+    job_data["job_id"] = "test_job_dup_b"
+    job_data["jd_url"] = "https://job-boards.greenhouse.io/acme/jobs/777001/?gh_src=linkedin&utm_source=li"
+    response = client.post("/jobs/add", json=job_data)
+    assert response.status_code == 200
+    assert response.json()["duplicate_of"] == "test_job_dup_a"
+
+def test_deleting_the_owner_hands_the_posting_to_its_duplicate():
+    """Removing the first job keeps its reposts deduped under the oldest survivor"""
+    url = "https://boards.greenhouse.io/acme/jobs/777002"
+    for job_id in ("owner_a", "dup_b", "dup_c"):
+        client.post("/jobs/add", json={"job_id": job_id, "company": "Acme", "role": "PM",
+                                       "jd_url": url, "track": "PM"})
+    assert client.delete("/jobs/owner_a").status_code == 200
+
+    assert jobs_api.jobs_db["dup_b"]["duplicate_of"] is None
+    assert jobs_api.jobs_db["dup_c"]["duplicate_of"] == "dup_b"
+    response = client.post("/jobs/add", json={"job_id": "dup_d", "company": "Acme", "role": "PM",
+                                              "jd_url": url + "?gh_src=x", "track": "PM"})
+    assert response.json()["duplicate_of"] == "dup_b"
+
+def test_bulk_import_skips_duplicates():
+    """Bulk import adds new postings once and reports cross-source duplicates"""
+    jobs = [
+        {"job_id": "bulk_li_1", "company": "Acme", "role": "PM", "track": "PM",
+         "jd_url": "https://www.linkedin.com/jobs/view/senior-pm-at-acme-3900000001/?trk=public"},
+        {"job_id": "bulk_li_2", "company": "Acme", "role": "PM", "track": "PM",
+         "jd_url": "https://www.linkedin.com/jobs/search/?currentJobId=3900000001"},
+        {"job_id": "bulk_in_1", "company": "Acme", "role": "PM", "track": "PM",
+         "jd_url": "https://www.indeed.com/viewjob?jk=bulk001&from=serp"},
+    ]
+    response = client.post("/jobs/bulk", json=jobs)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["added"] == ["bulk_li_1", "bulk_in_1"]
+    assert data["duplicates"] == {"bulk_li_2": "bulk_li_1"}
+    
+    response = client.post("/jobs/bulk", json=jobs[:1])
+    assert response.json()["existing_ids"] == ["bulk_li_1"]
+
+def test_near_duplicate_jd_is_clustered():
+    """A repost with light edits under an unrelated URL is linked to the original job"""
+    jd = (
+        "We are hiring a Senior Product Manager to own the payments roadmap. You will partner "
+        "with engineering and design, run A/B tests, write SQL, and define success metrics with "
+        "Amplitude. Requirements: 5+ years of product management, experience with marketplaces, "
+        "strong communication. Benefits include health insurance and remote work."
+    )
+    original = {"job_id": "near_dup_a", "company": "Acme", "role": "Senior PM", "track": "PM",
+                "jd_url": "https://acme.com/careers/senior-pm", "jd_text": jd}
+    repost = {"job_id": "near_dup_b", "company": "Acme", "role": "Sr PM", "track": "PM",
+              "jd_url": "https://jobboard.example/postings/98765",
+              "jd_text": jd.replace("Senior", "Sr.").replace("Benefits include", "We offer")}
+    
+    response = client.post("/jobs/add", json=original)
+    assert response.json()["duplicate_of"] is None
+    response = client.post("/jobs/add", json=repost)
+    assert response.json()["duplicate_of"] == "near_dup_a"
+    assert set(jobs_api.jd_index.signatures) == {"near_dup_a", "near_dup_b"}
@@ -0,0 +1,145 @@
+import asyncio
+import json
+import time
+
+import apps.backend.services.linkedin_playwright as linkedin_module
+from apps.backend.services.linkedin_playwright import EXTRACT_CARDS_JS, LinkedInPlaywrightService
+
+SERVER = {"valid_tokens": set(), "issued": 0}
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.url = "about:blank"
+
+    async def route(self, pattern, handler):
+        pass
+
+    def on(self, event, callback):
+        pass
+
+    async def goto(self, url, **kwargs):
+        token = next((c["value"] for c in self.context.jar if c["name"] == "li_at"), None)
+        # LinkedIn bounces requests without a live session to the auth wall
+        self.url = url if token in SERVER["valid_tokens"] or "/login" in url else "https://www.linkedin.com/authwall"
+
+    async def wait_for_selector(self, selector, **kwargs):
+        pass
+
+    async def evaluate(self, script, arg=None):
+        self.context.evaluations.append(script)
+        if script == EXTRACT_CARDS_JS:
+            return [
+                {"job_id": str(3900000000 + i), "title": "Senior Product Manager", "company": "Acme",
+                 "location": "Remote", "href": f"/jobs/view/{3900000000 + i}/"}
+                for i in range(arg["limit"])
+            ]
+        return None
+
+
+class FakeContext:
+    def __init__(self, jar):
+        self.jar = jar
+        self.evaluations = []
+
+    async def new_page(self):
+        return FakePage(self)
+
+    async def cookies(self, url=None):
+        return list(self.jar)
+
+    async def add_cookies(self, cookies):
+        self.jar.extend(cookies)
+
+    async def storage_state(self, path):
+        with open(path, "w") as f:
+            json.dump({"cookies": self.jar, "origins": []}, f)
+
+
+class FakeBrowser:
+    contexts = []
+
+    async def new_context(self, storage_state=None):
+        jar = []
+        if storage_state:
+            with open(storage_state) as f:
+                jar = json.load(f)["cookies"]
+        context = FakeContext(jar)
+        FakeBrowser.contexts.append(context)
+        return context
+
+    async def close(self):
+        pass
+
+
+class FakeDriver:
+    class chromium:
+        @staticmethod
+        async def launch(**options):
+            return FakeBrowser()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+
+def make_service(tmp_path, monkeypatch):
+    monkeypatch.setattr(linkedin_module, "async_playwright", lambda: FakeDriver())
+    service = LinkedInPlaywrightService()
+    service.storage_state_path = tmp_path / "linkedin_state.json"
+    service.session_cookie = None
+
+    async def fake_login(page):
+        SERVER["issued"] += 1
+        token = f"token-{SERVER['issued']}"
+        SERVER["valid_tokens"].add(token)
+        page.context.jar[:] = [{"name": "li_at", "value": token, "expires": time.time() + 3600}]
+        return True
+
+    service.login = fake_login
+    return service
+
+
+def test_session_is_saved_once_and_reused(tmp_path, monkeypatch):
+    """Only the first call logs in; later calls load storage_state and go straight to work"""
+    service = make_service(tmp_path, monkeypatch)
+
+    first = asyncio.run(service.test_connection())
+    assert first["success"] and not first["session_reused"]
+    assert service.has_session() and (service.storage_state_path.stat().st_mode & 0o777) == 0o600
+
+    second = asyncio.run(service.test_connection())
+    assert second["success"] and second["session_reused"]
+    assert service.logins == 1
+
+
+def test_expired_or_revoked_session_triggers_one_relogin(tmp_path, monkeypatch):
+    """An expired cookie is caught locally; a server-side revocation via the auth wall"""
+    service = make_service(tmp_path, monkeypatch)
+    asyncio.run(service.test_connection())
+
+    state = json.loads(service.storage_state_path.read_text())
+    state["cookies"][0]["expires"] = time.time() - 60
+    service.storage_state_path.write_text(json.dumps(state))
+    assert asyncio.run(service.test_connection())["success"]
+    assert service.logins == 2
+
+    SERVER["valid_tokens"].clear()
+    result = asyncio.run(service.test_connection())
+    assert result["success"] and not result["session_reused"]
+    assert service.logins == 3
+    assert asyncio.run(service.test_connection())["session_reused"]
+
+
+def test_search_extracts_all_cards_in_one_evaluate(tmp_path, monkeypatch):
+    """Cards come back from a single in-page call instead of ~8 round trips each"""
+    service = make_service(tmp_path, monkeypatch)
+    jobs = asyncio.run(service.search_jobs("product manager", limit=40))
+
+    assert len(jobs) == 40
+    assert jobs[0]["id"] == "linkedin_3900000000"
+    assert jobs[0]["url"] == "https://www.linkedin.com/jobs/view/3900000000/"
+    assert FakeBrowser.contexts[-1].evaluations.count(EXTRACT_CARDS_JS) == 1
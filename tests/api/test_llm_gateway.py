@@ -0,0 +1,112 @@
+import asyncio
+import time
+
+import pytest
+from apps.backend.services.crew_runner import Crew
+from apps.backend.services.llm_gateway import FakeLLM, LLMGateway
+from apps.backend.services.result_cache import ResultCache
+
+MODEL = "openai:gpt-4o-mini"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(str(tmp_path / "llm.db"))
+
+
+def test_identical_calls_are_cached_by_model_prompts_and_params(cache):
+    backend = FakeLLM()
+    gateway = LLMGateway(backend, cache=cache)
+
+    async def scenario():
+        first = await gateway.complete(MODEL, "system", "Write a cover letter", agent="apply_pack")
+        again = await gateway.complete(MODEL, "system", "Write a cover letter", agent="apply_pack")
+        warmer = await gateway.complete(MODEL, "system", "Write a cover letter", agent="apply_pack", temperature=0.7)
+        return first, again, warmer
+
+    first, again, warmer = asyncio.run(scenario())
+    assert first == again != warmer and len(backend.calls) == 2
+    stats = gateway.stats()["agents"]["apply_pack"]
+    assert (stats["requests"], stats["backend_calls"], stats["cache_hits"]) == (3, 2, 1)
+    assert stats["tokens_saved"] == stats["prompt_tokens"] / 2 + stats["completion_tokens"] / 2
+    assert stats["cost_saved_usd"] > 0
+
+    restarted = LLMGateway(FakeLLM(), cache=ResultCache(cache.path))
+    assert asyncio.run(restarted.complete(MODEL, "system", "Write a cover letter")) == first
+
+
+def test_identical_in_flight_requests_share_one_backend_call(cache):
+    backend = FakeLLM(delay=0.05)
+    gateway = LLMGateway(backend, cache=cache)
+
+    async def scenario():
+        return await asyncio.gather(*(gateway.complete(MODEL, "s", "same prompt", agent="jd_matcher") for _ in range(3)))
+
+    assert len(set(asyncio.run(scenario()))) == 1 and len(backend.calls) == 1
+    assert gateway.stats()["agents"]["jd_matcher"]["deduped"] == 2
+
+
+def test_cancelling_the_first_caller_leaves_joined_callers_running(cache):
+    backend = FakeLLM(delay=0.05)
+    gateway = LLMGateway(backend, cache=cache)
+
+    async def scenario():
+        first = asyncio.ensure_future(gateway.complete(MODEL, "s", "shared", agent="apply_pack"))
+        await asyncio.sleep(0.01)
+        joined = asyncio.ensure_future(gateway.complete(MODEL, "s", "shared", agent="jd_matcher"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return first, await joined
+
+    first, text = asyncio.run(scenario())
+    assert first.cancelled() and text.startswith(f"[{MODEL}] shared") and len(backend.calls) == 1
+    assert gateway.stats()["agents"]["jd_matcher"]["deduped"] == 1
+
+
+def test_failures_reach_joined_callers_and_are_not_cached(cache):
+    class FlakyLLM(FakeLLM):
+        async def complete(self, model, system, prompt, **params):
+            await asyncio.sleep(0.02)
+            if not self.calls:
+                self.calls.append(prompt)
+                raise TimeoutError("upstream timeout")
+            return await super().complete(model, system, prompt, **params)
+
+    gateway = LLMGateway(FlakyLLM(), cache=cache)
+
+    async def scenario():
+        return await asyncio.gather(*(gateway.complete(MODEL, "s", "p") for _ in range(2)), return_exceptions=True)
+
+    assert all(isinstance(result, TimeoutError) for result in asyncio.run(scenario()))
+    assert asyncio.run(gateway.complete(MODEL, "s", "p")).startswith(f"[{MODEL}]")
+
+
+def test_request_and_token_budgets_queue_excess_calls(cache):
+    by_requests = LLMGateway(FakeLLM(), cache=cache, requests_per_minute=2, window_seconds=0.2)
+    by_tokens = LLMGateway(FakeLLM(delay=0.05), cache=cache, tokens_per_minute=100, window_seconds=0.2)
+
+    async def timed(gateway, prompts, **params):
+        started = time.perf_counter()
+        await asyncio.gather(*(gateway.complete(MODEL, "s", prompt, **params) for prompt in prompts))
+        return time.perf_counter() - started
+
+    assert asyncio.run(timed(by_requests, ["a", "b"])) < 0.1
+    assert asyncio.run(timed(by_requests, ["c", "d", "e"])) >= 0.15
+    # 61 tokens reserved each with max_tokens=50: the second waits for the first to leave the window
+    assert asyncio.run(timed(by_tokens, ["x" * 40, "y" * 40], max_tokens=50)) >= 0.15
+    assert by_requests.stats()["agents"]["default"]["queued_ms"] > 0
+
+
+def test_crew_reruns_are_served_from_cache_and_accounted_per_agent(cache):
+    backend = FakeLLM()
+    gateway = LLMGateway(backend, cache=cache)
+    crew = Crew.load()
+    inputs = {"resume_text": "Led A/B testing", "jd_text": "PM: A/B testing, SQL"}
+
+    first = asyncio.run(crew.run(gateway, inputs))
+    second = asyncio.run(crew.run(gateway, inputs))
+
+    assert first.outputs == second.outputs and len(backend.calls) == 4
+    agents = gateway.stats()["agents"]
+    assert set(agents) == {"jd_matcher", "apply_pack", "outreach_planner", "day_summarizer"}
+    assert all(stats["backend_calls"] == 1 and stats["cache_hits"] == 1 for stats in agents.values())
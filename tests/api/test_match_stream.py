@@ -0,0 +1,58 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from apps.backend import main
+from apps.backend.main import JDMatchRequest, app
+from apps.backend.services.result_cache import ResultCache
+
+client = TestClient(app)
+
+PAYLOAD = {
+    "resume_text": "Experience\nLed A/B testing in Amplitude\nShipped SQL dashboards",
+    "jd_text": "Senior PM: A/B testing, SQL window functions, Tableau.",
+    "target_role": "Streaming PM",
+    "seniority": "senior",
+}
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "result_cache", ResultCache(str(tmp_path / "result_cache.db")))
+
+
+def read_events(response):
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_match_stream_sends_scores_first_and_rebuilds_the_match_response():
+    response = client.post("/match/stream", json={**PAYLOAD, "seniority": "stream-1"})
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = read_events(response)
+    names = [event for event, _ in events]
+
+    assert not events[0][1]["cached"] and names[0] == "score" and names[-1] == "done"
+    assert names[1:4] == ["bullet"] * 3 and set(names[4:-1]) == {"cover"}
+    score, done = events[0][1], events[-1][1]
+    assert score["missing_skills"] == done["missing_skills"] and "cover_letter" not in score
+    assert "".join(data["delta"] for event, data in events if event == "cover") == done["cover_letter"]
+
+    plain = client.post("/match", json={**PAYLOAD, "seniority": "stream-1"}).json()
+    assert plain["cached"] and plain["cover_letter"] == done["cover_letter"]
+    assert read_events(client.post("/match/stream", json={**PAYLOAD, "seniority": "stream-1"}))[0][1]["cached"]
+
+
+def test_first_event_does_not_wait_for_generation(monkeypatch):
+    def endless_cover(req):
+        while True:
+            yield "word "
+
+    monkeypatch.setattr(main, "_cover_letter_tokens", endless_cover)
+    events = main._match_events(JDMatchRequest(**{**PAYLOAD, "seniority": "stream-2"}))
+    event, scores = next(events)
+    assert event == "score" and 0 < scores["match_score"] < 1
+    assert [next(events)[0] for _ in range(5)] == ["bullet"] * 3 + ["cover"] * 2
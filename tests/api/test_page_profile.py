@@ -0,0 +1,55 @@
+import asyncio
+
+from apps.backend.services.page_profile import PageProfile, ResourcePolicy
+
+
+class FakeRequest:
+    def __init__(self, resource_type, url):
+        self.resource_type = resource_type
+        self.url = url
+
+
+class FakeRoute:
+    def __init__(self, resource_type, url):
+        self.request = FakeRequest(resource_type, url)
+        self.outcome = None
+
+    async def fallback(self):
+        self.outcome = "continued"
+
+    async def abort(self):
+        self.outcome = "aborted"
+
+
+def test_policy_blocks_heavy_types_and_trackers_but_never_documents():
+    policy = ResourcePolicy()
+    assert policy.should_block("image", "https://boards.greenhouse.io/logo.png") == "image"
+    assert policy.should_block("script", "https://www.googletagmanager.com/gtm.js") == "tracker"
+    assert policy.should_block("script", "https://boards.greenhouse.io/app.js") is None
+    assert policy.should_block("document", "https://doubleclick.net/ad") is None
+    assert ResourcePolicy(block_types=[], block_domains=[]).should_block("image", "https://x.com/a.png") is None
+
+
+def test_profile_aborts_blocked_requests_and_reports_savings():
+    """Aborted requests are counted by reason with a typical-size byte estimate"""
+    profile = PageProfile(ResourcePolicy())
+    routes = [
+        FakeRoute("document", "https://jobs.lever.co/acme/1/apply"),
+        FakeRoute("script", "https://jobs.lever.co/app.js"),
+        FakeRoute("image", "https://jobs.lever.co/hero.jpg"),
+        FakeRoute("font", "https://fonts.gstatic.com/inter.woff2"),
+        FakeRoute("xhr", "https://api.segment.io/v1/t"),
+    ]
+
+    async def run():
+        for route in routes:
+            await profile._handle(route)
+
+    asyncio.run(run())
+    profile.ready_ms, profile.load_event_ms = 400.0, 2100.0
+    summary = profile.summary()
+
+    assert [route.outcome for route in routes] == ["continued", "continued", "aborted", "aborted", "aborted"]
+    assert summary["blocked"] == {"image": 1, "font": 1, "tracker": 1}
+    assert summary["estimated_bytes_saved"] == 60_000 + 40_000 + 5_000
+    assert summary["estimated_ms_saved"] == 2200.0
@@ -0,0 +1,97 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from apps.backend import storage
+from apps.backend.services.posting_recrawler import PostingRecrawler
+
+RECORDED = {
+    "https://jobs.example.com/1": "<h1>Senior PM</h1><p>Own the roadmap.</p>",
+    "https://jobs.example.com/2": "<h1>TPM</h1><p>Drive launches.</p>",
+}
+PAGES = {}
+
+
+@pytest.fixture(autouse=True)
+def reset_pages(tmp_path, monkeypatch):
+    PAGES.clear()
+    PAGES.update(RECORDED)
+    # posting_state.json goes to a tmp dir instead of data/storage
+    monkeypatch.setattr(storage, "STORAGE_DIR", tmp_path)
+
+
+def handler(request):
+    body = PAGES.get(str(request.url))
+    if body is None:
+        return httpx.Response(404)
+    etag = f'"{abs(hash(body))}"'
+    if request.headers.get("if-none-match") == etag:
+        return httpx.Response(304)
+    return httpx.Response(200, text=body, headers={"ETag": etag})
+
+
+def make_jobs():
+    return {
+        "j1": {"job_id": "j1", "jd_url": "https://jobs.example.com/1", "status": "new"},
+        "j2": {"job_id": "j2", "jd_url": "https://jobs.example.com/2", "status": "autofilled"},
+        "j3": {"job_id": "j3", "jd_url": "https://jobs.example.com/3", "status": "rejected"},
+    }
+
+
+def run(recrawler, jobs):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return asyncio.run(recrawler.run(jobs, client=client))
+
+
+def test_schedule_is_hot_for_new_and_cold_for_submitted():
+    """Rejected postings are never rechecked; new ones come back sooner than submitted ones"""
+    recrawler = PostingRecrawler()
+    recrawler.state = {}
+    jobs = make_jobs()
+    jobs["j2"]["status"] = "submitted"
+
+    assert [job["job_id"] for job in recrawler.due_jobs(jobs)] == ["j1", "j2"]
+    run(recrawler, jobs)
+
+    hot = datetime.fromisoformat(recrawler.state["https://jobs.example.com/1"]["next_check"])
+    cold = datetime.fromisoformat(recrawler.state["https://jobs.example.com/2"]["next_check"])
+    assert hot < cold
+    assert recrawler.due_jobs(jobs) == []
+    assert [j["job_id"] for j in recrawler.due_jobs(jobs, now=datetime.utcnow() + timedelta(hours=7))] == ["j1"]
+
+
+def test_revalidation_detects_unchanged_changed_and_closed():
+    """304s keep the posting, edits are flagged and missing postings are closed"""
+    recrawler = PostingRecrawler()
+    recrawler.state = {}
+    jobs = make_jobs()
+    run(recrawler, jobs)
+
+    for entry in recrawler.state.values():
+        entry["next_check"] = datetime.utcnow().isoformat()
+    summary = run(recrawler, jobs)
+    assert summary["unchanged"] == 2 and summary["changed"] == [] and summary["closed"] == []
+
+    PAGES["https://jobs.example.com/1"] = "<h1>Senior PM</h1><p>Own the payments roadmap.</p>"
+    del PAGES["https://jobs.example.com/2"]
+    for entry in recrawler.state.values():
+        entry["next_check"] = datetime.utcnow().isoformat()
+    summary = run(recrawler, jobs)
+
+    assert summary["changed"] == ["j1"]
+    assert summary["closed"] == ["j2"]
+    assert jobs["j2"]["status"] == "closed"
+
+
+def test_closed_posting_keeps_a_submitted_jobs_status():
+    """Applied-to jobs stay in the pipeline; the posting's closure is only recorded"""
+    recrawler = PostingRecrawler()
+    recrawler.state = {}
+    jobs = make_jobs()
+    jobs["j2"]["status"] = "submitted"
+    del PAGES["https://jobs.example.com/2"]
+    summary = run(recrawler, jobs)
+
+    assert summary["closed"] == ["j2"] and jobs["j2"]["status"] == "submitted"
+    assert recrawler.state["https://jobs.example.com/2"]["closed_at"]
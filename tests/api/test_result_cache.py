@@ -0,0 +1,58 @@
+import pytest
+from fastapi.testclient import TestClient
+from apps.backend import main
+from apps.backend.main import app
+from apps.backend.services.result_cache import ResultCache
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(str(tmp_path / "result_cache.db"), ttl_seconds=60, memory_size=2)
+
+
+def test_key_ignores_spacing_but_not_content_or_version():
+    key = ResultCache.key_for("v1", "Led  A/B testing \r\n\n", "SQL", "PM", "senior")
+    assert key == ResultCache.key_for("v1", " Led A/B testing\n", "SQL", "PM", "senior")
+    assert key != ResultCache.key_for("v1", "Led A/B testing SQL", "", "PM", "senior")
+    assert key != ResultCache.key_for("v2", "Led A/B testing", "SQL", "PM", "senior")
+
+
+def test_lru_falls_back_to_disk_and_survives_restart(cache):
+    for name in "abc":
+        cache.put("match", name, "v1", {"score": name})
+    assert cache.get("match", "a") == {"score": "a"}  # evicted from memory, read from disk
+    assert cache.get("match", "a") == {"score": "a"}
+    assert cache.get("match", "missing") is None
+
+    stats = cache.stats()["namespaces"]["match"]
+    assert (stats["memory_hits"], stats["disk_hits"], stats["misses"], stats["stored"]) == (1, 1, 1, 3)
+    assert stats["hit_rate"] == pytest.approx(2 / 3)
+    assert ResultCache(cache.path).get("match", "c") == {"score": "c"}
+
+
+def test_entries_expire_and_old_versions_are_purged(cache):
+    cache.put("match", "old", "v1", {"score": 1}, now=1000)
+    cache.put("match", "fresh", "v1", {"score": 2})
+    cache.put("rewrite", "other", "v1", {"text": "x"})
+    assert cache.get("match", "old") is None
+    assert cache.stats()["namespaces"]["match"]["expired"] == 1
+
+    assert cache.purge("match", keep_version="v2") == 2
+    assert cache.get("match", "fresh") is None and cache.get("rewrite", "other") == {"text": "x"}
+
+
+def test_repeated_match_is_served_from_cache(cache, monkeypatch):
+    monkeypatch.setattr(main, "result_cache", cache)
+    payload = {"resume_text": "Experience\nLed Kubernetes migrations", "jd_text": "Kubernetes, Terraform.",
+               "target_role": "Platform PM", "seniority": "senior"}
+    first = client.post("/match", json=payload).json()
+    second = client.post("/match", json={**payload, "resume_text": "Experience \n\nLed  Kubernetes migrations"}).json()
+
+    assert not first["cached"] and second["cached"]
+    assert {k: v for k, v in second.items() if k not in ("cached", "latency_ms")} == \
+        {k: v for k, v in first.items() if k not in ("cached", "latency_ms")}
+    assert client.post("/match", json={**payload, "seniority": "junior"}).json()["cached"] is False
+    stats = client.get("/match/cache").json()["namespaces"]["match"]
+    assert (stats["memory_hits"], stats["stored"]) == (1, 2)
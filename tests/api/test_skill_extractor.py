@@ -0,0 +1,69 @@
+import json
+import time
+
+from fastapi.testclient import TestClient
+from apps.backend.main import app
+from apps.backend.services.skill_extractor import AhoCorasick, SkillExtractor, normalize
+
+client = TestClient(app)
+
+JD = ("Senior PM for our two-sided marketplace. Own A/B testing and GA4 / Google Analytics 4 dashboards, "
+      "write PRDs, set OKRs, and partner with engineers on REST APIs, Node.js and C++ services.")
+RESUME = "Experience\nRan split testing for the marketplace; built Amplitude funnels\nSkills\nSQL, Python, Node.js"
+
+
+def test_automaton_reports_overlapping_matches():
+    assert AhoCorasick(["he", "she", "his", "hers"]).find("ushers") == [(4, 1), (4, 0), (6, 3)]
+
+
+def test_normalize_keeps_tech_punctuation_and_drops_sentence_punctuation():
+    assert normalize("<b>C++</b>, C#, Node.js; CI/CD. R&D - done.") == " c++ c# node.js ci/cd r&d done "
+
+
+def test_aliases_map_to_one_canonical_skill_on_word_boundaries():
+    extractor = SkillExtractor()
+    assert extractor.extract(JD) == [
+        "Marketplace", "A/B testing", "Google Analytics 4", "PRDs", "OKRs", "REST APIs", "Node.js", "C++",
+    ]
+    assert extractor.extract("JavaScript, and safe, restful sleep") == ["JavaScript"]
+
+
+def test_slash_lists_split_unless_the_taxonomy_name_has_a_slash():
+    extractor = SkillExtractor()
+    assert extractor.extract("SQL/Excel") == ["SQL", "Excel"]
+    assert extractor.extract("React/Node.js") == ["React", "Node.js"]
+    assert extractor.extract("CI/CD/Python, A/B testing, PL/SQL") == ["CI/CD", "Python", "A/B testing", "SQL"]
+
+
+def test_missing_skills_are_a_set_difference_in_jd_order():
+    extractor = SkillExtractor()
+    assert extractor.missing(RESUME, JD) == ["Google Analytics 4", "PRDs", "OKRs", "REST APIs", "C++"]
+    assert extractor.missing(RESUME, JD, limit=2) == ["Google Analytics 4", "PRDs"]
+
+
+def test_extraction_is_cached_per_text(tmp_path):
+    taxonomy = tmp_path / "skills.json"
+    taxonomy.write_text(json.dumps({"skills": [{"name": "Kafka", "aliases": ["apache kafka"]}]}))
+    extractor = SkillExtractor(taxonomy, cache_size=2)
+    for text in ["Apache Kafka", "Apache Kafka", "none", "other", "Apache Kafka"]:
+        extractor.extract(text)
+    assert extractor.stats()["hits"] == 1 and extractor.stats()["misses"] == 4
+
+
+def test_extraction_is_fast_enough_for_bulk_ingestion():
+    extractor = SkillExtractor()
+    jds = [f"{JD} Posting {i}. " * 20 for i in range(200)]
+    started = time.perf_counter()
+    for jd in jds:
+        extractor.extract(jd)
+    assert (time.perf_counter() - started) / len(jds) < 0.01
+
+
+def test_new_jobs_record_their_skills():
+    response = client.post("/jobs/add", json={
+        "job_id": "skills-1", "company": "Acme", "role": "PM", "track": "PM",
+        "jd_url": "https://boards.greenhouse.io/acme/jobs/990011", "jd_text": "Kubernetes (k8s), Terraform and GA4.",
+    })
+    assert response.status_code == 200
+    assert response.json()["skills"] == ["Kubernetes", "Terraform", "Google Analytics 4"]
+    client.delete("/jobs/skills-1")
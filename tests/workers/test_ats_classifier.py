@@ -0,0 +1,40 @@
+import pytest
+from workers.autofill.ats_detector import ATSClassifier, ATSDetector, ATSType, classify_many
+
+CASES = [
+    ("https://boards.greenhouse.io/acme/jobs/4012345", ATSType.GREENHOUSE),
+    ("https://jobs.greenhouse.io/acme/jobs/1?gh_src=x", ATSType.GREENHOUSE),
+    ("https://job-boards.greenhouse.io/acme/jobs/1", ATSType.GREENHOUSE),
+    ("https://acme.wd5.myworkdayjobs.com/en-US/Careers/job/R123", ATSType.WORKDAY),
+    ("https://wd5.myworkday.com/acme/d/inst/1.html", ATSType.WORKDAY),
+    ("https://jobs.lever.co/acme/7f3c2a10/apply", ATSType.LEVER),
+    ("https://jobs.eu.lever.co/acme/1", ATSType.LEVER),
+    ("jobs.ashbyhq.com/acme/9e8d7c6b/application", ATSType.ASHBY),
+    ("HTTPS://user@Boards.Greenhouse.IO:443/acme", ATSType.GREENHOUSE),
+    # ATS links carried in a redirect or query still count
+    ("https://www.google.com/url?q=https://jobs.lever.co/acme/1", ATSType.LEVER),
+    ("https://acme.com/apply?next=https%3A%2F%2Fjobs.ashbyhq.com%2Facme", ATSType.ASHBY),
+    ("https://www.linkedin.com/jobs/view/3900000000/", ATSType.UNKNOWN),
+    ("https://careers.acme.com/jobs/1?gh_jid=4012345", ATSType.UNKNOWN),
+    ("/relative/path", ATSType.UNKNOWN),
+    ("", ATSType.UNKNOWN),
+]
+
+
+@pytest.mark.parametrize("url, expected", CASES)
+def test_classify_matches_expected(url, expected):
+    assert ATSClassifier().classify(url) == expected
+    assert ATSDetector().detect_from_url(url) == expected
+
+
+def test_hosts_match_on_label_boundaries_only():
+    """The old substring regexes tagged clever.com and lever.com as Lever"""
+    classifier = ATSClassifier()
+    assert classifier.classify("https://www.clever.com/about/careers") == ATSType.UNKNOWN
+    assert classifier.classify("https://jobs.lever.com/x") == ATSType.UNKNOWN
+    assert classifier.classify("https://notworkday.com/jobs") == ATSType.UNKNOWN
+
+
+def test_classify_many_agrees_with_single_classification():
+    urls = [url for url, _ in CASES] * 3
+    assert classify_many(urls) == [expected for _, expected in CASES] * 3
@@ -0,0 +1,48 @@
+import pytest
+from workers.autofill.ats_detector import ATSDetector, ATSType, ContentScanner
+from workers.autofill.replay import load_manifest
+
+FIXTURES = load_manifest()
+FILLER = '<div class="row"><p>We believe in leverage and a flexible work day.</p></div>\n'
+
+
+@pytest.mark.parametrize("fixture", FIXTURES, ids=lambda fixture: fixture.name)
+def test_recorded_application_pages_are_detected(fixture):
+    assert ATSDetector().detect_from_content(fixture.path.read_text()) == ATSType(fixture.ats)
+
+
+def test_the_word_lever_is_a_hint_not_a_verdict():
+    """'lever' used to outrank everything after Workday; now it needs a real signal"""
+    detector = ATSDetector()
+    assert detector.detect_from_content("<p>Pull the lever and leverage our platform.</p>") == ATSType.UNKNOWN
+    assert detector.detect_from_content("<a href='https://www.clever.com/jobs'>Clever</a>") == ATSType.UNKNOWN
+
+    embedded = ("<p>Pull every lever.</p><div id='grnhse_app'></div>"
+                "<script src='https://boards.greenhouse.io/embed/job_board/js?for=acme'></script>")
+    assert detector.detect_from_content(embedded) == ATSType.GREENHOUSE
+
+
+@pytest.mark.parametrize("size", [1, 7, 128, 129, 4096])
+def test_streamed_chunks_agree_with_the_whole_page(size):
+    scanner = ContentScanner()
+    for fixture in FIXTURES:
+        page = FILLER * 50 + fixture.path.read_text() + FILLER * 50
+        whole = ContentScanner(window=10**9).scan(page)
+        streamed = scanner.scan_chunks(page[i:i + size] for i in range(0, len(page), size))
+        assert streamed.ats_type == whole.ats_type == ATSType(fixture.ats)
+
+
+def test_indicators_split_across_windows_are_not_misread():
+    """'lever.co' cut at 'lever' must not count as the bare word, nor 'clever.co' as Lever"""
+    page = FILLER * 20 + "jobs.lever.co/acme " + FILLER * 20 + " clever.co/x " + FILLER * 20
+    whole = ContentScanner(window=10**9).scan(page)
+    for window in range(256, 300):
+        assert ContentScanner(window=window).scan(page).scores == whole.scores == {"lever": 5}
+
+
+def test_scan_stops_once_the_verdict_is_certain():
+    page = ('<script src="https://acme.wd5.myworkdayjobs.com/wday/app.js"></script>'
+            '<div data-automation-id="jobPostingPage"></div>' + FILLER * 50_000)
+    verdict = ContentScanner().scan(page)
+    assert verdict.ats_type == ATSType.WORKDAY and verdict.stopped_early
+    assert verdict.chars_scanned < 1000 < len(page)
@@ -0,0 +1,90 @@
+import asyncio
+import time
+
+from workers.autofill.main import AutofillWorker
+from workers.autofill.task_queue import TaskQueue
+
+
+class FakeATSService:
+    """Stands in for ATSService: sleeps like a page fill and records peak concurrency"""
+
+    def __init__(self, failures=None):
+        self.failures = dict(failures or {})
+        self.running = 0
+        self.peak = 0
+        self.calls = []
+
+    async def fill_application_form(self, job_url, form_data):
+        self.calls.append(job_url)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(0.05)
+            if self.failures.get(job_url, 0) > 0:
+                self.failures[job_url] -= 1
+                return {"success": False, "errors": ["ATS automation failed: net::ERR_TIMED_OUT"]}
+            return {"success": True, "filled_fields": list(form_data), "errors": []}
+        finally:
+            self.running -= 1
+
+
+def test_claim_is_exclusive_until_the_lease_expires(tmp_path):
+    """A claimed task is invisible to other workers, then reappears if never acked"""
+    queue = TaskQueue(str(tmp_path / "queue.db"))
+    task_id = queue.enqueue("https://jobs.lever.co/acme/1", {"email": "a@b.co"}, job_id="j1")
+
+    task = queue.claim("w1", visibility_timeout=60)
+    assert task["id"] == task_id and task["attempts"] == 1
+    assert queue.claim("w2", visibility_timeout=60) is None
+
+    stolen = queue.claim("w2", visibility_timeout=60, now=time.time() + 61)
+    assert stolen["id"] == task_id and stolen["worker_id"] == "w2" and stolen["attempts"] == 2
+
+
+def test_task_that_keeps_losing_its_lease_eventually_fails(tmp_path):
+    """A task that hangs or kills the worker every time is not retried forever"""
+    queue = TaskQueue(str(tmp_path / "queue.db"))
+    task_id = queue.enqueue("https://jobs.lever.co/acme/1", {}, max_attempts=3)
+
+    now = time.time()
+    for attempt in range(1, 4):
+        task = queue.claim(f"w{attempt}", visibility_timeout=60, now=now + 61 * (attempt - 1))
+        assert task["id"] == task_id and task["attempts"] == attempt
+
+    assert queue.claim("w4", visibility_timeout=60, now=now + 61 * 3) is None
+    task = queue.get(task_id)
+    assert task["status"] == "failed" and task["last_error"] == "lease expired on the final attempt"
+    assert queue.counts() == {"failed": 1}
+
+
+def test_failures_back_off_then_give_up(tmp_path):
+    """Each failed attempt doubles the delay; the last one marks the task failed"""
+    queue = TaskQueue(str(tmp_path / "queue.db"), backoff_base=10)
+    task_id = queue.enqueue("https://jobs.lever.co/acme/1", {}, max_attempts=2)
+
+    now = time.time()
+    queue.claim("w1", now=now)
+    assert queue.fail(task_id, "timeout", now=now) == "queued"
+    assert queue.get(task_id)["available_at"] == now + 10
+    assert queue.claim("w1", now=now + 5) is None
+
+    queue.claim("w1", now=now + 10)
+    assert queue.fail(task_id, "timeout", now=now + 10) == "failed"
+    assert queue.get(task_id)["last_error"] == "timeout"
+
+
+def test_worker_runs_slots_concurrently_and_retries(tmp_path):
+    """N slots fill in parallel; a transient error is retried on the next claim"""
+    queue = TaskQueue(str(tmp_path / "queue.db"), backoff_base=0)
+    urls = [f"https://boards.greenhouse.io/acme/jobs/{i}" for i in range(6)]
+    ids = [queue.enqueue(url, {"first_name": "Ada"}) for url in urls]
+    service = FakeATSService(failures={urls[0]: 1})
+
+    worker = AutofillWorker(queue, service, concurrency=3, worker_id="test")
+    stats = asyncio.run(worker.run(drain=True))
+
+    assert service.peak == 3
+    assert stats == {"completed": 6, "retried": 1, "failed": 0}
+    assert all(queue.get(task_id)["status"] == "completed" for task_id in ids)
+    assert queue.get(ids[0])["attempts"] == 2
+    assert queue.get(ids[1])["result"]["filled_fields"] == ["first_name"]
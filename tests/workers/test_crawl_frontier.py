@@ -0,0 +1,133 @@
+import pytest
+from workers.crawler.frontier import CrawlFrontier, RobotsCache, canonicalize_url
+
+ROBOTS = """
+User-agent: *
+Disallow: /private
+Crawl-delay: 10
+"""
+
+def make_frontier(**kwargs):
+    robots = RobotsCache(lambda url: (200, ROBOTS), default_delay=1.0)
+    return CrawlFrontier(robots, **kwargs)
+
+def test_canonicalize_url_strips_tracking_and_normalizes():
+    """Tracking params, fragments, case and default ports do not create new URLs"""
+    url = "HTTPS://www.Example.com:443/careers//jobs/?utm_source=x&b=2&a=1&gclid=abc#apply"
+    assert canonicalize_url(url) == "https://example.com/careers/jobs?a=1&b=2"
+
+def test_seen_set_dedupes_canonical_urls():
+    """The same page reached via different URLs is queued once"""
+    frontier = make_frontier()
+    assert frontier.add("https://example.com/careers?utm_medium=email")
+    assert not frontier.add("https://www.example.com/careers/")
+    assert len(frontier) == 1
+
+def test_one_request_per_domain_and_crawl_delay():
+    """A domain is not fetched again until its robots crawl-delay has passed"""
+    frontier = make_frontier()
+    frontier.add("https://a.com/jobs/1")
+    frontier.add("https://a.com/jobs/2")
+    frontier.add("https://b.com/jobs")
+
+    batch = frontier.next_batch(10, now=0)
+    assert sorted(batch) == ["https://a.com/jobs/1", "https://b.com/jobs"]
+
+    frontier.record_fetch("https://a.com/jobs/1", "h1", now=1)
+    assert frontier.next_batch(10, now=5) == []
+    assert frontier.next_batch(10, now=11) == ["https://a.com/jobs/2"]
+
+def test_robots_disallow_drops_url():
+    """Disallowed paths are never handed to workers"""
+    frontier = make_frontier()
+    frontier.add("https://a.com/private/jobs")
+    assert frontier.next_batch(10, now=0) == []
+    assert len(frontier) == 0
+
+def test_recrawl_interval_adapts_to_change_history():
+    """Pages that change get recrawled sooner; static pages back off"""
+    frontier = make_frontier(min_interval=100, max_interval=10_000, initial_interval=1000)
+    frontier.add("https://a.com/jobs")
+
+    state = frontier.record_fetch("https://a.com/jobs", "v1", now=0)
+    assert state.interval == 1000
+    state = frontier.record_fetch("https://a.com/jobs", "v2", now=1000)
+    assert state.interval == 500 and state.changes == 1
+    state = frontier.record_fetch("https://a.com/jobs", "v2", now=1500)
+    assert state.interval == 750
+    assert state.next_crawl == 2250
+
+def test_frontier_round_trips_through_dict():
+    """Saved frontier state restores pages and history"""
+    frontier = make_frontier()
+    frontier.add("https://a.com/jobs", priority=2)
+    frontier.record_fetch("https://a.com/jobs", "v1", now=0)
+
+    restored = make_frontier()
+    restored.load_dict(frontier.to_dict())
+    page = restored.pages["https://a.com/jobs"]
+    assert page.content_hash == "v1" and page.priority == 2
+
+def test_unexpected_fetch_error_releases_the_domain():
+    """A non-HTTP exception mid-fetch still frees the domain and requeues the page"""
+    import asyncio
+    import httpx
+    from workers.crawler.main import Crawler
+
+    def explode(request):
+        raise RuntimeError("decoder blew up")
+
+    frontier = make_frontier()
+    frontier.add("https://a.com/jobs")
+    crawler = Crawler(frontier, client=httpx.AsyncClient(transport=httpx.MockTransport(explode)))
+    url = frontier.next_batch(1)[0]
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(crawler._fetch(crawler.client, url))
+    assert frontier.stats()["in_flight"] == 0
+    assert frontier.pages["https://a.com/jobs"].next_crawl > 0
+
+def test_robots_responses_are_saved_with_the_frontier():
+    """A restored frontier reuses saved robots.txt rules instead of refetching them"""
+    frontier = make_frontier()
+    frontier.add("https://a.com/jobs")
+    frontier.add("https://a.com/private/jobs")
+    frontier.next_batch(1, now=0)
+
+    robots = RobotsCache(lambda url: pytest.fail("robots.txt refetched"), default_delay=1.0)
+    restored = CrawlFrontier(robots)
+    restored.load_dict(frontier.to_dict())
+    assert not restored.robots.allowed("https://a.com/private/jobs", now=1)
+    assert restored.robots.crawl_delay("https://a.com/jobs", now=1) == 10
+
+def test_discovery_stays_within_the_seed_scope_or_career_paths():
+    """Links outside the seed's path are only followed when they look like career pages"""
+    import asyncio
+    import httpx
+    from workers.crawler.main import Crawler
+
+    page = """<a href="/careers/pm-123">PM</a> <a href="/blog/launch">Blog</a> <a href="/jobs/9">Job</a>
+              <a href="/pricing">Pricing</a> <a href="https://other.com/careers">Other</a>"""
+    frontier = make_frontier()
+    frontier.add("https://a.com/careers")
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, text=page)))
+    asyncio.run(Crawler(frontier, client=client).crawl_batch())
+
+    assert set(frontier.pages) == {"https://a.com/careers", "https://a.com/careers/pm-123", "https://a.com/jobs/9"}
+    assert frontier.pages["https://a.com/jobs/9"].scope == "/careers"
+
+def test_api_crawl_endpoints_share_the_workers_persisted_frontier(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+    from apps.backend import storage
+    from apps.backend.api import sources
+    from apps.backend.main import app
+    from workers.crawler.main import load_frontier
+
+    monkeypatch.setattr(storage, "STORAGE_DIR", tmp_path)
+    monkeypatch.setattr(sources, "sites_db", {})
+    client = TestClient(app)
+    response = client.post("/sites/", json={"name": "Acme", "type": "company", "url": "https://acme.example/careers"})
+    assert response.status_code == 200
+
+    assert "https://acme.example/careers" in load_frontier().pages
+    assert client.get("/sites/crawl/stats").json()["pages"] == 1
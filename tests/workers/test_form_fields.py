@@ -0,0 +1,39 @@
+from workers.autofill.form_fields import match_fields, normalize
+
+# What DISCOVER_FIELDS_JS returns for a typical custom careers-page form
+FIELDS = [
+    {"selector": '[data-autofill-idx="0"]', "tag": "input", "type": "text", "name": "applicant[fname]",
+     "id": "fn", "label": "First Name *", "placeholder": "", "aria_label": "", "autocomplete": "given-name"},
+    {"selector": '[data-autofill-idx="1"]', "tag": "input", "type": "text", "name": "lastName",
+     "id": "", "label": "", "placeholder": "", "aria_label": "", "autocomplete": ""},
+    {"selector": '[data-autofill-idx="2"]', "tag": "input", "type": "email", "name": "contact",
+     "id": "", "label": "", "placeholder": "Email address", "aria_label": "", "autocomplete": ""},
+    {"selector": '[data-autofill-idx="3"]', "tag": "input", "type": "tel", "name": "q_17",
+     "id": "", "label": "Mobile", "placeholder": "", "aria_label": "", "autocomplete": ""},
+    {"selector": '[data-autofill-idx="4"]', "tag": "input", "type": "file", "name": "attachment",
+     "id": "", "label": "", "placeholder": "", "aria_label": "", "autocomplete": ""},
+    {"selector": '[data-autofill-idx="5"]', "tag": "textarea", "type": "textarea", "name": "resume_text",
+     "id": "", "label": "Paste resume", "placeholder": "", "aria_label": "", "autocomplete": ""},
+]
+
+
+def test_normalize_handles_camel_snake_and_punctuation():
+    assert normalize("firstName") == normalize("first_name") == normalize("First Name *") == "first name"
+
+
+def test_match_uses_attributes_labels_and_aliases():
+    """Keys resolve by name/id/autocomplete, then label/placeholder, then aliases"""
+    form_data = {"first_name": "Ada", "last_name": "Lovelace", "email": "a@b.co", "phone": "555",
+                 "resume": "/tmp/cv.pdf", "salary": "100k"}
+    resolved, missing = match_fields(FIELDS, form_data)
+
+    assert {key: field["selector"][-3] for key, field in resolved.items()} == {
+        "first_name": "0", "last_name": "1", "email": "2", "phone": "3", "resume": "4"}
+    assert missing == ["salary"]
+
+
+def test_known_ats_selectors_take_precedence():
+    """An ATS mapping hit wins over the heuristic and its field is not reused"""
+    resolved, missing = match_fields(FIELDS, {"email": "a@b.co", "phone": "555"}, known={"email": 3})
+    assert resolved["email"]["name"] == "q_17"
+    assert "phone" in missing
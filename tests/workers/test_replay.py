@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+from workers.autofill.ats_detector import ATSDetector, ATSType
+from workers.autofill.form_fields import match_fields
+from workers.autofill.html_form import parse_forms, pick_form, resolve_known
+from workers.autofill.replay import ReplayRouter, load_manifest
+
+FIXTURES = load_manifest()
+
+
+def test_manifest_fixtures_exist_and_detect_as_their_ats():
+    assert {fixture.ats for fixture in FIXTURES} == {"greenhouse", "lever", "ashby", "workday"}
+    for fixture in FIXTURES:
+        assert fixture.path.exists()
+        assert ATSDetector().detect_from_url(fixture.url) == ATSType(fixture.ats)
+
+
+@pytest.mark.parametrize("fixture", FIXTURES, ids=lambda fixture: fixture.name)
+def test_every_requested_field_resolves_on_recorded_forms(fixture):
+    """Regression guard for the matcher: each recorded form fills completely"""
+    detector = ATSDetector()
+    mappings = detector.get_field_mappings(detector.detect_from_url(fixture.url))
+    form = pick_form(parse_forms(fixture.path.read_text()))
+    fields = form.fields()
+    known = resolve_known(form, fields, mappings)
+
+    resolved, missing = match_fields(fields, fixture.form_data_with("/tmp/resume.pdf"), known)
+    assert missing == []
+    assert resolved["resume"]["type"] == "file"
+
+
+class FakeRequest:
+    def __init__(self, url):
+        self.url = url
+
+
+class FakeRoute:
+    def __init__(self, url):
+        self.request = FakeRequest(url)
+
+    async def fulfill(self, status, body, content_type=None):
+        self.status, self.body = status, body
+
+
+def test_router_serves_recorded_pages_and_refuses_everything_else():
+    router = ReplayRouter(FIXTURES)
+    page = FakeRoute("https://boards.greenhouse.io/acme/jobs/4012345?gh_src=linkedin")
+    other = FakeRoute("https://boards.cdn.greenhouse.io/assets/application.css")
+
+    async def run():
+        await router.handle(page)
+        await router.handle(other)
+
+    asyncio.run(run())
+    assert page.status == 200 and "application_form" in page.body
+    assert other.status == 404 and router.missed == [other.request.url]
+    assert router.served == 1
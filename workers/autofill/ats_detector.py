@@ -1,4 +1,4 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional
 from enum import Enum
 import re
 
@@ -34,41 +34,15 @@ class ATSDetector:
     
     def detect_from_url(self, url: str) -> ATSType:
         """Detect ATS type from URL"""
-        for ats_type, patterns in self.ATS_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, url, re.IGNORECASE):
-                    return ats_type
-        return ATSType.UNKNOWN
+        return url_classifier().classify(url)
     
     def detect_from_content(self, page_content: str) -> ATSType:
         """Detect ATS type from page content"""
-        content_lower = page_content.lower()
-        
-        # Workday indicators
-        if any(indicator in content_lower for indicator in [
-            "workday", "wd5", "myworkday"
-        ]):
-            return ATSType.WORKDAY
-        
-        # Greenhouse indicators
-        if any(indicator in content_lower for indicator in [
-            "greenhouse", "boards.greenhouse"
-        ]):
-            return ATSType.GREENHOUSE
-        
-        # Lever indicators
-        if any(indicator in content_lower for indicator in [
-            "lever", "jobs.lever"
-        ]):
-            return ATSType.LEVER
-        
-        # Ashby indicators
-        if any(indicator in content_lower for indicator in [
-            "ashby", "ashbyhq"
-        ]):
-            return ATSType.ASHBY
-        
-        return ATSType.UNKNOWN
+        return content_scanner().scan(page_content).ats_type
+    
+    def detect_from_chunks(self, chunks: Iterable[str]) -> ATSType:
+        """Detect ATS type from a page arriving in pieces, e.g. a streamed response"""
+        return content_scanner().scan_chunks(chunks).ats_type
     
     def get_field_mappings(self, ats_type: ATSType) -> Dict[str, str]:
         """Get field mappings for specific ATS"""
@@ -107,3 +81,288 @@ class ATSDetector:
         }
         
         return mappings.get(ats_type, {})
+
+
+# Hosts owned by each ATS; a URL matches its host or any subdomain of it
+ATS_HOSTS = {
+    "workday.com": ATSType.WORKDAY,
+    "myworkday.com": ATSType.WORKDAY,
+    "myworkdayjobs.com": ATSType.WORKDAY,
+    "boards.greenhouse.io": ATSType.GREENHOUSE,
+    "jobs.greenhouse.io": ATSType.GREENHOUSE,
+    "job-boards.greenhouse.io": ATSType.GREENHOUSE,
+    "lever.co": ATSType.LEVER,
+    "jobs.ashbyhq.com": ATSType.ASHBY,
+}
+
+# [scheme:][//]authority -- the authority still carries any user@ and :port
+URL_AUTHORITY = re.compile(r"(?:[a-zA-Z][a-zA-Z0-9+.-]*:)?(?://)?([^/?#]*)")
+
+_END = "$"
+
+
+class HostTrie:
+    """Suffix trie over reversed host labels: com -> myworkdayjobs -> $"""
+
+    def __init__(self, hosts: Dict[str, ATSType]):
+        self.root: Dict[str, Any] = {}
+        for host, ats_type in hosts.items():
+            node = self.root
+            for label in reversed(host.lower().split(".")):
+                node = node.setdefault(label, {})
+            node[_END] = ats_type
+
+    def lookup(self, host: str) -> Optional[ATSType]:
+        """Most specific registered suffix of `host`, walking at most a few labels"""
+        node, found = self.root, None
+        for label in reversed(host.split(".")):
+            node = node.get(label)
+            if node is None:
+                break
+            found = node.get(_END, found)
+        return found
+
+
+def _literal(pattern: str) -> Optional[str]:
+    """The plain string a regex matches, if it is just an escaped literal"""
+    text = re.sub(r"\\(.)", r"\1", pattern)
+    return text.lower() if re.escape(text) == pattern else None
+
+
+class ATSClassifier:
+    """Batch URL -> ATSType: one host parse and trie lookup per URL, then one
+    precompiled alternation of ATSDetector.ATS_PATTERNS over the rest of the URL
+    for ATS links carried in a path or query (redirects, embeds)"""
+
+    def __init__(self, hosts: Dict[str, ATSType] = ATS_HOSTS,
+                 patterns: Dict[ATSType, List[str]] = ATSDetector.ATS_PATTERNS):
+        self.trie = HostTrie(hosts)
+        self.types = {ats_type.value: ats_type for ats_type in patterns}
+        # Named group per ATS, matched against the lowercased URL; the earliest mention wins
+        self.rest_pattern = re.compile(
+            "|".join(f"(?P<{ats_type.value}>{'|'.join(rules)})" for ats_type, rules in patterns.items())
+        )
+        # When every rule is a literal, most URLs are ruled out by a few substring
+        # checks before the regex runs; drop literals that contain a shorter one
+        literals = [_literal(rule) for rules in patterns.values() for rule in rules]
+        self.prefilter: Optional[List[str]] = None
+        if literals and None not in literals:
+            self.prefilter = [l for l in literals if not any(o != l and o in l for o in literals)]
+
+    def _host(self, url: str):
+        match = URL_AUTHORITY.match(url)
+        host = match.group(1)
+        if "@" in host:
+            host = host.rpartition("@")[2]
+        if ":" in host:
+            host = host.partition(":")[0]
+        return host, match.end()
+
+    def classify(self, url: str, host_cache: Optional[Dict[str, Optional[ATSType]]] = None) -> ATSType:
+        host, rest = self._host(url)
+        if host_cache is None:
+            ats_type = self.trie.lookup(host.lower())
+        else:
+            ats_type = host_cache.get(host, _END)
+            if ats_type is _END:
+                ats_type = host_cache[host] = self.trie.lookup(host.lower())
+        if ats_type is not None:
+            return ats_type
+
+        lowered = url.lower()
+        if self.prefilter is not None:
+            for literal in self.prefilter:
+                if literal in lowered:
+                    break
+            else:
+                return ATSType.UNKNOWN
+        found = self.rest_pattern.search(lowered, rest)
+        return self.types[found.lastgroup] if found else ATSType.UNKNOWN
+
+    def classify_many(self, urls: Iterable[str]) -> List[ATSType]:
+        """Classify a batch; host lookups are shared across URLs on the same host"""
+        host_cache: Dict[str, Optional[ATSType]] = {}
+        classify = self.classify
+        return [classify(url, host_cache) for url in urls]
+
+
+_url_classifier: Optional[ATSClassifier] = None
+
+
+def url_classifier() -> ATSClassifier:
+    """Shared classifier, built on first use"""
+    global _url_classifier
+    if _url_classifier is None:
+        _url_classifier = ATSClassifier()
+    return _url_classifier
+
+
+def classify_many(urls: Iterable[str]) -> List[ATSType]:
+    return url_classifier().classify_many(urls)
+
+
+# (ATS, weight, pattern), matched against lowercased text at a word start. Hosts
+# seen in script src, form action or og:url are decisive; ATS-specific markup is
+# strong; the bare product name is only a hint, which is all "lever" (an ordinary
+# English word) ever gets.
+CONTENT_INDICATORS = [
+    (ATSType.WORKDAY, 5, r"myworkdayjobs\.com\b"),
+    (ATSType.WORKDAY, 5, r"myworkday\.com\b"),
+    (ATSType.WORKDAY, 5, r"workday\.com\b"),
+    (ATSType.WORKDAY, 3, r"data-automation-id\b"),
+    (ATSType.WORKDAY, 1, r"workday\b"),
+    (ATSType.GREENHOUSE, 5, r"greenhouse\.io\b"),
+    (ATSType.GREENHOUSE, 3, r"grnhse_(?:app|iframe)\b"),
+    (ATSType.GREENHOUSE, 3, r"gh_jid\b"),
+    (ATSType.GREENHOUSE, 1, r"greenhouse\b"),
+    (ATSType.LEVER, 5, r"lever\.co\b"),
+    (ATSType.LEVER, 3, r"lever-(?:jobs-embed|origin|source)\b"),
+    (ATSType.LEVER, 1, r"lever\b"),
+    (ATSType.ASHBY, 5, r"ashbyhq\.com\b"),
+    (ATSType.ASHBY, 3, r"ashby(?:_jid\b|-application-form|-job-posting)"),
+    (ATSType.ASHBY, 1, r"ashby\b"),
+]
+
+# Longer than any indicator match, so a match split across windows is seen whole
+CONTENT_OVERLAP = 128
+
+LEADING_LITERAL = re.compile(r"[a-z0-9_-]+")
+
+
+class ContentVerdict:
+    """Outcome of a content scan, with the evidence behind it"""
+
+    def __init__(self, ats_type: ATSType, scores: Dict[str, int], indicators: List[str],
+                 chars_scanned: int, stopped_early: bool):
+        self.ats_type = ats_type
+        self.scores = scores
+        self.indicators = indicators
+        self.chars_scanned = chars_scanned
+        self.stopped_early = stopped_early
+
+
+class _Tally:
+    def __init__(self, scanner: "ContentScanner"):
+        self.scanner = scanner
+        self.seen = set()
+        self.scores: Dict[ATSType, int] = {}
+        self.first_seen: Dict[ATSType, int] = {}
+        self.scanned = 0
+
+    def add(self, index: int, position: int) -> bool:
+        """Count an indicator once, however often it repeats; True once the verdict is certain"""
+        if index in self.seen:
+            return False
+        self.seen.add(index)
+        ats_type, weight, _ = self.scanner.indicators[index]
+        self.scores[ats_type] = self.scores.get(ats_type, 0) + weight
+        self.first_seen.setdefault(ats_type, position)
+        return self.certain()
+
+    def certain(self) -> bool:
+        """One ATS has host plus markup evidence and no other has anything beyond a hint"""
+        leader = max(self.scores.values(), default=0)
+        if leader < self.scanner.certain_score:
+            return False
+        return sum(1 for score in self.scores.values() if score >= self.scanner.min_score) == 1
+
+    def verdict(self, stopped_early: bool) -> ContentVerdict:
+        ranked = sorted(self.scores, key=lambda t: (-self.scores[t], self.first_seen[t]))
+        ats_type = ranked[0] if ranked and self.scores[ranked[0]] >= self.scanner.min_score else ATSType.UNKNOWN
+        return ContentVerdict(
+            ats_type=ats_type,
+            scores={t.value: score for t, score in self.scores.items()},
+            indicators=[self.scanner.indicators[i][2] for i in sorted(self.seen)],
+            chars_scanned=self.scanned,
+            stopped_early=stopped_early,
+        )
+
+
+class ContentScanner:
+    """Single-pass weighted ATS detection over page text.
+
+    One alternation of the indicators' leading keywords runs over bounded,
+    lowercased windows of the page (never a copy of the whole page); the rare
+    keyword hits are then verified against the full indicators anchored at that
+    spot. Work is linear in the page, memory is bounded by the window, and the
+    scan stops as soon as the verdict can no longer be in doubt.
+    """
+
+    def __init__(self, indicators=CONTENT_INDICATORS, min_score: int = 3, certain_score: int = 8,
+                 window: int = 1 << 16):
+        # Stronger indicators first, so 'greenhouse.io' is not counted as 'greenhouse'
+        self.indicators = sorted(indicators, key=lambda indicator: -indicator[1])
+        self.rules = [re.compile(r"\b" + rule) for _, _, rule in self.indicators]
+
+        keywords = {LEADING_LITERAL.match(rule).group(0) for _, _, rule in self.indicators}
+        keywords = {k for k in keywords if not any(o != k and k.startswith(o) for o in keywords)}
+        self.keyword_pattern = re.compile("|".join(sorted(map(re.escape, keywords), key=len, reverse=True)))
+        self.candidates = {
+            keyword: [i for i, (_, _, rule) in enumerate(self.indicators) if rule.startswith(keyword)]
+            for keyword in keywords
+        }
+        self.min_score = min_score
+        self.certain_score = certain_score
+        self.window = max(window, CONTENT_OVERLAP * 2)
+
+    def _feed(self, tally: _Tally, text: str, pos: int, final: bool, offset: int) -> bool:
+        """Scan lowercased `text` from `pos`; text[:pos] is context already scanned"""
+        limit = len(text) if final else len(text) - CONTENT_OVERLAP
+        for hit in self.keyword_pattern.finditer(text, pos):
+            # Near the end a longer indicator (or \b) may depend on text not seen yet;
+            # the next window starts early enough to judge it
+            start = hit.start()
+            if start >= limit:
+                break
+            for index in self.candidates[hit.group(0)]:
+                match = self.rules[index].match(text, start)
+                if match:
+                    if tally.add(index, offset + start):
+                        tally.scanned = offset + match.end()
+                        return True
+                    break
+        tally.scanned = offset + max(limit, pos)
+        return False
+
+    def scan(self, page: str) -> ContentVerdict:
+        """Scan a whole page held in memory"""
+        tally = _Tally(self)
+        for start in range(0, len(page), self.window):
+            end = min(len(page), start + self.window + CONTENT_OVERLAP)
+            # One character of left context keeps \b honest at the window edge
+            context = 1 if start else 0
+            window = page[start - context:end].lower()
+            if self._feed(tally, window, context, end == len(page), start - context):
+                return tally.verdict(stopped_early=True)
+        return tally.verdict(stopped_early=False)
+
+    def scan_chunks(self, chunks: Iterable[str]) -> ContentVerdict:
+        """Scan a page arriving in pieces; holds at most one chunk plus a short tail"""
+        tally = _Tally(self)
+        tail, offset, pos = "", 0, 0
+        for chunk in chunks:
+            if not chunk:
+                continue
+            buffer = tail + chunk.lower()
+            if self._feed(tally, buffer, pos, False, offset):
+                return tally.verdict(stopped_early=True)
+            # Keep what the next call must rescan, plus one character of context
+            keep = min(len(buffer), CONTENT_OVERLAP + 1)
+            if keep < len(buffer):
+                tail, offset, pos = buffer[-keep:], offset + len(buffer) - keep, 1
+            else:
+                tail = buffer
+        if tail:
+            self._feed(tally, tail, pos, True, offset)
+        return tally.verdict(stopped_early=False)
+
+
+_content_scanner: Optional[ContentScanner] = None
+
+
+def content_scanner() -> ContentScanner:
+    """Shared scanner, built on first use"""
+    global _content_scanner
+    if _content_scanner is None:
+        _content_scanner = ContentScanner()
+    return _content_scanner
@@ -0,0 +1,203 @@
+"""
+Single-pass form field discovery and matching for ATS autofill
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Shared in-page helpers: which controls count, a structural fingerprint of the
+# form (to detect redesigns) and the batched filler.
+_HELPERS = """
+  const skip = new Set(['hidden', 'submit', 'button', 'image', 'reset']);
+  const controls = () => Array.from(document.querySelectorAll('input, textarea, select')).filter(
+    (el) => !skip.has(fieldType(el)));
+  const fieldType = (el) => el.tagName === 'INPUT'
+    ? (el.getAttribute('type') || 'text').toLowerCase() : el.tagName.toLowerCase();
+  const fingerprint = () => {
+    let hash = 5381;
+    for (const el of controls()) {
+      const part = `${el.tagName}:${fieldType(el)}:${el.getAttribute('name') || ''};`;
+      for (let i = 0; i < part.length; i++) hash = ((hash << 5) + hash + part.charCodeAt(i)) | 0;
+    }
+    return (hash >>> 0).toString(16);
+  };
+  const fill = (items) => {
+    const errors = {};
+    const timings = {};
+    const fillOne = (item) => {
+      const el = document.querySelector(item.selector);
+      if (!el) return 'element disappeared';
+      const value = String(item.value);
+      if (el.tagName === 'SELECT') {
+        const wanted = value.trim().toLowerCase();
+        const option = Array.from(el.options).find(
+          (o) => o.value.trim().toLowerCase() === wanted || o.text.trim().toLowerCase() === wanted);
+        if (!option) return `no option matching ${value}`;
+        el.value = option.value;
+      } else if (el.type === 'checkbox' || el.type === 'radio') {
+        el.checked = !['', 'false', '0', 'no'].includes(value.trim().toLowerCase());
+      } else {
+        const proto = el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+        Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+      }
+      el.dispatchEvent(new Event('input', {bubbles: true}));
+      el.dispatchEvent(new Event('change', {bubbles: true}));
+      el.dispatchEvent(new Event('blur'));
+      return null;
+    };
+    for (const item of items) {
+      const started = performance.now();
+      const error = fillOne(item);
+      // Includes the page's own input/change handlers, which is where slow forms spend time
+      timings[item.key] = Math.round((performance.now() - started) * 10) / 10;
+      if (error) errors[item.key] = error;
+    }
+    return {errors: errors, timings: timings};
+  };
+"""
+
+# Runs in the page once: tags every fillable control with data-autofill-idx and
+# describes it; also resolves the ATS-specific selectors passed in as `known`.
+# `stable` is a selector that should survive a reload, used by the schema cache.
+DISCOVER_FIELDS_JS = "(known) => {" + _HELPERS + """
+  const text = (el) => (el ? el.textContent : '').replace(/\\s+/g, ' ').trim();
+  const labelFor = (el) => {
+    if (el.labels && el.labels.length) return text(el.labels[0]);
+    const by = el.getAttribute('aria-labelledby');
+    if (by) return by.split(/\\s+/).map((id) => text(document.getElementById(id))).join(' ').trim();
+    return text(el.closest('label'));
+  };
+  const unique = (selector) => {
+    try { return document.querySelectorAll(selector).length === 1; } catch (e) { return false; }
+  };
+  const stableSelector = (el, tag) => {
+    const candidates = [];
+    // Long digit runs usually mean a generated id that changes per render
+    if (el.id && !/\\d{4,}/.test(el.id)) candidates.push('#' + CSS.escape(el.id));
+    const name = el.getAttribute('name');
+    if (name) candidates.push(`${tag}[name="${CSS.escape(name)}"]`);
+    const automation = el.getAttribute('data-automation-id');
+    if (automation) candidates.push(`[data-automation-id="${CSS.escape(automation)}"]`);
+    return candidates.find(unique) || null;
+  };
+  const fields = controls().map((el, i) => {
+    const tag = el.tagName.toLowerCase();
+    const stable = stableSelector(el, tag);
+    el.setAttribute('data-autofill-idx', String(i));
+    return {
+      selector: `[data-autofill-idx="${i}"]`,
+      stable: stable,
+      tag: tag,
+      type: fieldType(el),
+      name: el.getAttribute('name') || '',
+      id: el.id || '',
+      label: labelFor(el),
+      placeholder: el.getAttribute('placeholder') || '',
+      aria_label: el.getAttribute('aria-label') || '',
+      autocomplete: el.getAttribute('autocomplete') || '',
+      accept: el.getAttribute('accept') || '',
+    };
+  });
+  const resolved = {};
+  for (const [key, selector] of Object.entries(known || {})) {
+    let el = null;
+    try { el = document.querySelector(selector); } catch (e) {}
+    if (el && el.hasAttribute('data-autofill-idx')) resolved[key] = Number(el.getAttribute('data-autofill-idx'));
+  }
+  return {fields: fields, known: resolved, fingerprint: fingerprint()};
+}
+"""
+
+# Fills every resolved text/select/checkbox control in one call, firing the
+# input/change events that React/Angular forms listen for. Returns
+# {errors: key -> error, timings: key -> ms}.
+FILL_FIELDS_JS = "(items) => {" + _HELPERS + "  return fill(items);\n}\n"
+
+# Schema cache hit: verify the form still has the learned shape, then fill,
+# all in one round trip. Returns {stale: true} without touching the form if not.
+CACHED_FILL_JS = "(plan) => {" + _HELPERS + """
+  if (fingerprint() !== plan.fingerprint) return {stale: true, errors: {}, timings: {}};
+  return Object.assign({stale: false}, fill(plan.items));
+}
+"""
+
+FILE_KEYS = {"resume", "cv", "cover_letter_file"}
+
+# Common spellings of the same form_data key on real forms
+ALIASES = {
+    "first_name": ["given name", "first", "fname", "given-name"],
+    "last_name": ["family name", "surname", "last", "lname", "family-name"],
+    "email": ["e-mail", "email address"],
+    "phone": ["tel", "telephone", "mobile", "phone number"],
+    "linkedin": ["linkedin profile", "linkedin url"],
+    "resume": ["cv", "resume/cv"],
+    "cover_letter": ["cover letter", "motivation"],
+}
+
+CAMEL = re.compile(r"([a-z0-9])([A-Z])")
+WORDS = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    """'firstName', 'first_name' and 'First Name *' all become 'first name'"""
+    return " ".join(WORDS.findall(CAMEL.sub(r"\1 \2", text or "").lower()))
+
+
+def _score(key: str, field: Dict[str, Any]) -> int:
+    names = {normalize(key)} | {normalize(alias) for alias in ALIASES.get(key, [])}
+    attributes = {normalize(field.get(attr, "")) for attr in ("name", "id", "autocomplete")}
+    descriptions = {normalize(field.get(attr, "")) for attr in ("label", "placeholder", "aria_label")}
+    attributes.discard("")
+    descriptions.discard("")
+
+    if names & attributes:
+        return 3
+    if names & descriptions:
+        return 2
+    for name in names:
+        tokens = set(name.split())
+        compact = name.replace(" ", "")
+        for description in descriptions | attributes:
+            if tokens <= set(description.split()):
+                return 1
+            # 'LinkedIn' normalizes to 'linked in'; compare long names without spaces
+            if len(compact) >= 6 and compact in description.replace(" ", ""):
+                return 1
+    return 0
+
+
+def match_fields(
+    fields: List[Dict[str, Any]],
+    form_data: Dict[str, Any],
+    known: Optional[Dict[str, int]] = None,
+) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """Resolve form_data keys to discovered fields; ATS mappings win, then best heuristic score"""
+    known = known or {}
+    resolved: Dict[str, Dict[str, Any]] = {}
+    taken = set()
+
+    for key in form_data:
+        index = known.get(key)
+        if index is not None and index < len(fields) and index not in taken:
+            resolved[key] = fields[index]
+            taken.add(index)
+
+    for key in form_data:
+        if key in resolved:
+            continue
+        wants_file = key in FILE_KEYS
+        best, best_score = None, 0
+        for index, field in enumerate(fields):
+            if index in taken or (field["type"] == "file") != wants_file:
+                continue
+            score = _score(key, field)
+            if score > best_score:
+                best, best_score = index, score
+        # A resume upload is usually the only file input, even when unlabeled
+        if best is None and wants_file:
+            best = next((i for i, f in enumerate(fields) if f["type"] == "file" and i not in taken), None)
+        if best is not None:
+            resolved[key] = fields[best]
+            taken.add(best)
+
+    missing = [key for key in form_data if key not in resolved]
+    return resolved, missing
@@ -0,0 +1,198 @@
+"""
+Static HTML form parsing for browser-free ATS submission
+"""
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional
+
+# Markup that means a human check stands between us and the POST
+CAPTCHA_MARKERS = (
+    "g-recaptcha",
+    "recaptcha/api.js",
+    "h-captcha",
+    "hcaptcha.com",
+    "cf-turnstile",
+    "challenges.cloudflare.com",
+    "data-sitekey",
+)
+
+SKIP_TYPES = {"hidden", "submit", "button", "image", "reset"}
+
+# The subset of CSS used by ATSDetector mappings: tag[attr='v'][attr*='v']
+SELECTOR = re.compile(r"^(\w+)?((?:\[[\w-]+\*?='[^']*'\])*)$")
+ATTRIBUTE = re.compile(r"\[([\w-]+)(\*?=)'([^']*)'\]")
+
+
+class StaticForm:
+    """A <form> as served, before any script runs. `detached` collects controls outside any <form>"""
+
+    def __init__(self, attrs: Dict[str, Optional[str]], detached: bool = False):
+        self.attrs = attrs
+        self.detached = detached
+        self.action = attrs.get("action") or ""
+        self.method = (attrs.get("method") or "get").lower()
+        self.enctype = (attrs.get("enctype") or "application/x-www-form-urlencoded").lower()
+        self.controls: List[Dict[str, Any]] = []
+
+    @property
+    def multipart(self) -> bool:
+        return self.enctype == "multipart/form-data"
+
+    def fields(self) -> List[Dict[str, Any]]:
+        """Fillable controls in the shape DISCOVER_FIELDS_JS returns, plus `control` (index)"""
+        return [
+            {
+                "control": index,
+                "tag": control["tag"],
+                "type": control["type"],
+                "name": control["name"],
+                "id": control["id"],
+                "label": control["label"],
+                "placeholder": control["attrs"].get("placeholder") or "",
+                "aria_label": control["attrs"].get("aria-label") or "",
+                "autocomplete": control["attrs"].get("autocomplete") or "",
+                "accept": control["attrs"].get("accept") or "",
+                "required": control["required"],
+            }
+            for index, control in enumerate(self.controls) if control["type"] not in SKIP_TYPES
+        ]
+
+
+class _FormParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.forms: List[StaticForm] = []
+        self.labels: Dict[str, str] = {}
+        self._form: Optional[StaticForm] = None
+        self.detached = StaticForm({}, detached=True)
+        self._label: Optional[List[Any]] = None
+        self._select: Optional[Dict[str, Any]] = None
+        self._option: Optional[Dict[str, Any]] = None
+        self._textarea: Optional[Dict[str, Any]] = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "form":
+            self._form = StaticForm(attrs)
+            self.forms.append(self._form)
+        elif tag == "label":
+            self._label = [attrs.get("for"), ""]
+        elif tag == "option" and self._select is not None:
+            self._option = {"value": attrs.get("value"), "text": "", "selected": "selected" in attrs}
+            self._select["options"].append(self._option)
+        elif tag in ("input", "textarea", "select"):
+            kind = (attrs.get("type") or "text").lower() if tag == "input" else tag
+            control = {
+                "tag": tag,
+                "type": kind,
+                "name": attrs.get("name") or "",
+                "id": attrs.get("id") or "",
+                "value": attrs.get("value") or ("on" if kind in ("checkbox", "radio") else ""),
+                "checked": "checked" in attrs,
+                "required": "required" in attrs,
+                "disabled": "disabled" in attrs,
+                "options": [],
+                "attrs": attrs,
+                "_label": self._label,
+            }
+            (self._form or self.detached).controls.append(control)
+            if tag == "select":
+                self._select = control
+            elif tag == "textarea":
+                control["value"] = ""
+                self._textarea = control
+
+    def handle_endtag(self, tag):
+        if tag == "form":
+            self._form = None
+        elif tag == "label" and self._label is not None:
+            if self._label[0]:
+                self.labels[self._label[0]] = self._label[1]
+            self._label = None
+        elif tag == "select":
+            self._select = self._option = None
+        elif tag == "option":
+            self._option = None
+        elif tag == "textarea":
+            self._textarea = None
+
+    def handle_data(self, data):
+        if self._label is not None:
+            self._label[1] += data
+        if self._option is not None:
+            self._option["text"] += data
+        if self._textarea is not None:
+            self._textarea["value"] += data
+
+
+def _clean(text: str) -> str:
+    return " ".join((text or "").split())
+
+
+def parse_forms(html: str) -> List[StaticForm]:
+    """Every <form> in the page with its controls, labels resolved, plus a detached
+    form for controls outside any <form> (script-driven pages)"""
+    parser = _FormParser()
+    parser.feed(html)
+    parser.close()
+    if parser.detached.controls:
+        parser.forms.append(parser.detached)
+    for form in parser.forms:
+        for control in form.controls:
+            wrapping = control.pop("_label")
+            control["label"] = _clean(parser.labels.get(control["id"]) or (wrapping[1] if wrapping else ""))
+            for option in control["options"]:
+                option["text"] = _clean(option["text"])
+                if option["value"] is None:
+                    option["value"] = option["text"]
+    return parser.forms
+
+
+def matches_selector(selector: str, field: Dict[str, Any], attrs: Dict[str, Optional[str]]) -> bool:
+    """Evaluate an ATSDetector mapping against a parsed control; unsupported CSS never matches"""
+    parsed = SELECTOR.match(selector.strip())
+    if parsed is None:
+        return False
+    tag, conditions = parsed.groups()
+    if tag and tag != field["tag"]:
+        return False
+    for name, op, value in ATTRIBUTE.findall(conditions):
+        actual = field["type"] if name == "type" else attrs.get(name)
+        if actual is None or (actual != value if op == "=" else value not in actual):
+            return False
+    return True
+
+
+def resolve_known(form: StaticForm, fields: List[Dict[str, Any]], mappings: Dict[str, str]) -> Dict[str, int]:
+    """form_data key -> index into `fields` for each ATS mapping that matches a control"""
+    known = {}
+    for key, selector in mappings.items():
+        for index, field in enumerate(fields):
+            if matches_selector(selector, field, form.controls[field["control"]]["attrs"]):
+                known[key] = index
+                break
+    return known
+
+
+def pick_form(forms: List[StaticForm]) -> Optional[StaticForm]:
+    """The application form: the one with the most fillable controls"""
+    best = max(forms, key=lambda form: len(form.fields()), default=None)
+    return best if best is not None and best.fields() else None
+
+
+def browser_required(html: str, form: Optional[StaticForm], needs_upload: bool = False) -> Optional[str]:
+    """Why this page can't be submitted as a plain HTTP POST, or None if it can"""
+    lowered = html.lower()
+    if any(marker in lowered for marker in CAPTCHA_MARKERS):
+        return "captcha"
+    if form is None:
+        return "form is rendered by JavaScript"
+    if form.detached:
+        return "fields are not inside a <form>"
+    if form.method != "post":
+        return f"form method is {form.method.upper()}"
+    if form.action.lower().startswith("javascript:") or form.attrs.get("onsubmit"):
+        return "form submits through JavaScript"
+    if needs_upload and not form.multipart:
+        return "form does not accept file uploads"
+    return None
@@ -0,0 +1,101 @@
+"""
+Autofill worker: drains the task queue with N concurrent slots over one browser pool
+"""
+import asyncio
+import os
+import socket
+from typing import Any, Dict, Optional
+
+from .task_queue import TaskQueue, COMPLETED
+
+
+class AutofillWorker:
+    """Runs `concurrency` claim -> fill -> ack loops against a shared ATS service"""
+
+    def __init__(self, queue: TaskQueue, service: Any, concurrency: int = 2,
+                 visibility_timeout: float = 300.0, poll_interval: float = 2.0,
+                 worker_id: Optional[str] = None, direct_submit: bool = False):
+        self.queue = queue
+        self.service = service
+        self.concurrency = concurrency
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        # Submit simple forms over HTTP (falling back to the browser) instead of only filling them
+        self.direct_submit = direct_submit
+        self.stats = {"completed": 0, "retried": 0, "failed": 0}
+
+    async def _heartbeat(self, task_id: str, slot_id: str) -> None:
+        """Keep the lease alive for long fills so no other worker steals the task"""
+        while True:
+            await asyncio.sleep(self.visibility_timeout / 3)
+            self.queue.extend(task_id, slot_id, self.visibility_timeout)
+
+    async def process(self, task: Dict[str, Any], slot_id: str) -> str:
+        """Fill one task; transient automation errors are retried, form-level misses are not"""
+        heartbeat = asyncio.create_task(self._heartbeat(task["id"], slot_id))
+        try:
+            if self.direct_submit:
+                result = await self.service.submit_application(task["url"], task["payload"])
+            else:
+                result = await self.service.fill_application_form(task["url"], task["payload"])
+        except Exception as e:
+            result = {"success": False, "errors": [f"ATS automation failed: {str(e)}"]}
+        finally:
+            heartbeat.cancel()
+
+        # fill_application_form only omits filled_fields when navigation/browser setup failed
+        if "filled_fields" not in result:
+            status = self.queue.fail(task["id"], "; ".join(result.get("errors", [])) or "unknown error")
+            self.stats["retried" if status != "failed" else "failed"] += 1
+            return status
+
+        self.queue.complete(task["id"], result)
+        self.stats["completed"] += 1
+        return COMPLETED
+
+    async def _slot(self, slot: int, stop: asyncio.Event, drain: bool) -> None:
+        slot_id = f"{self.worker_id}/{slot}"
+        while not stop.is_set():
+            task = self.queue.claim(slot_id, self.visibility_timeout)
+            if task is None:
+                if drain:
+                    return
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self.process(task, slot_id)
+
+    async def run(self, stop: Optional[asyncio.Event] = None, drain: bool = False) -> Dict[str, int]:
+        """Run until `stop` is set, or until no task is ready when `drain` is true"""
+        stop = stop or asyncio.Event()
+        await asyncio.gather(*(self._slot(slot, stop, drain) for slot in range(self.concurrency)))
+        return self.stats
+
+
+def main() -> None:
+    from apps.backend.config.settings import settings
+    from apps.backend.services.ats_service import ats_service
+
+    queue = TaskQueue(settings.autofill_queue_path)
+    worker = AutofillWorker(
+        queue,
+        ats_service,
+        concurrency=settings.autofill_concurrency,
+        visibility_timeout=settings.autofill_visibility_timeout,
+        direct_submit=settings.ats_direct_submit,
+    )
+
+    async def loop():
+        try:
+            await worker.run()
+        finally:
+            await ats_service.pool.stop()
+
+    asyncio.run(loop())
+
+
+if __name__ == "__main__":
+    main()
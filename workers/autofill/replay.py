@@ -0,0 +1,78 @@
+"""
+Offline replay of recorded ATS application pages for autofill benchmarks and tests
+"""
+import json
+import pathlib
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+FIXTURES_DIR = pathlib.Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "ats_forms"
+
+
+class ReplayFixture:
+    """One recorded application page and the form_data used to fill it"""
+
+    def __init__(self, name: str, ats: str, url: str, path: pathlib.Path,
+                 form_data: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.ats = ats
+        self.url = url
+        self.path = path
+        self.form_data = form_data or {}
+
+    def form_data_with(self, resume_path: str) -> Dict[str, Any]:
+        return {key: resume_path if value == "{resume}" else value for key, value in self.form_data.items()}
+
+
+def load_manifest(directory: pathlib.Path = FIXTURES_DIR) -> List[ReplayFixture]:
+    """Fixtures listed in <directory>/manifest.json"""
+    directory = pathlib.Path(directory)
+    entries = json.loads((directory / "manifest.json").read_text())
+    return [
+        ReplayFixture(
+            name=entry["name"],
+            ats=entry["ats"],
+            url=entry["url"],
+            path=directory / entry["file"],
+            form_data=entry.get("form_data", {}),
+        )
+        for entry in entries
+    ]
+
+
+def _page_key(url: str) -> str:
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path.rstrip("/"), "", ""))
+
+
+class ReplayRouter:
+    """Context route that serves recorded pages at their real ATS URLs.
+
+    HAR recordings, if given, are consulted first via route_from_har; anything
+    neither recorded nor in a HAR gets an empty 404, so a run never touches the network.
+    """
+
+    def __init__(self, fixtures: Iterable[ReplayFixture], har_paths: Iterable[str] = ()):
+        self.pages = {_page_key(fixture.url): fixture.path for fixture in fixtures}
+        self.har_paths = list(har_paths)
+        self.served = 0
+        self.missed: List[str] = []
+
+    async def install(self, context) -> None:
+        """Install on a BrowserContext; usable as BrowserPool(context_setup=...)"""
+        # Later routes run first, so HARs get the first chance and fall back to us
+        await context.route("**/*", self.handle)
+        for har_path in self.har_paths:
+            await context.route_from_har(har_path, not_found="fallback")
+
+    def lookup(self, url: str) -> Optional[pathlib.Path]:
+        return self.pages.get(_page_key(url))
+
+    async def handle(self, route) -> None:
+        path = self.lookup(route.request.url)
+        if path is None:
+            self.missed.append(route.request.url)
+            await route.fulfill(status=404, body="")
+            return
+        self.served += 1
+        await route.fulfill(status=200, content_type="text/html; charset=utf-8", body=path.read_text())
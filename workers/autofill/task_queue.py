@@ -0,0 +1,171 @@
+"""
+Durable autofill task queue backed by SQLite
+"""
+import json
+import pathlib
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+from typing import Any, Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    job_id TEXT,
+    url TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_expires REAL,
+    worker_id TEXT,
+    result TEXT,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (status, available_at);
+"""
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+class TaskQueue:
+    """At-least-once queue: claimed tasks reappear if their lease expires before ack"""
+
+    def __init__(self, path: str, backoff_base: float = 30.0, backoff_max: float = 3600.0):
+        self.path = path
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _row(self, row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        task = dict(row)
+        task["payload"] = json.loads(task["payload"])
+        task["result"] = json.loads(task["result"]) if task["result"] else None
+        return task
+
+    def enqueue(self, url: str, payload: Dict[str, Any], job_id: Optional[str] = None,
+                max_attempts: int = 3, delay: float = 0.0) -> str:
+        """Add a task and return its id"""
+        task_id = uuid.uuid4().hex
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT INTO tasks (id, job_id, url, payload, status, max_attempts, available_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (task_id, job_id, url, json.dumps(payload), QUEUED, max_attempts, now + delay, now, now),
+            )
+        return task_id
+
+    def claim(self, worker_id: str, visibility_timeout: float = 300.0,
+              now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Lease the oldest ready task (or one whose previous lease expired)"""
+        now = time.time() if now is None else now
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # A task whose lease ran out on its last attempt crashed or hung the worker every
+            # time; fail it instead of handing it out again
+            conn.execute(
+                "UPDATE tasks SET status = ?, last_error = ?, lease_expires = NULL, updated_at = ? "
+                "WHERE status = ? AND lease_expires <= ? AND attempts >= max_attempts",
+                (FAILED, "lease expired on the final attempt", now, RUNNING, now),
+            )
+            row = conn.execute(
+                "SELECT id FROM tasks WHERE (status = ? AND available_at <= ?) "
+                "OR (status = ? AND lease_expires <= ?) ORDER BY available_at LIMIT 1",
+                (QUEUED, now, RUNNING, now),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            conn.execute(
+                "UPDATE tasks SET status = ?, attempts = attempts + 1, lease_expires = ?, "
+                "worker_id = ?, updated_at = ? WHERE id = ?",
+                (RUNNING, now + visibility_timeout, worker_id, now, row["id"]),
+            )
+            task = conn.execute("SELECT * FROM tasks WHERE id = ?", (row["id"],)).fetchone()
+            conn.execute("COMMIT")
+            return self._row(task)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def extend(self, task_id: str, worker_id: str, visibility_timeout: float = 300.0) -> bool:
+        """Heartbeat: push the lease out while the task is still being worked on"""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET lease_expires = ?, updated_at = ? WHERE id = ? AND worker_id = ? AND status = ?",
+                (now + visibility_timeout, now, task_id, worker_id, RUNNING),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, task_id: str, result: Dict[str, Any]) -> None:
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE tasks SET status = ?, result = ?, lease_expires = NULL, updated_at = ? WHERE id = ?",
+                (COMPLETED, json.dumps(result, default=str), now, task_id),
+            )
+
+    def fail(self, task_id: str, error: str, now: Optional[float] = None) -> str:
+        """Record a failed attempt; requeue with exponential backoff or give up. Returns the new status"""
+        now = time.time() if now is None else now
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT attempts, max_attempts FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if row is None:
+                return FAILED
+            if row["attempts"] >= row["max_attempts"]:
+                status, available_at = FAILED, now
+            else:
+                status = QUEUED
+                available_at = now + min(self.backoff_max, self.backoff_base * 2 ** (row["attempts"] - 1))
+            conn.execute(
+                "UPDATE tasks SET status = ?, last_error = ?, available_at = ?, lease_expires = NULL, "
+                "updated_at = ? WHERE id = ?",
+                (status, error, available_at, now, task_id),
+            )
+        return status
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with closing(self._connect()) as conn:
+            return self._row(conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone())
+
+    def list(self, status: Optional[str] = None, job_id: Optional[str] = None,
+             limit: int = 100) -> List[Dict[str, Any]]:
+        query, params = "SELECT * FROM tasks WHERE 1 = 1", []
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        if job_id:
+            query += " AND job_id = ?"
+            params.append(job_id)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        with closing(self._connect()) as conn:
+            return [self._row(row) for row in conn.execute(query, params).fetchall()]
+
+    def counts(self) -> Dict[str, int]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM tasks GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
@@ -0,0 +1 @@
+# Crawler worker package
@@ -0,0 +1,315 @@
+"""
+Polite crawl frontier for company career pages and ATS boards
+"""
+import heapq
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+
+# Query parameters that only carry attribution and never change page content
+TRACKING_PARAMS = {
+    "gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "_hsenc", "_hsmi",
+    "ref", "referrer", "src", "source", "trk", "trkinfo", "gh_src", "lever-source",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+USER_AGENT = "CareerAutopilotBot/0.1 (+https://github.com/cchava-1997/career-autopilot-starter)"
+
+
+def canonicalize_url(url: str) -> str:
+    """Return a canonical form of a URL for dedupe and scheduling"""
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "https").lower()
+    host = (parts.hostname or "").lower().rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+
+    netloc = host
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+
+    path = parts.path or "/"
+    while "//" in path:
+        path = path.replace("//", "/")
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/")
+
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    query.sort()
+
+    return urlunsplit((scheme, netloc, path, urlencode(query), ""))
+
+
+def domain_of(url: str) -> str:
+    """Return the politeness key (host) for a URL"""
+    return urlsplit(url).netloc.lower()
+
+
+class RobotsCache:
+    """Cache of parsed robots.txt rules and crawl delays per host"""
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Tuple[int, str]],
+        ttl: float = 24 * 3600,
+        default_delay: float = 5.0,
+        user_agent: str = USER_AGENT,
+    ):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.default_delay = default_delay
+        self.user_agent = user_agent
+        self._entries: Dict[str, Tuple[float, Optional[RobotFileParser]]] = {}
+        # host -> (fetched_at, robots_url, status, text), what to_dict() persists
+        self._responses: Dict[str, Tuple[float, str, int, str]] = {}
+
+    @staticmethod
+    def _parse(robots_url: str, status: int, text: str) -> Optional[RobotFileParser]:
+        parser: Optional[RobotFileParser] = RobotFileParser(robots_url)
+        if status in (401, 403):
+            parser.disallow_all = True
+        elif 200 <= status < 300:
+            parser.parse(text.splitlines())
+        else:
+            # Missing or unreachable robots.txt means no restrictions
+            parser = None
+        return parser
+
+    def _parser(self, url: str, now: float) -> Optional[RobotFileParser]:
+        parts = urlsplit(url)
+        host = parts.netloc.lower()
+        cached = self._entries.get(host)
+        if cached and now - cached[0] < self.ttl:
+            return cached[1]
+
+        robots_url = f"{parts.scheme}://{parts.netloc}/robots.txt"
+        try:
+            status, text = self.fetch(robots_url)
+        except Exception:
+            status, text = 0, ""
+
+        parser = self._parse(robots_url, status, text)
+        self._entries[host] = (now, parser)
+        self._responses[host] = (now, robots_url, status, text)
+        return parser
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {host: list(response) for host, response in self._responses.items()}
+
+    def load_dict(self, data: Dict[str, Any]) -> None:
+        """Restore robots.txt responses saved with `to_dict`, keeping any fetched more recently"""
+        for host, (fetched_at, robots_url, status, text) in data.items():
+            if host not in self._responses or self._responses[host][0] < fetched_at:
+                self._responses[host] = (fetched_at, robots_url, status, text)
+                self._entries[host] = (fetched_at, self._parse(robots_url, status, text))
+
+    def allowed(self, url: str, now: Optional[float] = None) -> bool:
+        """Check whether robots.txt permits fetching the URL"""
+        parser = self._parser(url, time.time() if now is None else now)
+        return parser is None or parser.can_fetch(self.user_agent, url)
+
+    def crawl_delay(self, url: str, now: Optional[float] = None) -> float:
+        """Seconds to wait between requests to the URL's host"""
+        parser = self._parser(url, time.time() if now is None else now)
+        delay = parser.crawl_delay(self.user_agent) if parser else None
+        return max(float(delay), self.default_delay) if delay is not None else self.default_delay
+
+
+class PageState:
+    """Crawl history for a single canonical URL"""
+
+    def __init__(self, url: str, priority: int = 0, interval: float = 24 * 3600, scope: str = "/"):
+        self.url = url
+        self.priority = priority
+        # Path prefix the page's discovered links must stay under (see crawler.in_scope)
+        self.scope = scope
+        self.interval = interval
+        self.next_crawl = 0.0
+        self.last_crawl: Optional[float] = None
+        self.checks = 0
+        self.changes = 0
+        self.content_hash: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PageState":
+        state = cls(data["url"])
+        state.__dict__.update(data)
+        return state
+
+
+class CrawlFrontier:
+    """Per-domain priority queues with politeness delays and change-driven recrawl"""
+
+    def __init__(
+        self,
+        robots: RobotsCache,
+        min_interval: float = 3600,
+        max_interval: float = 7 * 24 * 3600,
+        initial_interval: float = 24 * 3600,
+        max_pages_per_domain: int = 200,
+    ):
+        self.robots = robots
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = initial_interval
+        self.max_pages_per_domain = max_pages_per_domain
+        self.pages: Dict[str, PageState] = {}
+        # domain -> heap of (next_crawl, -priority, seq, url)
+        self._queues: Dict[str, List[Tuple[float, int, int, str]]] = {}
+        # domain -> earliest time the next request to it is polite
+        self._domain_ready: Dict[str, float] = {}
+        self._in_flight: Dict[str, str] = {}
+        self._page_counts: Dict[str, int] = {}
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def _push(self, state: PageState) -> None:
+        self._seq += 1
+        queue = self._queues.setdefault(domain_of(state.url), [])
+        heapq.heappush(queue, (state.next_crawl, -state.priority, self._seq, state.url))
+
+    def add(self, url: str, priority: int = 0, scope: Optional[str] = None) -> bool:
+        """Add a URL; returns False if its canonical form is already known.
+
+        `scope` is the path prefix links found on the page must stay under; it
+        defaults to the URL's own path, so a seed scopes everything crawled from it.
+        """
+        canonical = canonicalize_url(url)
+        existing = self.pages.get(canonical)
+        if existing:
+            if priority > existing.priority:
+                existing.priority = priority
+                self._push(existing)
+            return False
+
+        domain = domain_of(canonical)
+        if self._page_counts.get(domain, 0) >= self.max_pages_per_domain:
+            return False
+
+        self._page_counts[domain] = self._page_counts.get(domain, 0) + 1
+        state = PageState(canonical, priority=priority, interval=self.initial_interval,
+                          scope=scope or urlsplit(canonical).path)
+        self.pages[canonical] = state
+        self._push(state)
+        return True
+
+    def seed_sites(self, sites: List[Any], types: Tuple[str, ...] = ("company", "ats")) -> int:
+        """Seed the frontier from enabled job sources of the given types"""
+        added = 0
+        for site in sites:
+            site_type = getattr(site.type, "value", site.type)
+            if site.enabled and site_type in types and self.add(site.url, priority=1):
+                added += 1
+        return added
+
+    def next_batch(self, budget: int, now: Optional[float] = None) -> List[str]:
+        """Pop up to `budget` due URLs, at most one per domain, honoring crawl delays"""
+        now = time.time() if now is None else now
+        batch: List[str] = []
+
+        # Least recently served domains first so no site starves under a small budget
+        for domain in sorted(self._queues, key=lambda d: self._domain_ready.get(d, 0.0)):
+            queue = self._queues[domain]
+            if len(batch) >= budget:
+                break
+            if domain in self._in_flight or self._domain_ready.get(domain, 0.0) > now:
+                continue
+
+            while queue:
+                next_crawl, neg_priority, _, url = queue[0]
+                state = self.pages.get(url)
+                # Drop stale heap entries left behind by priority bumps or reschedules
+                if state is None or state.next_crawl != next_crawl or -neg_priority != state.priority:
+                    heapq.heappop(queue)
+                    continue
+                if next_crawl > now:
+                    break
+
+                heapq.heappop(queue)
+                if not self.robots.allowed(url, now):
+                    del self.pages[url]
+                    self._page_counts[domain] -= 1
+                    continue
+
+                self._in_flight[domain] = url
+                batch.append(url)
+                break
+
+        return batch
+
+    def record_fetch(self, url: str, content_hash: Optional[str], now: Optional[float] = None) -> PageState:
+        """Record a completed fetch and schedule the page's next recrawl"""
+        now = time.time() if now is None else now
+        state = self.pages[canonicalize_url(url)]
+        domain = domain_of(state.url)
+        self._in_flight.pop(domain, None)
+        self._domain_ready[domain] = now + self.robots.crawl_delay(state.url, now)
+
+        changed = state.content_hash is not None and content_hash != state.content_hash
+        state.checks += 1
+        if changed:
+            state.changes += 1
+            state.interval = max(self.min_interval, state.interval / 2)
+        elif state.content_hash is not None:
+            state.interval = min(self.max_interval, state.interval * 1.5)
+        state.content_hash = content_hash
+        state.last_crawl = now
+        state.next_crawl = now + state.interval
+        self._push(state)
+        return state
+
+    def record_failure(self, url: str, now: Optional[float] = None) -> None:
+        """Release the domain after a failed fetch and retry the page later"""
+        now = time.time() if now is None else now
+        state = self.pages[canonicalize_url(url)]
+        domain = domain_of(state.url)
+        self._in_flight.pop(domain, None)
+        self._domain_ready[domain] = now + self.robots.crawl_delay(state.url, now)
+        state.next_crawl = now + self.min_interval
+        self._push(state)
+
+    def release(self, url: str, now: Optional[float] = None) -> None:
+        """Fail a fetch that ended without record_fetch/record_failure, so its domain never stays in flight"""
+        state = self.pages.get(canonicalize_url(url))
+        if state is not None and self._in_flight.get(domain_of(state.url)) == state.url:
+            self.record_failure(url, now)
+
+    def stats(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Summary counts for monitoring"""
+        now = time.time() if now is None else now
+        return {
+            "pages": len(self.pages),
+            "domains": len(self._queues),
+            "due": sum(1 for state in self.pages.values() if state.next_crawl <= now),
+            "in_flight": len(self._in_flight),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "pages": [state.to_dict() for state in self.pages.values()],
+            "domain_ready": dict(self._domain_ready),
+            "robots": self.robots.to_dict(),
+        }
+
+    def load_dict(self, data: Dict[str, Any]) -> None:
+        """Restore pages and politeness state saved with `to_dict`"""
+        for item in data.get("pages", []):
+            state = PageState.from_dict(item)
+            domain = domain_of(state.url)
+            self._page_counts[domain] = self._page_counts.get(domain, 0) + 1
+            self.pages[state.url] = state
+            self._push(state)
+        self._domain_ready.update(data.get("domain_ready", {}))
+        self.robots.load_dict(data.get("robots", {}))
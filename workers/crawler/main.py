@@ -0,0 +1,179 @@
+"""
+Crawl worker: drains the frontier with a fixed number of concurrent fetches
+"""
+import asyncio
+import hashlib
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+import httpx
+
+from .frontier import USER_AGENT, CrawlFrontier, RobotsCache, domain_of
+
+WHITESPACE = re.compile(r"\s+")
+SCRIPT_STYLE = re.compile(r"<(script|style)\b.*?</\1>", re.IGNORECASE | re.DOTALL)
+TAGS = re.compile(r"<[^>]+>")
+# Paths that look like career pages or job postings, followed from any page of a site
+CAREER_PATH = re.compile(r"career|job|opening|position|vacanc|join|hiring|apply|work-with-us", re.IGNORECASE)
+
+# Storage name of the frontier this worker and the backend's /sites/crawl endpoints share
+FRONTIER_STORE = "crawl_frontier"
+
+
+class LinkExtractor(HTMLParser):
+    """Collect href targets from anchor tags"""
+
+    def __init__(self):
+        super().__init__()
+        self.links: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            href = dict(attrs).get("href")
+            if href:
+                self.links.append(href)
+
+
+def content_hash(html: str) -> str:
+    """Hash of the visible page text, ignoring markup, scripts and whitespace churn"""
+    text = TAGS.sub(" ", SCRIPT_STYLE.sub(" ", html))
+    text = WHITESPACE.sub(" ", text).strip().lower()
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def in_scope(url: str, scope: str) -> bool:
+    """Whether a discovered link is worth crawling: under the `scope` path prefix of the
+    page it was found on (unless that is the site root), or a career/job-looking path"""
+    path = urlsplit(url).path or "/"
+    scope = scope.rstrip("/")
+    if scope and (path == scope or path.startswith(scope + "/")):
+        return True
+    return bool(CAREER_PATH.search(path))
+
+
+def extract_links(base_url: str, html: str) -> List[str]:
+    """Same-host http(s) links found on a page"""
+    parser = LinkExtractor()
+    try:
+        parser.feed(html)
+    except Exception:
+        return []
+
+    host = domain_of(base_url)
+    links = []
+    for href in parser.links:
+        absolute = urljoin(base_url, href)
+        if urlsplit(absolute).scheme in ("http", "https") and domain_of(absolute) == host:
+            links.append(absolute)
+    return links
+
+
+def fetch_robots(url: str) -> Tuple[int, str]:
+    """Blocking robots.txt fetch used by RobotsCache"""
+    response = httpx.get(url, headers={"User-Agent": USER_AGENT}, timeout=10, follow_redirects=True)
+    return response.status_code, response.text
+
+
+class Crawler:
+    """Fetches due pages from the frontier with a fixed worker budget"""
+
+    def __init__(self, frontier: CrawlFrontier, workers: int = 8, client: Optional[httpx.AsyncClient] = None):
+        self.frontier = frontier
+        self.workers = workers
+        self.client = client
+
+    async def _fetch(self, client: httpx.AsyncClient, url: str) -> Dict[str, Any]:
+        try:
+            return await self._fetch_page(client, url)
+        finally:
+            # No-op after record_fetch/record_failure; otherwise an unexpected error would pin the domain
+            self.frontier.release(url)
+
+    async def _fetch_page(self, client: httpx.AsyncClient, url: str) -> Dict[str, Any]:
+        try:
+            response = await client.get(url)
+        except httpx.HTTPError as e:
+            self.frontier.record_failure(url)
+            return {"url": url, "ok": False, "error": str(e)}
+
+        if response.status_code >= 400:
+            self.frontier.record_failure(url)
+            return {"url": url, "ok": False, "status_code": response.status_code}
+
+        previous = self.frontier.pages[url].content_hash
+        digest = content_hash(response.text)
+        state = self.frontier.record_fetch(url, digest)
+
+        # Discovered pages inherit the scope, so a crawl stays within the seed's careers section
+        scope = self.frontier.pages[url].scope
+        discovered = 0
+        for link in extract_links(str(response.url), response.text):
+            if in_scope(link, scope) and self.frontier.add(link, scope=scope):
+                discovered += 1
+
+        return {
+            "url": url,
+            "ok": True,
+            "status_code": response.status_code,
+            "changed": previous is not None and previous != digest,
+            "next_crawl": state.next_crawl,
+            "discovered": discovered,
+        }
+
+    async def crawl_batch(self) -> List[Dict[str, Any]]:
+        """Fetch one batch of due URLs (at most one per domain, `workers` in total)"""
+        # robots.txt lookups may block on first contact with a host
+        urls = await asyncio.to_thread(self.frontier.next_batch, self.workers)
+        if not urls:
+            return []
+
+        if self.client is not None:
+            return list(await asyncio.gather(*(self._fetch(self.client, url) for url in urls)))
+
+        async with httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT}, timeout=20, follow_redirects=True
+        ) as client:
+            return list(await asyncio.gather(*(self._fetch(client, url) for url in urls)))
+
+
+def load_frontier() -> CrawlFrontier:
+    """The persisted frontier. This worker and the backend both reload it before a batch
+    and save it after, so neither overwrites the other's schedule with a stale copy."""
+    from apps.backend.storage import load_data
+
+    frontier = CrawlFrontier(RobotsCache(fetch_robots))
+    frontier.load_dict(load_data(FRONTIER_STORE))
+    return frontier
+
+
+def save_frontier(frontier: CrawlFrontier) -> None:
+    from apps.backend.storage import save_data
+
+    save_data(FRONTIER_STORE, frontier.to_dict())
+
+
+def main() -> None:
+    from apps.backend.storage import load_sites
+
+    frontier = load_frontier()
+    for site in load_sites().values():
+        if site.get("enabled", True) and site.get("type") in ("company", "ats"):
+            frontier.add(site["url"], priority=1)
+    save_frontier(frontier)
+
+    async def loop():
+        while True:
+            frontier = load_frontier()
+            results = await Crawler(frontier).crawl_batch()
+            if results:
+                save_frontier(frontier)
+            else:
+                await asyncio.sleep(5.0)
+
+    asyncio.run(loop())
+
+
+if __name__ == "__main__":
+    main()